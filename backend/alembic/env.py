@@ -9,6 +9,10 @@ import app.models.book_note
 import app.models.manuscript
 import app.models.chapter
 import app.models.api_log
+import app.models.api_log_rollup
+import app.models.user_book_stats
+import app.models.share_job
+import app.models.volume
 
 from logging.config import fileConfig
 
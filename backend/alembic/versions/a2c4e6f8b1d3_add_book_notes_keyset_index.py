@@ -0,0 +1,27 @@
+"""add book notes keyset index
+
+Revision ID: a2c4e6f8b1d3
+Revises: f6b2c8d4e1a3
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a2c4e6f8b1d3"
+down_revision: Union[str, Sequence[str], None] = "f6b2c8d4e1a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_book_notes_book_created_id", "book_notes", ["book_id", "created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_book_notes_book_created_id", table_name="book_notes")
@@ -0,0 +1,90 @@
+"""add volumes catalog
+
+Revision ID: c3d8e2f1a4b7
+Revises: a7c1e9f4b2d3
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d8e2f1a4b7"
+down_revision: Union[str, Sequence[str], None] = "a7c1e9f4b2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "volumes",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("external_id", sa.String(length=255), nullable=False),
+        sa.Column("title", sa.String(length=512), nullable=True),
+        sa.Column("authors", sa.Text(), nullable=True),
+        sa.Column("categories", sa.JSON(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("thumbnail", sa.String(length=1024), nullable=True),
+        sa.Column("small_thumbnail", sa.String(length=1024), nullable=True),
+        sa.Column("published_date", sa.String(length=32), nullable=True),
+        sa.Column("industry_identifiers", sa.JSON(), nullable=True),
+        sa.Column("language", sa.String(length=16), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("external_id"),
+    )
+    op.create_index(op.f("ix_volumes_id"), "volumes", ["id"], unique=False)
+    op.create_index(op.f("ix_volumes_language"), "volumes", ["language"], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.execute("CREATE FULLTEXT INDEX ix_volumes_fulltext ON volumes (title, authors, description)")
+    elif dialect == "sqlite":
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE volumes_fts USING fts5(
+                title, authors, description, content='volumes', content_rowid='id'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER volumes_fts_ai AFTER INSERT ON volumes BEGIN
+                INSERT INTO volumes_fts(rowid, title, authors, description)
+                VALUES (new.id, new.title, new.authors, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER volumes_fts_ad AFTER DELETE ON volumes BEGIN
+                INSERT INTO volumes_fts(volumes_fts, rowid, title, authors, description)
+                VALUES ('delete', old.id, old.title, old.authors, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER volumes_fts_au AFTER UPDATE ON volumes BEGIN
+                INSERT INTO volumes_fts(volumes_fts, rowid, title, authors, description)
+                VALUES ('delete', old.id, old.title, old.authors, old.description);
+                INSERT INTO volumes_fts(rowid, title, authors, description)
+                VALUES (new.id, new.title, new.authors, new.description);
+            END
+            """
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.drop_index("ix_volumes_fulltext", table_name="volumes")
+    elif dialect == "sqlite":
+        for trigger in ("volumes_fts_ai", "volumes_fts_ad", "volumes_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS volumes_fts")
+    op.drop_index(op.f("ix_volumes_language"), table_name="volumes")
+    op.drop_index(op.f("ix_volumes_id"), table_name="volumes")
+    op.drop_table("volumes")
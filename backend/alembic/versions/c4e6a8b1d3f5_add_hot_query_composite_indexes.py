@@ -0,0 +1,29 @@
+"""add composite indexes for manuscripts and chapters hot queries
+
+Revision ID: c4e6a8b1d3f5
+Revises: b3d5f7a9c2e4
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e6a8b1d3f5"
+down_revision: Union[str, Sequence[str], None] = "b3d5f7a9c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_manuscripts_user_created", "manuscripts", ["user_id", "created_at"], unique=False)
+    op.create_index("ix_chapters_manuscript_order", "chapters", ["manuscript_id", "order_index"], unique=False)
+    op.create_index("ix_chapters_manuscript_created", "chapters", ["manuscript_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chapters_manuscript_created", table_name="chapters")
+    op.drop_index("ix_chapters_manuscript_order", table_name="chapters")
+    op.drop_index("ix_manuscripts_user_created", table_name="manuscripts")
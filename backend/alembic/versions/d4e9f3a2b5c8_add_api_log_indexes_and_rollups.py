@@ -0,0 +1,48 @@
+"""add api log indexes and hourly rollups
+
+Revision ID: d4e9f3a2b5c8
+Revises: c3d8e2f1a4b7
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e9f3a2b5c8"
+down_revision: Union[str, Sequence[str], None] = "c3d8e2f1a4b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_api_logs_created_at", "api_logs", ["created_at"], unique=False)
+    op.create_index("ix_api_logs_user_id_created_at", "api_logs", ["user_id", "created_at"], unique=False)
+
+    op.create_table(
+        "api_log_hourly",
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("endpoint", sa.String(length=255), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.Integer(), nullable=False),
+        sa.Column("distinct_users", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_start", "endpoint"),
+    )
+    op.create_table(
+        "api_log_hourly_queries",
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("endpoint", sa.String(length=255), nullable=False),
+        sa.Column("query", sa.String(length=255), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_start", "endpoint", "query"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("api_log_hourly_queries")
+    op.drop_table("api_log_hourly")
+    op.drop_index("ix_api_logs_user_id_created_at", table_name="api_logs")
+    op.drop_index("ix_api_logs_created_at", table_name="api_logs")
@@ -0,0 +1,74 @@
+"""replace user_book_stats view with a counters table
+
+Revision ID: d5f7b9c3e2a6
+Revises: c4e6a8b1d3f5
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f7b9c3e2a6"
+down_revision: Union[str, Sequence[str], None] = "c4e6a8b1d3f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS user_book_stats")
+    op.create_table(
+        "user_book_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_books", sa.Integer(), nullable=False),
+        sa.Column("to_read_count", sa.Integer(), nullable=False),
+        sa.Column("in_progress_count", sa.Integer(), nullable=False),
+        sa.Column("read_count", sa.Integer(), nullable=False),
+        sa.Column("favorite_count", sa.Integer(), nullable=False),
+        sa.Column("last_book_added_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO user_book_stats (
+            user_id, total_books, to_read_count, in_progress_count,
+            read_count, favorite_count, last_book_added_at
+        )
+        SELECT
+            u.id,
+            COUNT(b.id),
+            COALESCE(SUM(CASE WHEN b.status = 'À lire' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN b.status = 'En cours' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN b.status = 'Lu' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN b.is_favorite = 1 THEN 1 ELSE 0 END), 0),
+            MAX(b.created_at)
+        FROM users u
+        LEFT JOIN books b ON b.user_id = u.id
+        GROUP BY u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_book_stats")
+    op.execute(
+        """
+        CREATE VIEW user_book_stats AS
+        SELECT
+            u.id AS user_id,
+            u.username AS username,
+            COUNT(b.id) AS total_books,
+            COALESCE(SUM(CASE WHEN b.status = 'À lire' THEN 1 ELSE 0 END), 0) AS to_read_count,
+            COALESCE(SUM(CASE WHEN b.status = 'En cours' THEN 1 ELSE 0 END), 0) AS in_progress_count,
+            COALESCE(SUM(CASE WHEN b.status = 'Lu' THEN 1 ELSE 0 END), 0) AS read_count,
+            COALESCE(SUM(CASE WHEN b.is_favorite = 1 THEN 1 ELSE 0 END), 0) AS favorite_count,
+            MAX(b.created_at) AS last_book_added_at
+        FROM users u
+        LEFT JOIN books b ON b.user_id = u.id
+        GROUP BY u.id, u.username
+        """
+    )
@@ -0,0 +1,33 @@
+"""add books keyset pagination indexes
+
+Revision ID: e5a1b7c9d3f2
+Revises: d4e9f3a2b5c8
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a1b7c9d3f2"
+down_revision: Union[str, Sequence[str], None] = "d4e9f3a2b5c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_books_user_created_id", "books", ["user_id", "created_at", "id"], unique=False)
+    op.create_index(
+        "ix_books_user_status_created_id", "books", ["user_id", "status", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_books_user_favorite_created_id", "books", ["user_id", "is_favorite", "created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_user_favorite_created_id", table_name="books")
+    op.drop_index("ix_books_user_status_created_id", table_name="books")
+    op.drop_index("ix_books_user_created_id", table_name="books")
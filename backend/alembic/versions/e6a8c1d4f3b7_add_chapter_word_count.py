@@ -0,0 +1,61 @@
+"""add precomputed word count to chapters
+
+Revision ID: e6a8c1d4f3b7
+Revises: d5f7b9c3e2a6
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+import html
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a8c1d4f3b7"
+down_revision: Union[str, Sequence[str], None] = "d5f7b9c3e2a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+# Copie figée de app.services.manuscript_stats.count_words
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _count_words(content):
+    if not content:
+        return 0
+    return len(html.unescape(_TAG_RE.sub(" ", content)).split())
+
+
+def upgrade() -> None:
+    op.add_column("chapters", sa.Column("word_count", sa.Integer(), nullable=False, server_default="0"))
+
+    chapters = sa.table(
+        "chapters",
+        sa.column("id", sa.Integer()),
+        sa.column("content", sa.Text()),
+        sa.column("word_count", sa.Integer()),
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(chapters.c.id, chapters.c.content)
+            .where(chapters.c.id > last_id)
+            .order_by(chapters.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            chapters.update().where(chapters.c.id == sa.bindparam("chapter_id")),
+            [{"chapter_id": row.id, "word_count": _count_words(row.content)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column("chapters", "word_count")
@@ -0,0 +1,69 @@
+"""add books full-text index
+
+Revision ID: f6b2c8d4e1a3
+Revises: e5a1b7c9d3f2
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6b2c8d4e1a3"
+down_revision: Union[str, Sequence[str], None] = "e5a1b7c9d3f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.execute("CREATE FULLTEXT INDEX ix_books_fulltext ON books (title, author, genre, description)")
+    elif dialect == "sqlite":
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE books_fts USING fts5(
+                title, author, genre, description, content='books', content_rowid='id'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER books_fts_ai AFTER INSERT ON books BEGIN
+                INSERT INTO books_fts(rowid, title, author, genre, description)
+                VALUES (new.id, new.title, new.author, new.genre, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER books_fts_ad AFTER DELETE ON books BEGIN
+                INSERT INTO books_fts(books_fts, rowid, title, author, genre, description)
+                VALUES ('delete', old.id, old.title, old.author, old.genre, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER books_fts_au AFTER UPDATE OF title, author, genre, description ON books BEGIN
+                INSERT INTO books_fts(books_fts, rowid, title, author, genre, description)
+                VALUES ('delete', old.id, old.title, old.author, old.genre, old.description);
+                INSERT INTO books_fts(rowid, title, author, genre, description)
+                VALUES (new.id, new.title, new.author, new.genre, new.description);
+            END
+            """
+        )
+        # Indexe les livres déjà présents
+        op.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.drop_index("ix_books_fulltext", table_name="books")
+    elif dialect == "sqlite":
+        for trigger in ("books_fts_ai", "books_fts_ad", "books_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS books_fts")
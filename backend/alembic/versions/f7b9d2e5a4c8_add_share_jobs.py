@@ -0,0 +1,53 @@
+"""add share_jobs queue table
+
+Revision ID: f7b9d2e5a4c8
+Revises: e6a8c1d4f3b7
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f7b9d2e5a4c8"
+down_revision: Union[str, Sequence[str], None] = "e6a8c1d4f3b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "share_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("manuscript_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("step", sa.String(length=20), nullable=False),
+        sa.Column("progress", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("run_after", sa.DateTime(), nullable=False),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("locked_by", sa.String(length=64), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["manuscript_id"], ["manuscripts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_share_jobs_id"), "share_jobs", ["id"], unique=False)
+    op.create_index("ix_share_jobs_status_run_after", "share_jobs", ["status", "run_after"], unique=False)
+    op.create_index("ix_share_jobs_user_created", "share_jobs", ["user_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_share_jobs_user_created", table_name="share_jobs")
+    op.drop_index("ix_share_jobs_status_run_after", table_name="share_jobs")
+    op.drop_index(op.f("ix_share_jobs_id"), table_name="share_jobs")
+    op.drop_table("share_jobs")
@@ -1,11 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.security import CSRF_HEADER_NAME, has_valid_csrf
-from app.routes import user, auth, book, google_books, manuscript
+from app.routes import user, auth, book, dashboard, google_books, manuscript
+from app.services import google_books as google_books_service
+from app.services.api_logs import api_log_sink
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await api_log_sink.start()
+    yield
+    await api_log_sink.stop()
+    await google_books_service.aclose_client()
+
 
-app = FastAPI(title="L'Étagère API")
+app = FastAPI(title="L'Étagère API", lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
@@ -60,3 +73,4 @@ app.include_router(auth.router)
 app.include_router(book.router)
 app.include_router(google_books.router)
 app.include_router(manuscript.router)
+app.include_router(dashboard.router)
@@ -0,0 +1,18 @@
+"""Modèles ORM.
+
+Importer le paquet enregistre tous les mappers : les relations déclarées par nom
+("User", "BookNote"…) se résolvent même dans un script qui n'utilise qu'un modèle.
+"""
+
+from app.models import (  # noqa: F401
+    api_log,
+    api_log_rollup,
+    book,
+    book_note,
+    chapter,
+    manuscript,
+    share_job,
+    user,
+    user_book_stats,
+    volume,
+)
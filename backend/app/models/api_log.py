@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -12,6 +12,10 @@ def utcnow() -> datetime:
 
 class ApiLog(Base):
     __tablename__ = "api_logs"
+    __table_args__ = (
+        Index("ix_api_logs_created_at", "created_at"),
+        Index("ix_api_logs_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=utcnow, nullable=False)
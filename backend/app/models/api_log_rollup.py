@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.database import Base
+
+
+class ApiLogHourly(Base):
+    """Agrégat horaire des appels par endpoint, alimenté par `api_log_maintenance`."""
+
+    __tablename__ = "api_log_hourly"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    endpoint = Column(String(255), primary_key=True)
+    requests = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    distinct_users = Column(Integer, nullable=False, default=0)
+
+
+class ApiLogHourlyQuery(Base):
+    """Requêtes les plus fréquentes de chaque heure (top N par endpoint)."""
+
+    __tablename__ = "api_log_hourly_queries"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    endpoint = Column(String(255), primary_key=True)
+    query = Column(String(255), primary_key=True)
+    requests = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Boolean, JSON, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Boolean, JSON, UniqueConstraint, Index, DDL, event
+from sqlalchemy.orm import column_property, deferred, relationship
 from datetime import datetime, timezone
 from app.database import Base
 
@@ -11,22 +11,36 @@ class Book(Base):
     __tablename__ = "books"
     __table_args__ = (
         UniqueConstraint("user_id", "external_id", name="uq_books_user_external_id"),
+        # Pagination par clé (created_at, id) de /books/mine, avec et sans filtres
+        Index("ix_books_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_books_user_status_created_id", "user_id", "status", "created_at", "id"),
+        Index("ix_books_user_favorite_created_id", "user_id", "is_favorite", "created_at", "id"),
+        Index(
+            "ix_books_fulltext",
+            "title",
+            "author",
+            "genre",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     author = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(String(50), nullable=False)
+    # active_history : l'ancienne valeur reste connue même sur un objet expiré (compteurs user_book_stats)
+    status = column_property(Column(String(50), nullable=False), active_history=True)
     created_at = Column(DateTime, default=utcnow)
     publication_date = Column(Date, nullable=True)
     isbn = Column(String(255), nullable=True)
     cover_image = Column(String(255), nullable=True)
     external_id = Column(String(255), nullable=True)
     genre = Column(String(255), nullable=True)
-    embedding = Column(JSON, nullable=True)
+    # ~8 Ko de JSON par livre, jamais sérialisé : chargé seulement via undefer(Book.embedding)
+    embedding = deferred(Column(JSON, nullable=True))
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    is_favorite = Column(Boolean, nullable=False, default=False)
+    is_favorite = column_property(Column(Boolean, nullable=False, default=False), active_history=True)
 
     user = relationship("User", back_populates="books")
     notes = relationship(
@@ -35,3 +49,42 @@ class Book(Base):
         cascade="all, delete-orphan",
         order_by="BookNote.created_at.desc()",
     )
+
+
+# Recherche dans la bibliothèque : FTS5 externe tenu à jour par triggers (SQLite),
+# index FULLTEXT ci-dessus pour MySQL
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, genre, description, content='books', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author, genre, description)
+        VALUES (new.id, new.title, new.author, new.genre, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, genre, description)
+        VALUES ('delete', old.id, old.title, old.author, old.genre, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, genre, description ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, genre, description)
+        VALUES ('delete', old.id, old.title, old.author, old.genre, old.description);
+        INSERT INTO books_fts(rowid, title, author, genre, description)
+        VALUES (new.id, new.title, new.author, new.genre, new.description);
+    END
+    """,
+]
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(Book.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Book.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS books_fts").execute_if(dialect="sqlite"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -10,6 +10,10 @@ def utcnow() -> datetime:
 
 class BookNote(Base):
     __tablename__ = "book_notes"
+    __table_args__ = (
+        # Pagination des notes d'un livre et agrégat « dernière note » des listes
+        Index("ix_book_notes_book_created_id", "book_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
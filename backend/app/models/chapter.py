@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -11,10 +11,17 @@ def utcnow() -> datetime:
 
 class Chapter(Base):
     __tablename__ = "chapters"
+    __table_args__ = (
+        # Chapitres d'un manuscrit dans l'ordre, et chapitres récents par manuscrit
+        Index("ix_chapters_manuscript_order", "manuscript_id", "order_index"),
+        Index("ix_chapters_manuscript_created", "manuscript_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
+    # Nombre de mots du contenu, recalculé à chaque écriture (app.services.manuscript_stats)
+    word_count = Column(Integer, nullable=False, default=0)
     order_index = Column(Integer, nullable=False, default=1)
     created_at = Column(DateTime, default=utcnow)
     updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ShareJob(Base):
+    """Partage de manuscrit par email en attente ou en cours, exécuté par `app.services.share_jobs`."""
+
+    __tablename__ = "share_jobs"
+    __table_args__ = (
+        # Prochain travail à prendre : statut puis date d'exécution
+        Index("ix_share_jobs_status_run_after", "status", "run_after"),
+        Index("ix_share_jobs_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    manuscript_id = Column(Integer, ForeignKey("manuscripts.id", ondelete="CASCADE"), nullable=False)
+    # queued → running → succeeded | failed (retour à queued entre deux tentatives)
+    status = Column(String(20), nullable=False, default="queued")
+    step = Column(String(20), nullable=False, default="queued")
+    progress = Column(Integer, nullable=False, default=0)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime, nullable=False, default=utcnow)
+    locked_at = Column(DateTime, nullable=True)
+    locked_by = Column(String(64), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    updated_at = Column(DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+    finished_at = Column(DateTime, nullable=True)
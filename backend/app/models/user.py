@@ -17,6 +17,8 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_admin = Column(Boolean, nullable=False, default=False)
     is_active = Column(Boolean, nullable=False, default=True)
+    # Incrémenté à chaque écriture sur livres, notes, manuscrits ou chapitres (ETag des lectures)
+    library_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     books = relationship("Book", back_populates="user")
     manuscripts = relationship(
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+
+from app.database import Base
+
+
+class UserBookStats(Base):
+    """Compteurs de bibliothèque par utilisateur, tenus à jour par `app.services.book_stats`."""
+
+    __tablename__ = "user_book_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_books = Column(Integer, nullable=False, default=0)
+    to_read_count = Column(Integer, nullable=False, default=0)
+    in_progress_count = Column(Integer, nullable=False, default=0)
+    read_count = Column(Integer, nullable=False, default=0)
+    favorite_count = Column(Integer, nullable=False, default=0)
+    last_book_added_at = Column(DateTime, nullable=True)
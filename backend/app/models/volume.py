@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DDL, JSON, Column, DateTime, Index, Integer, String, Text, event
+
+from app.database import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CatalogVolume(Base):
+    """Copie locale d'un volume Google Books, interrogeable en plein texte."""
+
+    __tablename__ = "volumes"
+    __table_args__ = (
+        Index(
+            "ix_volumes_fulltext",
+            "title",
+            "authors",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    external_id = Column(String(255), nullable=False, unique=True)
+    title = Column(String(512), nullable=True)
+    authors = Column(Text, nullable=True)
+    categories = Column(JSON, nullable=True)
+    description = Column(Text, nullable=True)
+    thumbnail = Column(String(1024), nullable=True)
+    small_thumbnail = Column(String(1024), nullable=True)
+    published_date = Column(String(32), nullable=True)
+    industry_identifiers = Column(JSON, nullable=True)
+    language = Column(String(16), nullable=True, index=True)
+    fetched_at = Column(DateTime, default=utcnow, onupdate=utcnow, nullable=False)
+
+
+# Index FTS5 externe synchronisé par triggers (SQLite) ; MySQL utilise l'index FULLTEXT ci-dessus
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS volumes_fts USING fts5(
+        title, authors, description, content='volumes', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS volumes_fts_ai AFTER INSERT ON volumes BEGIN
+        INSERT INTO volumes_fts(rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS volumes_fts_ad AFTER DELETE ON volumes BEGIN
+        INSERT INTO volumes_fts(volumes_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS volumes_fts_au AFTER UPDATE ON volumes BEGIN
+        INSERT INTO volumes_fts(volumes_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+        INSERT INTO volumes_fts(rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+]
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(CatalogVolume.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    CatalogVolume.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS volumes_fts").execute_if(dialect="sqlite"),
+)
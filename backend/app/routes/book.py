@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
+import itertools
+import json
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, noload, selectinload
 from app.database import get_db
 from app.models.book import Book   
 from app.models.book_note import BookNote
@@ -13,10 +18,28 @@ from app.schemas import (
     BookRecommendation,
     BookNote as BookNoteSchema,
     BookNoteCreate,
+    BookNotePage,
+    BookBatchRequest,
+    BookBatchResult,
 )
 from app.core.security import get_current_user
+from app.services.book_batch import BooksNotFoundError, apply_book_batch
+from app.services.book_export import export_csv, export_ndjson
+from app.services.book_import import ImportFormatError, import_books, iter_import_rows
+from app.services.book_notes import notes_summaries
 from app.services.embeddings import build_book_text, embed_text
+from app.services.library_search import apply_library_search
+from app.services.library_version import check_not_modified
+from app.services.pagination import (
+    InvalidCursorError,
+    decode_keyset_cursor,
+    decode_offset_cursor,
+    encode_keyset_cursor,
+    encode_offset_cursor,
+)
 from app.services.recommendations import recommend_books
+from app.services.serialization import BOOK_LIST_ADAPTER, BOOK_PAGE_ADAPTER, json_response
+from app.services.volume_catalog import record_book
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
@@ -32,6 +55,13 @@ def _get_user_book_or_404(book_id: int, user_id: int, db: Session) -> Book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Livre introuvable")
     return book
 
+
+def _ensure_user_book(book_id: int, user_id: int, db: Session) -> None:
+    """Vérifie la propriété du livre sans charger la ligne ni ses notes."""
+    exists = db.query(Book.id).filter(Book.id == book_id, Book.user_id == user_id).first()
+    if not exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Livre introuvable")
+
 @router.post("/", response_model=BookSchema)
 def create_book(book: BookCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
     if book.external_id:
@@ -64,17 +94,91 @@ def create_book(book: BookCreate, db: Session = Depends(get_db), user=Depends(ge
             detail="Livre déjà dans la bibliothèque",
         )
     db.refresh(db_book)
+    record_book(db, db_book)
     return db_book
 
+# Taille maximale du fichier importé (plusieurs milliers de livres en CSV)
+_MAX_IMPORT_BYTES = 5 * 1024 * 1024
+
+
+@router.post("/import")
+async def import_library(request: Request, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Importe une bibliothèque envoyée en corps brut (`text/csv` ou `application/json`).
+
+    La réponse est un flux NDJSON : une ligne d'avancement par lot inséré, puis
+    un bilan final (`done: true`) avec les lignes rejetées.
+    """
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > _MAX_IMPORT_BYTES:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Fichier trop volumineux")
+
+    rows = iter_import_rows(bytes(body), request.headers.get("content-type", ""))
+    try:
+        # Les erreurs de format doivent partir en 400 avant le début du flux
+        first_row = next(rows, None)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if first_row is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Aucun livre à importer")
+
+    user_id = user.id
+
+    def progress_lines():
+        for progress in import_books(db, user_id, itertools.chain([first_row], rows)):
+            yield json.dumps(progress, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/export")
+def export_library(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Exporte toute la bibliothèque en flux, sans la charger en mémoire."""
+    if export_format == "csv":
+        return StreamingResponse(
+            export_csv(db, user.id),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="bibliotheque.csv"'},
+        )
+    return StreamingResponse(
+        export_ndjson(db, user.id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="bibliotheque.ndjson"'},
+    )
+
+
 @router.get("/", response_model=list[BookSchema])
-def list_books(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    return (
+def list_books(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    not_modified = check_not_modified(request, response, user)
+    if not_modified is not None:
+        return not_modified
+    books = (
         db.query(Book)
         .options(selectinload(Book.notes))
         .filter(Book.user_id == user.id)
         .order_by(Book.created_at.desc())
         .all()
     )
+    return json_response(BOOK_LIST_ADAPTER, books, response)
+
+@router.post("/batch", response_model=BookBatchResult)
+def batch_update_books(payload: BookBatchRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Modifie ou supprime plusieurs livres en une transaction (tout ou rien)."""
+    try:
+        return apply_book_batch(db, user.id, payload.updates, payload.delete_ids)
+    except BooksNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
 
 @router.delete("/{book_id}")
 def delete_book(book_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
@@ -107,18 +211,32 @@ def update_book(book_id: int, book_update: BookUpdate, db: Session = Depends(get
 
 @router.get("/mine", response_model=BookPage)
 def get_my_books(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: str | None = Query(None, alias="status"),
     search: str | None = None,
     favorites: bool | None = None,
+    cursor: str | None = None,
+    with_total: bool = True,
+    notes: Literal["full", "summary"] = "full",
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    """Retourne les livres ajoutés par l'utilisateur connecté"""
+    """Retourne les livres ajoutés par l'utilisateur connecté.
+
+    Pagination par clé (created_at, id) via `cursor` ; `page` n'est plus
+    qu'un repli OFFSET pour les anciens clients. `with_total=false` évite le COUNT.
+    Avec `search`, la liste est triée par pertinence et le curseur porte un décalage.
+    `notes=summary` remplace le contenu des notes par leur nombre et un aperçu de la dernière.
+    """
+    not_modified = check_not_modified(request, response, user)
+    if not_modified is not None:
+        return not_modified
     base_query = (
         db.query(Book)
-        .options(selectinload(Book.notes))
+        .options(noload(Book.notes) if notes == "summary" else selectinload(Book.notes))
         .filter(Book.user_id == user.id)
     )
 
@@ -126,26 +244,74 @@ def get_my_books(
         base_query = base_query.filter(Book.status == status_filter)
     if favorites is not None:
         base_query = base_query.filter(Book.is_favorite == favorites)
-    if search and search.strip():
-        term = f"%{search.strip()}%"
-        base_query = base_query.filter(
-            or_(Book.title.ilike(term), Book.author.ilike(term))
-        )
+    searching = bool(search and search.strip())
+    if searching:
+        base_query = apply_library_search(db, base_query, search)
 
-    total_items = base_query.order_by(None).count()
-    books = (
-        base_query.order_by(Book.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    total_items = None
+    if with_total:
+        # COUNT direct, sans sous-requête reprenant toutes les colonnes de Book
+        total_items = base_query.with_entities(func.count(Book.id)).order_by(None).scalar()
 
-    return {
-        "items": books,
-        "total_items": total_items,
-        "page": page,
-        "page_size": page_size,
-    }
+    try:
+        if searching:
+            offset = decode_offset_cursor(cursor) if cursor else (page - 1) * page_size
+            page_query = base_query.offset(offset)
+        else:
+            page_query = base_query.order_by(Book.created_at.desc(), Book.id.desc())
+            if cursor:
+                last_created_at, last_id = decode_keyset_cursor(cursor)
+                page_query = page_query.filter(
+                    or_(
+                        Book.created_at < last_created_at,
+                        and_(Book.created_at == last_created_at, Book.id < last_id),
+                    )
+                )
+            elif page > 1:
+                page_query = page_query.offset((page - 1) * page_size)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    # Une ligne de plus suffit à savoir s'il reste une page, sans COUNT
+    books = page_query.limit(page_size + 1).all()
+    has_more = len(books) > page_size
+    books = books[:page_size]
+
+    next_cursor = None
+    if has_more:
+        if searching:
+            next_cursor = encode_offset_cursor(offset + page_size)
+        else:
+            next_cursor = encode_keyset_cursor(books[-1].created_at, books[-1].id)
+
+    items = books
+    if notes == "summary":
+        summaries = notes_summaries(db, (book.id for book in books))
+        items = []
+        for book in books:
+            summary = summaries.get(book.id)
+            items.append(
+                BookSchema.model_validate(book).model_copy(
+                    update={
+                        "notes_count": summary.count if summary else 0,
+                        "latest_note_preview": summary.latest_preview if summary else None,
+                        "latest_note_at": summary.latest_at if summary else None,
+                    }
+                )
+            )
+
+    return json_response(
+        BOOK_PAGE_ADAPTER,
+        {
+            "items": items,
+            "total_items": total_items,
+            "page": page,
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+        },
+        response,
+    )
 
 
 @router.get("/recommendations", response_model=list[BookRecommendation])
@@ -157,10 +323,47 @@ def get_recommendations(
     return recommend_books(db, user.id, limit=limit)
 
 
-@router.get("/{book_id}/notes", response_model=list[BookNoteSchema])
-def list_book_notes(book_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    book = _get_user_book_or_404(book_id, user.id, db)
-    return book.notes
+@router.get("/{book_id}/notes", response_model=BookNotePage | list[BookNoteSchema])
+def list_book_notes(
+    book_id: int,
+    limit: int | None = Query(None, ge=1, le=100),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Notes d'un livre, des plus récentes aux plus anciennes, par pages (created_at, id).
+
+    Sans `limit` ni `cursor`, renvoie la liste complète comme avant la pagination
+    (anciens clients) ; sinon une page `{items, has_more, next_cursor}` de 20 notes par défaut.
+    """
+    _ensure_user_book(book_id, user.id, db)
+    query = (
+        db.query(BookNote)
+        .filter(BookNote.book_id == book_id)
+        .order_by(BookNote.created_at.desc(), BookNote.id.desc())
+    )
+    if limit is None and not cursor:
+        return query.all()
+    limit = limit or 20
+    if cursor:
+        try:
+            last_created_at, last_id = decode_keyset_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        query = query.filter(
+            or_(
+                BookNote.created_at < last_created_at,
+                and_(BookNote.created_at == last_created_at, BookNote.id < last_id),
+            )
+        )
+    book_notes = query.limit(limit + 1).all()
+    has_more = len(book_notes) > limit
+    book_notes = book_notes[:limit]
+    return {
+        "items": book_notes,
+        "has_more": has_more,
+        "next_cursor": encode_keyset_cursor(book_notes[-1].created_at, book_notes[-1].id) if has_more else None,
+    }
 
 
 @router.post(
@@ -174,7 +377,7 @@ def create_book_note(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    _get_user_book_or_404(book_id, user.id, db)
+    _ensure_user_book(book_id, user.id, db)
     book_note = BookNote(content=note.content, book_id=book_id)
     db.add(book_note)
     db.commit()
@@ -189,7 +392,7 @@ def delete_book_note(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    _get_user_book_or_404(book_id, user.id, db)
+    _ensure_user_book(book_id, user.id, db)
     note = (
         db.query(BookNote)
         .filter(BookNote.id == note_id, BookNote.book_id == book_id)
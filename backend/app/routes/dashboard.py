@@ -0,0 +1,82 @@
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user
+from app.database import get_db
+from app.models.user import User
+from app.schemas import Book as BookSchema, ChapterWithManuscript
+from app.schemas.user import UserBookStatsRead, UserRead
+from app.services.book_stats import STATUS_COLUMNS
+from app.services.dashboard import (
+    cached_recommendations,
+    load_highlights,
+    load_recent_chapters,
+    load_stats,
+    refresh_recommendations,
+    run_with_session,
+    schedule_recommendations,
+)
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("")
+async def get_dashboard(
+    recommendations: Literal["deferred", "inline", "none"] = Query("deferred"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Tout le tableau de bord en un aller-retour, utilisateur authentifié une seule fois.
+
+    Les lectures indépendantes tournent en parallèle, chacune dans sa session. Les
+    recommandations (Google + encodage) sont servies depuis le cache ; en mode `deferred`
+    un calcul est lancé en arrière-plan et `recommendations.status` vaut `pending`.
+    """
+    bind = db.get_bind()
+    user_id = user.id
+    library_version = user.library_version or 0
+    user_payload = UserRead.model_validate(user)
+
+    stats, highlights, chapters = await asyncio.gather(
+        run_with_session(bind, lambda session: load_stats(session, user_id)),
+        run_with_session(bind, lambda session: load_highlights(session, user_id)),
+        run_with_session(bind, lambda session: load_recent_chapters(session, user_id)),
+    )
+
+    recommendation_items = cached_recommendations(user_id, library_version)
+    recommendation_status = "ready"
+    if recommendation_items is None:
+        if recommendations == "inline":
+            recommendation_items = await refresh_recommendations(bind, user_id, library_version)
+        elif recommendations == "deferred":
+            schedule_recommendations(bind, user_id, library_version)
+            recommendation_status = "pending"
+        else:
+            recommendation_status = "skipped"
+
+    totals = {status: getattr(stats, column, 0) if stats else 0 for status, column in STATUS_COLUMNS.items()}
+    return {
+        "user": user_payload,
+        "stats": UserBookStatsRead(
+            user_id=user_id,
+            username=user_payload.username,
+            total_books=stats.total_books if stats else 0,
+            to_read_count=stats.to_read_count if stats else 0,
+            in_progress_count=stats.in_progress_count if stats else 0,
+            read_count=stats.read_count if stats else 0,
+            favorite_count=stats.favorite_count if stats else 0,
+            last_book_added_at=stats.last_book_added_at if stats else None,
+        ),
+        "highlights": {
+            status: {
+                "items": [BookSchema.model_validate(book) for book in books],
+                "total": totals[status],
+            }
+            for status, books in highlights.items()
+        },
+        "recent_chapters": [ChapterWithManuscript.model_validate(chapter) for chapter in chapters],
+        "recommendations": {"status": recommendation_status, "items": recommendation_items or []},
+    }
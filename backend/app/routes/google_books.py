@@ -1,46 +1,102 @@
+from datetime import timedelta
+
 from fastapi import APIRouter, Query, Request, HTTPException, Depends
-from jose import JWTError
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import decode_access_token, get_access_token_from_request
+from app.core.security import get_current_admin
 from app.database import get_db
-from app.models.api_log import ApiLog
-from app.services.google_books import search_books
+from app.models.api_log_rollup import ApiLogHourly, ApiLogHourlyQuery
+from app.services.api_log_maintenance import utcnow
+from app.services.api_logs import api_log_sink
+from app.services.google_books import (
+    InvalidCursorError,
+    UpstreamUnavailableError,
+    format_book,
+    get_coalescing_stats,
+    get_rate_limit_stats,
+    search_volumes_async,
+)
+from app.services.volume_catalog import (
+    decode_catalog_cursor,
+    encode_catalog_cursor,
+    search_catalog,
+    upsert_volumes,
+)
 
 router = APIRouter(prefix="/google", tags=["google-books"])
+_SEARCH_PARAMS = {"printType": "books", "orderBy": "relevance", "langRestrict": "fr"}
 
-def _extract_user_id(request: Request) -> int | None:
-    token = get_access_token_from_request(request)
-    if not token:
-        return None
-    try:
-        payload = decode_access_token(token)
-    except JWTError:
-        return None
-    user_id = payload.get("sub")
-    try:
-        return int(user_id)
-    except (TypeError, ValueError):
-        return None
+
+async def _search(db: Session, q: str, start_index: int, max_results: int, cursor: str | None) -> dict:
+    """Sert la recherche depuis le catalogue local si possible, sinon depuis Google (puis met le catalogue à jour).
+
+    La source est choisie sur la première page : un curseur de catalogue poursuit dans le
+    catalogue, un curseur Google chez Google. Sans curseur, le choix dépend de la première
+    page du catalogue, quel que soit `start_index`. Une fois le catalogue épuisé, la suite
+    vient de Google à partir du même rang, sans jamais revenir au catalogue.
+    """
+    safe_max = max(1, min(max_results, 100))
+    language = _SEARCH_PARAMS["langRestrict"]
+    catalog_offset = decode_catalog_cursor(cursor) if cursor else None
+    hits = None
+    if catalog_offset is not None:
+        hits = await run_in_threadpool(search_catalog, db, q, language, catalog_offset, safe_max + 1, True)
+    elif not cursor:
+        first_page = await run_in_threadpool(search_catalog, db, q, language, 0, safe_max + 1)
+        # Un élément de plus que la page demandée : le catalogue couvre au moins une page pleine
+        if first_page is not None and len(first_page) > safe_max:
+            catalog_offset = max(0, start_index)
+            if catalog_offset == 0:
+                hits = first_page
+            else:
+                hits = await run_in_threadpool(search_catalog, db, q, language, catalog_offset, safe_max + 1, True)
+
+    if catalog_offset is not None and hits:
+        items = [format_book(volume) for volume in hits[:safe_max]]
+        # Page incomplète : le curseur suivant pointe après le catalogue, donc vers Google
+        return {
+            "items": items,
+            "total_items": len(items),
+            "start_index": catalog_offset,
+            "max_results": safe_max,
+            "has_more": True,
+            "next_cursor": encode_catalog_cursor(catalog_offset + len(items)),
+            "source": "catalog",
+        }
+    if catalog_offset is not None:
+        # Catalogue épuisé à ce rang : on passe la main à Google
+        start_index, cursor = catalog_offset, None
+
+    result = await search_volumes_async(q, start_index, max_results, extra_params=_SEARCH_PARAMS, cursor=cursor)
+    if result["items"]:
+        await run_in_threadpool(upsert_volumes, db, result["items"])
+    result["items"] = [format_book(volume) for volume in result["items"]]
+    result["source"] = "google"
+    return result
 
 
 @router.get("/search")
-def google_search(
+async def google_search(
     request: Request,
     q: str = Query(...),
     start_index: int = 0,
     max_results: int = 10,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ):
     status_code = 200
     error_message = None
     try:
-        return search_books(
-            q,
-            start_index,
-            max_results,
-            extra_params={"printType": "books", "orderBy": "relevance", "langRestrict": "fr"},
-        )
+        return await _search(db, q, start_index, max_results, cursor)
+    except InvalidCursorError as exc:
+        status_code = 400
+        error_message = str(exc)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except UpstreamUnavailableError as exc:
+        status_code = 503
+        error_message = str(exc)
+        raise HTTPException(status_code=503, detail="Recherche Google Books momentanément indisponible") from exc
     except HTTPException as exc:
         status_code = exc.status_code
         error_message = str(exc.detail)
@@ -50,15 +106,46 @@ def google_search(
         error_message = str(exc)
         raise
     finally:
-        try:
-            log_entry = ApiLog(
-                user_id=_extract_user_id(request),
-                endpoint=request.url.path,
-                query=q,
-                status_code=status_code,
-                error_message=error_message,
-            )
-            db.add(log_entry)
-            db.commit()
-        except Exception:
-            db.rollback()
+        # Écriture différée et groupée par la tâche de fond du sink
+        api_log_sink.log_request(request, status_code=status_code, query=q, error_message=error_message)
+
+
+@router.get("/stats", dependencies=[Depends(get_current_admin)])
+def google_client_stats():
+    """Métriques du client Google Books (attente sur le quota, appels regroupés, journal)."""
+    return {
+        "rate_limit": get_rate_limit_stats(),
+        **get_coalescing_stats(),
+        "api_log": api_log_sink.stats(),
+    }
+
+
+@router.get("/usage", dependencies=[Depends(get_current_admin)])
+def google_usage(hours: int = Query(24, ge=1, le=24 * 31), db: Session = Depends(get_db)):
+    """Consommation horaire (agrégats `api_log_hourly`, jamais les journaux bruts)."""
+    since = utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+    hourly = (
+        db.query(ApiLogHourly)
+        .filter(ApiLogHourly.bucket_start >= since)
+        .order_by(ApiLogHourly.bucket_start, ApiLogHourly.endpoint)
+        .all()
+    )
+    top_queries: dict[str, int] = {}
+    for row in db.query(ApiLogHourlyQuery).filter(ApiLogHourlyQuery.bucket_start >= since):
+        top_queries[row.query] = top_queries.get(row.query, 0) + row.requests
+    return {
+        "hourly": [
+            {
+                "bucket_start": row.bucket_start,
+                "endpoint": row.endpoint,
+                "requests": row.requests,
+                "errors": row.errors,
+                "distinct_users": row.distinct_users,
+            }
+            for row in hourly
+        ],
+        "top_queries": [
+            {"query": query, "requests": count}
+            for query, count in sorted(top_queries.items(), key=lambda item: item[1], reverse=True)[:20]
+        ],
+    }
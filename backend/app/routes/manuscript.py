@@ -1,23 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session, selectinload
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, contains_eager, selectinload
 
 from app.core.security import get_current_user
 from app.database import get_db
 from app.models.manuscript import Manuscript
 from app.models.chapter import Chapter
+from app.models.share_job import ShareJob
 from app.schemas import (
     Chapter as ChapterSchema,
     ChapterCreate,
+    ChapterOverview,
     ChapterUpdate,
     ChapterWithManuscript,
     Manuscript as ManuscriptSchema,
     ManuscriptCreate,
+    ManuscriptOverview,
     ManuscriptShareRequest,
     ManuscriptUpdate,
+    ShareJobStatus,
+)
+from app.services.library_version import check_not_modified
+from app.services.manuscript_stats import manuscript_overviews
+from app.services.serialization import (
+    MANUSCRIPT_LIST_ADAPTER,
+    MANUSCRIPT_OVERVIEW_LIST_ADAPTER,
+    json_response,
 )
-from app.services.email import EmailError
-from app.services.manuscript_share import share_manuscript_via_email
+from app.services.share_jobs import enqueue_share_job
 
 router = APIRouter(prefix="/manuscripts", tags=["Manuscripts"])
 
@@ -35,12 +47,19 @@ def _get_user_manuscript_or_404(manuscript_id: int, user_id: int, db: Session) -
     return manuscript
 
 
+def _ensure_user_manuscript(manuscript_id: int, user_id: int, db: Session) -> None:
+    """Vérifie la propriété du manuscrit sans charger ses chapitres."""
+    exists = db.query(Manuscript.id).filter(Manuscript.id == manuscript_id, Manuscript.user_id == user_id).first()
+    if not exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manuscrit introuvable")
+
+
 def _get_user_chapter_or_404(chapter_id: int, user_id: int, db: Session) -> Chapter:
-    """Récupère un chapitre appartenant à l'utilisateur ou lève une 404."""
+    """Récupère un chapitre appartenant à l'utilisateur ou lève une 404 (une requête, par clés primaires)."""
     chapter = (
         db.query(Chapter)
         .join(Manuscript, Chapter.manuscript_id == Manuscript.id)
-        .options(selectinload(Chapter.manuscript))
+        .options(contains_eager(Chapter.manuscript))
         .filter(Chapter.id == chapter_id, Manuscript.user_id == user_id)
         .first()
     )
@@ -62,15 +81,28 @@ def create_manuscript(
     return db_manuscript
 
 
-@router.get("/", response_model=list[ManuscriptSchema])
-def list_manuscripts(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    return (
+@router.get("/", response_model=list[ManuscriptSchema] | list[ManuscriptOverview])
+def list_manuscripts(
+    request: Request,
+    response: Response,
+    view: Literal["full", "summary"] = "full",
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Liste des manuscrits ; `view=summary` omet les chapitres au profit de leurs statistiques."""
+    not_modified = check_not_modified(request, response, user)
+    if not_modified is not None:
+        return not_modified
+    if view == "summary":
+        return json_response(MANUSCRIPT_OVERVIEW_LIST_ADAPTER, manuscript_overviews(db, user.id), response)
+    manuscripts = (
         db.query(Manuscript)
         .options(selectinload(Manuscript.chapters))
         .filter(Manuscript.user_id == user.id)
         .order_by(Manuscript.created_at.desc())
         .all()
     )
+    return json_response(MANUSCRIPT_LIST_ADAPTER, manuscripts, response)
 
 
 @router.get("/{manuscript_id}", response_model=ManuscriptSchema)
@@ -101,51 +133,78 @@ def delete_manuscript(manuscript_id: int, db: Session = Depends(get_db), user=De
     db.commit()
 
 
-@router.post("/{manuscript_id}/share", status_code=status.HTTP_202_ACCEPTED)
+@router.post("/{manuscript_id}/share", response_model=ShareJobStatus, status_code=status.HTTP_202_ACCEPTED)
 def share_manuscript(
     manuscript_id: int,
     payload: ManuscriptShareRequest,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    """Partage un manuscrit par email avec PDF en pièce jointe."""
-    manuscript = _get_user_manuscript_or_404(manuscript_id, user.id, db)
+    """Programme le partage d'un manuscrit par email (PDF joint) ; suivi via /manuscripts/share-jobs/{id}."""
+    manuscript = (
+        db.query(Manuscript)
+        .filter(Manuscript.id == manuscript_id, Manuscript.user_id == user.id)
+        .first()
+    )
+    if not manuscript:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manuscrit introuvable")
     if not payload.recipients:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ajoute au moins un destinataire")
 
+    chapter_ids = db.query(Chapter.id).filter(Chapter.manuscript_id == manuscript_id)
     if payload.chapter_ids:
         requested_ids = set(payload.chapter_ids)
-        chapters = [chapter for chapter in manuscript.chapters if chapter.id in requested_ids]
-        if len(chapters) != len(requested_ids):
+        found = {chapter_id for (chapter_id,) in chapter_ids.filter(Chapter.id.in_(requested_ids))}
+        if found != requested_ids:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapitre introuvable dans ce manuscrit")
-    else:
-        chapters = manuscript.chapters
-
-    if not chapters:
+    elif chapter_ids.first() is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Aucun chapitre à partager")
 
-    subject = payload.subject or f"{manuscript.title} – partage de manuscrit"
-    author_name = user.username or user.email
-
-    try:
-        share_manuscript_via_email(
-            manuscript=manuscript,
-            chapters=chapters,
-            recipients=payload.recipients,
-            subject=subject,
-            message=payload.message,
-            author_name=author_name,
-        )
-    except EmailError as exc:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
+    return enqueue_share_job(
+        db,
+        user_id=user.id,
+        manuscript_id=manuscript_id,
+        recipients=[str(recipient) for recipient in payload.recipients],
+        chapter_ids=sorted(set(payload.chapter_ids)) if payload.chapter_ids else None,
+        subject=payload.subject or f"{manuscript.title} – partage de manuscrit",
+        message=payload.message,
+        author_name=user.username or user.email,
+    )
 
-    return {"message": "Manuscrit envoyé"}
 
+@router.get("/share-jobs/{job_id}", response_model=ShareJobStatus)
+def get_share_job(job_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    job = db.query(ShareJob).filter(ShareJob.id == job_id, ShareJob.user_id == user.id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partage introuvable")
+    return job
 
-@router.get("/{manuscript_id}/chapters", response_model=list[ChapterSchema])
-def list_chapters(manuscript_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    manuscript = _get_user_manuscript_or_404(manuscript_id, user.id, db)
-    return manuscript.chapters
+
+@router.get("/{manuscript_id}/chapters", response_model=list[ChapterSchema] | list[ChapterOverview])
+def list_chapters(
+    manuscript_id: int,
+    view: Literal["full", "summary"] = "full",
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Chapitres dans l'ordre ; `view=summary` renvoie seulement leurs métadonnées, sans contenu."""
+    if view == "full":
+        return _get_user_manuscript_or_404(manuscript_id, user.id, db).chapters
+    _ensure_user_manuscript(manuscript_id, user.id, db)
+    rows = db.execute(
+        select(
+            Chapter.id,
+            Chapter.manuscript_id,
+            Chapter.title,
+            Chapter.order_index,
+            Chapter.word_count,
+            Chapter.created_at,
+            Chapter.updated_at,
+        )
+        .where(Chapter.manuscript_id == manuscript_id)
+        .order_by(Chapter.order_index.asc(), Chapter.id.asc())
+    ).mappings()
+    return [ChapterOverview.model_validate(row) for row in rows]
 
 
 @router.post(
@@ -159,7 +218,7 @@ def create_chapter(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    _get_user_manuscript_or_404(manuscript_id, user.id, db)
+    _ensure_user_manuscript(manuscript_id, user.id, db)
     order_index = chapter.order_index
     if order_index is None:
         last_order = (
@@ -215,3 +274,8 @@ def list_recent_chapters(db: Session = Depends(get_db), user=Depends(get_current
         .limit(6)
         .all()
     )
+
+
+@router.get("/chapters/{chapter_id}", response_model=ChapterWithManuscript)
+def get_chapter(chapter_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    return _get_user_chapter_or_404(chapter_id, user.id, db)
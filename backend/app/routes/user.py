@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from app.core.passwords import validate_password_policy
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
+from app.models.user_book_stats import UserBookStats
 from app.schemas.user import (
     UserAdminRead,
     UserBookStatsRead,
@@ -12,6 +12,7 @@ from app.schemas.user import (
     UserStatusUpdate,
 )
 from app.core.security import get_current_admin, get_current_user, hash_password
+from app.services.library_version import check_not_modified
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -53,40 +54,37 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 @router.get("/me/book-stats", response_model=UserBookStatsRead)
 def get_my_book_stats(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    row = (
-        db.execute(
-            text(
-                """
-                SELECT
-                    user_id,
-                    username,
-                    total_books,
-                    to_read_count,
-                    in_progress_count,
-                    read_count,
-                    favorite_count,
-                    last_book_added_at
-                FROM user_book_stats
-                WHERE user_id = :user_id
-                """
-            ),
-            {"user_id": user.id},
+    not_modified = check_not_modified(request, response, user)
+    if not_modified is not None:
+        return not_modified
+    # Compteurs matérialisés : simple lecture par clé primaire
+    stats = db.get(UserBookStats, user.id)
+    if stats is None:
+        return UserBookStatsRead(
+            user_id=user.id,
+            username=user.username,
+            total_books=0,
+            to_read_count=0,
+            in_progress_count=0,
+            read_count=0,
+            favorite_count=0,
         )
-        .mappings()
-        .first()
+    return UserBookStatsRead(
+        user_id=user.id,
+        username=user.username,
+        total_books=stats.total_books,
+        to_read_count=stats.to_read_count,
+        in_progress_count=stats.in_progress_count,
+        read_count=stats.read_count,
+        favorite_count=stats.favorite_count,
+        last_book_added_at=stats.last_book_added_at,
     )
 
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Statistiques utilisateur introuvables",
-        )
-
-    return UserBookStatsRead(**row)
-
 
 @router.patch("/{user_id}/status", response_model=UserAdminRead, dependencies=[Depends(get_current_admin)])
 def update_user_status(user_id: int, payload: UserStatusUpdate, db: Session = Depends(get_db)):
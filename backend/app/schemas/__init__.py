@@ -1,12 +1,24 @@
-from .book import Book, BookCreate, BookUpdate, BookPage, BookRecommendation
-from .note import BookNote, BookNoteCreate, BookNoteUpdate
+from .book import (
+    Book,
+    BookBatchRequest,
+    BookBatchResult,
+    BookBatchUpdate,
+    BookCreate,
+    BookUpdate,
+    BookPage,
+    BookRecommendation,
+)
+from .note import BookNote, BookNoteCreate, BookNoteUpdate, BookNotePage
 from .manuscript import (
     Manuscript,
     ManuscriptCreate,
+    ManuscriptOverview,
     ManuscriptUpdate,
     Chapter,
     ChapterCreate,
+    ChapterOverview,
     ChapterUpdate,
     ChapterWithManuscript,
     ManuscriptShareRequest,
+    ShareJobStatus,
 )
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from typing import Optional, List
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .note import BookNote as BookNoteSchema
 
@@ -58,15 +58,36 @@ class Book(BookBase):
     user_id: int
     created_at: datetime
     notes: List[BookNoteSchema] = []
+    # Renseignés uniquement en mode `notes=summary` (notes alors vide)
+    notes_count: Optional[int] = None
+    latest_note_preview: Optional[str] = None
+    latest_note_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class BookPage(BaseModel):
     items: List[Book]
-    total_items: int
+    total_items: Optional[int] = None
     page: int
     page_size: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+class BookBatchUpdate(BookUpdate):
+    id: int
+
+
+class BookBatchRequest(BaseModel):
+    updates: List[BookBatchUpdate] = Field(default_factory=list, max_length=500)
+    delete_ids: List[int] = Field(default_factory=list, max_length=500)
+
+
+class BookBatchResult(BaseModel):
+    updated: int
+    deleted: int
+    reembedded: int
 
 
 class BookRecommendation(BaseModel):
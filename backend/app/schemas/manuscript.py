@@ -30,6 +30,21 @@ class ChapterUpdate(BaseModel):
 class Chapter(ChapterBase):
     id: int
     manuscript_id: int
+    word_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChapterOverview(BaseModel):
+    """Métadonnées d'un chapitre, sans son contenu."""
+
+    id: int
+    manuscript_id: int
+    title: str
+    order_index: int
+    word_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -64,8 +79,41 @@ class Manuscript(ManuscriptBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ManuscriptOverview(ManuscriptBase):
+    """Manuscrit sans le contenu de ses chapitres, avec leurs statistiques agrégées."""
+
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+    chapter_count: int = 0
+    word_count: int = 0
+    last_chapter_updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ManuscriptShareRequest(BaseModel):
     recipients: List[EmailStr]
     chapter_ids: Optional[List[int]] = None
     subject: Optional[str] = None
     message: Optional[str] = None
+
+
+class ShareJobStatus(BaseModel):
+    """Avancement d'un partage exécuté en arrière-plan."""
+
+    id: int
+    manuscript_id: int
+    status: str
+    step: str
+    progress: int
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    run_after: datetime
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
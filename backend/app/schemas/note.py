@@ -20,3 +20,9 @@ class BookNote(BookNoteBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BookNotePage(BaseModel):
+    items: list[BookNote]
+    has_more: bool = False
+    next_cursor: str | None = None
@@ -0,0 +1,143 @@
+"""Maintenance de `api_logs` : agrégats horaires incrémentaux et purge par petits lots.
+
+À lancer périodiquement (cron, ou `docker compose exec backend ...`) :
+
+    python -m app.services.api_log_maintenance --retention-days 90
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.api_log import ApiLog
+from app.models.api_log_rollup import ApiLogHourly, ApiLogHourlyQuery
+
+logger = logging.getLogger(__name__)
+RETENTION_DAYS = 90
+PURGE_BATCH_SIZE = 1000
+TOP_QUERIES_PER_HOUR = 10
+_QUERY_MAX_LENGTH = 255
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _rollup_watermark(db: Session) -> datetime | None:
+    """Première heure à (re)calculer : la dernière heure agrégée, potentiellement incomplète."""
+    last_bucket = db.scalar(select(func.max(ApiLogHourly.bucket_start)))
+    if last_bucket is not None:
+        return last_bucket
+    first_log = db.scalar(select(func.min(ApiLog.created_at)))
+    return _floor_hour(first_log) if first_log else None
+
+
+def _rollup_hour(db: Session, bucket_start: datetime) -> None:
+    bucket_end = bucket_start + timedelta(hours=1)
+    in_bucket = (ApiLog.created_at >= bucket_start, ApiLog.created_at < bucket_end)
+
+    db.execute(delete(ApiLogHourly).where(ApiLogHourly.bucket_start == bucket_start))
+    db.execute(delete(ApiLogHourlyQuery).where(ApiLogHourlyQuery.bucket_start == bucket_start))
+
+    endpoint_rows = db.execute(
+        select(
+            ApiLog.endpoint,
+            func.count(ApiLog.id),
+            func.sum(case((ApiLog.status_code >= 400, 1), else_=0)),
+            func.count(func.distinct(ApiLog.user_id)),
+        )
+        .where(*in_bucket)
+        .group_by(ApiLog.endpoint)
+    ).all()
+    for endpoint, requests, errors, distinct_users in endpoint_rows:
+        db.add(
+            ApiLogHourly(
+                bucket_start=bucket_start,
+                endpoint=endpoint,
+                requests=requests,
+                errors=errors or 0,
+                distinct_users=distinct_users,
+            )
+        )
+
+        query_rows = db.execute(
+            select(ApiLog.query, func.count(ApiLog.id).label("requests"))
+            .where(*in_bucket, ApiLog.endpoint == endpoint, ApiLog.query.is_not(None))
+            .group_by(ApiLog.query)
+            .order_by(func.count(ApiLog.id).desc())
+            .limit(TOP_QUERIES_PER_HOUR)
+        ).all()
+        top_queries: dict[str, int] = {}
+        for query, count in query_rows:
+            key = query[:_QUERY_MAX_LENGTH]
+            top_queries[key] = top_queries.get(key, 0) + count
+        for query, count in top_queries.items():
+            db.add(ApiLogHourlyQuery(bucket_start=bucket_start, endpoint=endpoint, query=query, requests=count))
+
+
+def rollup_api_logs(db: Session, now: datetime | None = None) -> int:
+    """Agrège les heures depuis le dernier agrégat jusqu'à l'heure courante ; renvoie le nombre d'heures traitées."""
+    now = now or utcnow()
+    bucket = _rollup_watermark(db)
+    if bucket is None:
+        return 0
+    current_hour = _floor_hour(now)
+    processed = 0
+    while bucket <= current_hour:
+        _rollup_hour(db, bucket)
+        # Un commit par heure : un job interrompu reprend à la dernière heure écrite
+        db.commit()
+        processed += 1
+        bucket += timedelta(hours=1)
+    return processed
+
+
+def purge_api_logs(
+    db: Session,
+    retention_days: int = RETENTION_DAYS,
+    batch_size: int = PURGE_BATCH_SIZE,
+    now: datetime | None = None,
+) -> int:
+    """Supprime les journaux plus vieux que la rétention, par lots pour ne pas verrouiller la table."""
+    cutoff = (now or utcnow()) - timedelta(days=retention_days)
+    # Jamais de purge de lignes pas encore agrégées
+    watermark = db.scalar(select(func.max(ApiLogHourly.bucket_start)))
+    if watermark is None:
+        return 0
+    cutoff = min(cutoff, watermark)
+
+    deleted = 0
+    while True:
+        ids = db.scalars(
+            select(ApiLog.id).where(ApiLog.created_at < cutoff).order_by(ApiLog.id).limit(batch_size)
+        ).all()
+        if not ids:
+            return deleted
+        db.execute(delete(ApiLog).where(ApiLog.id.in_(ids)))
+        db.commit()
+        deleted += len(ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agrégation et purge de api_logs")
+    parser.add_argument("--retention-days", type=int, default=RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        hours = rollup_api_logs(db)
+        deleted = purge_api_logs(db, args.retention_days, args.batch_size)
+    logger.info("api_logs: %d hour(s) rolled up, %d row(s) purged", hours, deleted)
+
+
+if __name__ == "__main__":
+    main()
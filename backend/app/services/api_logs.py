@@ -0,0 +1,184 @@
+"""Journalisation des appels API, bufferisée hors du chemin des requêtes.
+
+Les entrées sont accumulées en mémoire (taille bornée) puis écrites par lots via un
+INSERT multi-lignes, toutes les `batch_size` entrées ou toutes les `flush_interval`
+secondes, par une tâche de fond démarrée avec l'application.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from fastapi import Request
+from jose import JWTError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.security import decode_access_token, get_access_token_from_request
+from app.database import SessionLocal
+from app.models.api_log import ApiLog
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def extract_user_id(request: Request) -> int | None:
+    token = get_access_token_from_request(request)
+    if not token:
+        return None
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return None
+    user_id = payload.get("sub")
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class ApiLogSink:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10_000,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: deque[dict] = deque()
+        self._lock = threading.Lock()
+        # Une seule écriture à la fois, que le flush vienne de la tâche de fond ou d'un appel direct
+        self._flush_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    def enqueue(
+        self,
+        *,
+        endpoint: str,
+        status_code: int,
+        user_id: int | None = None,
+        query: str | None = None,
+        error_message: str | None = None,
+    ) -> bool:
+        """Ajoute une entrée au buffer ; renvoie False si elle est abandonnée (buffer plein)."""
+        entry = {
+            "created_at": utcnow(),
+            "user_id": user_id,
+            "endpoint": endpoint,
+            "query": query,
+            "status_code": status_code,
+            "error_message": error_message,
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return False
+            self._buffer.append(entry)
+            batch_ready = len(self._buffer) >= self.batch_size
+        if batch_ready and self._loop is not None and self._wakeup is not None:
+            # Appelable depuis le threadpool comme depuis la boucle
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return True
+
+    def log_request(
+        self,
+        request: Request,
+        *,
+        status_code: int,
+        query: str | None = None,
+        error_message: str | None = None,
+    ) -> bool:
+        return self.enqueue(
+            endpoint=request.url.path,
+            status_code=status_code,
+            user_id=extract_user_id(request),
+            query=query,
+            error_message=error_message,
+        )
+
+    def flush_sync(self) -> int:
+        """Écrit tout le buffer par lots ; renvoie le nombre de lignes écrites."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    return written
+                db = self.session_factory()
+                try:
+                    db.execute(insert(ApiLog).values(batch))
+                    db.commit()
+                except SQLAlchemyError as exc:
+                    db.rollback()
+                    with self._lock:
+                        self.failed_batches += 1
+                        self.dropped += len(batch)
+                    logger.warning("Could not write %d API log entries: %s", len(batch), exc)
+                    continue
+                finally:
+                    db.close()
+                written += len(batch)
+                with self._lock:
+                    self.written += len(batch)
+
+    async def flush(self) -> int:
+        return await asyncio.to_thread(self.flush_sync)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:  # pragma: no cover - la tâche de fond ne doit jamais mourir
+                logger.exception("API log flush failed")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche de fond puis écrit ce qui reste en mémoire."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._loop = None
+        self._wakeup = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed_batches": self.failed_batches,
+            }
+
+
+api_log_sink = ApiLogSink()
@@ -0,0 +1,101 @@
+"""Modifications et suppressions de livres en masse, par requêtes ensemblistes."""
+
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.book_note import BookNote
+from app.schemas import BookBatchUpdate
+from app.services.book_stats import BookChange, BookState, apply_book_changes
+from app.services.embeddings import build_book_text, embed_texts
+from app.services.library_version import bump_library_version
+
+# Champs entrant dans le texte encodé : leur modification impose un nouvel embedding
+_EMBEDDED_FIELDS = {"genre"}
+
+
+class BooksNotFoundError(LookupError):
+    """Certains identifiants n'appartiennent pas à l'utilisateur (rien n'a été appliqué)."""
+
+    def __init__(self, book_ids: list[int]):
+        super().__init__(f"Livres introuvables : {', '.join(map(str, book_ids))}")
+        self.book_ids = book_ids
+
+
+def apply_book_batch(
+    db: Session,
+    user_id: int,
+    updates: Iterable[BookBatchUpdate],
+    delete_ids: Iterable[int],
+) -> dict:
+    """Applique mises à jour et suppressions dans une seule transaction.
+
+    Les mises à jour identiques sont regroupées en un UPDATE … WHERE id IN (…) ; les
+    livres dont le genre change sont ré-encodés en un seul passage du modèle.
+    """
+    to_delete = set(delete_ids)
+    changes_by_id: dict[int, dict] = defaultdict(dict)
+    for item in updates:
+        changes = item.model_dump(exclude={"id"}, exclude_unset=True, exclude_none=True)
+        if item.id not in to_delete and changes:
+            changes_by_id[item.id].update(changes)
+
+    requested = to_delete | set(changes_by_id)
+    if not requested:
+        return {"updated": 0, "deleted": 0, "reembedded": 0}
+    owned = {
+        row.id: BookState(row.status, bool(row.is_favorite))
+        for row in db.execute(
+            select(Book.id, Book.status, Book.is_favorite).where(Book.user_id == user_id, Book.id.in_(requested))
+        )
+    }
+    missing = sorted(requested - owned.keys())
+    if missing:
+        raise BooksNotFoundError(missing)
+
+    # Un UPDATE par jeu de modifications distinct (souvent un seul : « tout passer en Lu »)
+    grouped: dict[tuple, list[int]] = defaultdict(list)
+    for book_id, changes in changes_by_id.items():
+        grouped[tuple(sorted(changes.items()))].append(book_id)
+    for change_set, book_ids in grouped.items():
+        db.execute(
+            update(Book)
+            .where(Book.user_id == user_id, Book.id.in_(book_ids))
+            .values(dict(change_set))
+            .execution_options(synchronize_session=False)
+        )
+
+    reembed_ids = [book_id for book_id, changes in changes_by_id.items() if _EMBEDDED_FIELDS & changes.keys()]
+    if reembed_ids:
+        rows = db.execute(
+            select(Book.id, Book.title, Book.author, Book.description, Book.genre).where(Book.id.in_(reembed_ids))
+        ).all()
+        vectors = embed_texts([build_book_text(row.title, row.author, row.description, row.genre) for row in rows])
+        db.execute(
+            update(Book),
+            [{"id": row.id, "embedding": vector or None} for row, vector in zip(rows, vectors)],
+        )
+
+    if to_delete:
+        # DELETE ensembliste : la cascade ORM ne s'applique pas, les notes partent d'abord
+        db.execute(delete(BookNote).where(BookNote.book_id.in_(to_delete)).execution_options(synchronize_session=False))
+        db.execute(
+            delete(Book)
+            .where(Book.user_id == user_id, Book.id.in_(to_delete))
+            .execution_options(synchronize_session=False)
+        )
+
+    # Les requêtes ensemblistes contournent les écouteurs after_flush : compteurs et version à la main
+    stats_changes = [BookChange(user_id, owned[book_id], None) for book_id in to_delete]
+    for book_id, changes in changes_by_id.items():
+        before = owned[book_id]
+        after = BookState(changes.get("status", before.status), bool(changes.get("is_favorite", before.is_favorite)))
+        if after != before:
+            stats_changes.append(BookChange(user_id, before, after))
+    apply_book_changes(db.connection(), stats_changes)
+    bump_library_version(db, [user_id])
+    db.commit()
+    return {"updated": len(changes_by_id), "deleted": len(to_delete), "reembedded": len(reembed_ids)}
@@ -0,0 +1,117 @@
+"""Export d'une bibliothèque en flux (NDJSON ou CSV), lu par lots via un curseur serveur."""
+
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Iterator, Sequence
+
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.book_note import BookNote
+from app.services.book_notes import notes_summaries
+
+EXPORT_BATCH_SIZE = 500
+# Toutes les colonnes exposées par l'API (l'embedding n'est jamais exporté)
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "author",
+    "description",
+    "status",
+    "genre",
+    "isbn",
+    "publication_date",
+    "cover_image",
+    "external_id",
+    "is_favorite",
+    "created_at",
+    "user_id",
+]
+CSV_COLUMNS = [column for column in EXPORT_COLUMNS if column != "user_id"] + ["notes_count"]
+
+
+def _iter_partitions(db: Session, user_id: int) -> Iterator[Sequence[Row]]:
+    """Lots de EXPORT_BATCH_SIZE lignes brutes, sans objets ORM ni carte d'identité.
+
+    La lecture passe par une connexion dédiée en `stream_results` (curseur côté serveur
+    sur MySQL) : les requêtes annexes (notes) restent sur la session, car un curseur non
+    bufferisé interdit toute autre requête sur sa connexion tant qu'il n'est pas épuisé.
+    """
+    statement = (
+        select(*(Book.__table__.c[column] for column in EXPORT_COLUMNS))
+        .where(Book.user_id == user_id)
+        .order_by(Book.id)
+    )
+    with db.get_bind().connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(statement)
+        yield from result.partitions()
+
+
+def _notes_by_book(db: Session, book_ids: list[int]) -> dict[int, list[dict]]:
+    notes: dict[int, list[dict]] = defaultdict(list)
+    rows = db.execute(
+        select(BookNote.id, BookNote.book_id, BookNote.content, BookNote.created_at)
+        .where(BookNote.book_id.in_(book_ids))
+        .order_by(BookNote.book_id, BookNote.created_at.desc(), BookNote.id.desc())
+    )
+    for row in rows:
+        notes[row.book_id].append(
+            {
+                "id": row.id,
+                "book_id": row.book_id,
+                "content": row.content,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+        )
+    return notes
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def export_ndjson(db: Session, user_id: int) -> Iterator[str]:
+    """Un livre par ligne, notes comprises, avec les champs de la réponse API."""
+    for partition in _iter_partitions(db, user_id):
+        notes = _notes_by_book(db, [row.id for row in partition])
+        yield "".join(
+            json.dumps(
+                {
+                    **{column: _json_value(value) for column, value in row._mapping.items()},
+                    "notes": notes.get(row.id, []),
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in partition
+        )
+
+
+def export_csv(db: Session, user_id: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+
+    def drain() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    # BOM pour qu'Excel ouvre le fichier en UTF-8
+    buffer.write("\ufeff")
+    writer.writeheader()
+    yield drain()
+    for partition in _iter_partitions(db, user_id):
+        summaries = notes_summaries(db, (row.id for row in partition))
+        for row in partition:
+            summary = summaries.get(row.id)
+            writer.writerow(
+                {
+                    **{column: _json_value(value) for column, value in row._mapping.items()},
+                    "notes_count": summary.count if summary else 0,
+                }
+            )
+        yield drain()
@@ -0,0 +1,211 @@
+"""Import en masse d'une bibliothèque (CSV ou JSON) : validation au fil de l'eau,
+dédoublonnage ensembliste, insertions multi-lignes et encodage des embeddings par lots."""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator, NamedTuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.book import Book, utcnow
+from app.schemas import BookCreate
+from app.services.book_stats import BookChange, BookState, apply_book_changes
+from app.services.embeddings import build_book_text, embed_texts
+from app.services.library_version import bump_library_version
+
+DEFAULT_STATUS = "À lire"
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_ROWS = 10_000
+# Au-delà, le rapport final ne détaille plus les lignes rejetées (seulement leur nombre)
+_MAX_REPORTED_ERRORS = 100
+# Nouveaux essais d'un lot en conflit d'insertion avant de repasser ligne à ligne
+_MAX_BATCH_RETRIES = 3
+
+# En-têtes CSV usuels des exports d'autres applications → champs de BookCreate
+_CSV_ALIASES = {
+    "titre": "title",
+    "auteur": "author",
+    "author l-f": "author",
+    "résumé": "description",
+    "statut": "status",
+    "exclusive shelf": "status",
+    "isbn13": "isbn",
+    "date de publication": "publication_date",
+    "year published": "publication_date",
+    "couverture": "cover_image",
+    "genre": "genre",
+    "favori": "is_favorite",
+}
+_STATUS_ALIASES = {
+    "read": "Lu",
+    "to-read": "À lire",
+    "currently-reading": "En cours",
+}
+
+
+class ImportFormatError(ValueError):
+    """Corps de requête illisible (encodage, JSON mal formé, format non pris en charge)."""
+
+
+class UnreadableRow(NamedTuple):
+    """Ligne que le lecteur CSV n'a pas pu découper : rejetée sans interrompre l'import."""
+
+    error: str
+
+
+def _normalize_key(key: str) -> str:
+    cleaned = (key or "").strip().lower()
+    return _CSV_ALIASES.get(cleaned, cleaned.replace(" ", "_"))
+
+
+def _iter_csv_rows(text: str) -> Iterator[dict | UnreadableRow]:
+    reader = csv.DictReader(io.StringIO(text))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # Le lecteur repart à la ligne suivante
+            yield UnreadableRow(f"CSV invalide : {exc}")
+            continue
+        yield {_normalize_key(key): value for key, value in row.items() if key and value not in (None, "")}
+
+
+def iter_import_rows(body: bytes, content_type: str) -> Iterator[dict | UnreadableRow]:
+    """Lignes brutes du fichier, produites une à une (la validation se fait en aval)."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("Le fichier doit être encodé en UTF-8") from exc
+
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        yield from _iter_csv_rows(text)
+    elif media_type == "application/json":
+        try:
+            payload = json.loads(text)
+        except ValueError as exc:
+            raise ImportFormatError("JSON invalide") from exc
+        if isinstance(payload, dict):
+            payload = payload.get("books", [])
+        if not isinstance(payload, list):
+            raise ImportFormatError("Le JSON doit être une liste de livres")
+        for row in payload:
+            yield row if isinstance(row, dict) else {}
+    else:
+        raise ImportFormatError("Format non pris en charge (text/csv ou application/json)")
+
+
+def _existing_external_ids(db: Session, user_id: int, external_ids: set[str]) -> set[str]:
+    if not external_ids:
+        return set()
+    rows = db.query(Book.external_id).filter(Book.user_id == user_id, Book.external_id.in_(external_ids))
+    return {external_id for (external_id,) in rows}
+
+
+def _insert_batch(db: Session, user_id: int, batch: list[BookCreate], seen: set[str]) -> tuple[int, int]:
+    """Insère un lot après dédoublonnage ; renvoie (insérés, doublons)."""
+    existing = _existing_external_ids(db, user_id, {book.external_id for book in batch if book.external_id})
+    fresh: list[BookCreate] = []
+    for book in batch:
+        if book.external_id:
+            if book.external_id in existing or book.external_id in seen:
+                continue
+            seen.add(book.external_id)
+        fresh.append(book)
+    duplicates = len(batch) - len(fresh)
+    if not fresh:
+        return 0, duplicates
+
+    vectors = embed_texts(
+        [build_book_text(book.title, book.author, book.description, book.genre) for book in fresh]
+    )
+    values = []
+    created_at = utcnow()
+    for book, vector in zip(fresh, vectors):
+        data = book.model_dump()
+        status = (data.get("status") or DEFAULT_STATUS).strip()
+        data["status"] = _STATUS_ALIASES.get(status.lower(), status)
+        data["is_favorite"] = bool(data.get("is_favorite"))
+        values.append({**data, "user_id": user_id, "embedding": vector or None, "created_at": created_at})
+    db.execute(insert(Book), values)
+    # L'INSERT Core ne passe pas par les écouteurs after_flush
+    apply_book_changes(
+        db.connection(),
+        [BookChange(user_id, None, BookState(row["status"], row["is_favorite"], row["created_at"])) for row in values],
+    )
+    bump_library_version(db, [user_id])
+    db.commit()
+    return len(values), duplicates
+
+
+def import_books(
+    db: Session,
+    user_id: int,
+    rows: Iterable[dict | UnreadableRow],
+    batch_size: int | None = None,
+) -> Iterator[dict]:
+    """Importe les lignes par lots et produit un état d'avancement après chaque lot.
+
+    Le dernier état porte `done: True` et la liste (tronquée) des lignes rejetées.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    progress = {"processed": 0, "inserted": 0, "duplicates": 0, "rejected": 0}
+    errors: list[dict] = []
+    seen: set[str] = set()
+    batch: list[tuple[int, BookCreate]] = []
+
+    def reject(line_number: int, error: str) -> None:
+        progress["rejected"] += 1
+        if len(errors) < _MAX_REPORTED_ERRORS:
+            errors.append({"row": line_number, "error": error})
+
+    def insert_rows(rows_to_insert: list[tuple[int, BookCreate]]) -> tuple[int, int]:
+        books = [book for _, book in rows_to_insert]
+        for _ in range(_MAX_BATCH_RETRIES):
+            try:
+                return _insert_batch(db, user_id, books, seen)
+            except IntegrityError:
+                # Ajout concurrent d'un même livre : les doublons sont recalculés
+                db.rollback()
+                seen.difference_update(book.external_id for book in books if book.external_id)
+        if len(rows_to_insert) > 1:
+            # Conflit persistant : ligne à ligne, pour isoler les lignes fautives
+            totals = [insert_rows([row]) for row in rows_to_insert]
+            return sum(inserted for inserted, _ in totals), sum(duplicates for _, duplicates in totals)
+        reject(rows_to_insert[0][0], "Insertion refusée par la base (conflit)")
+        return 0, 0
+
+    def flush() -> Iterator[dict]:
+        inserted, duplicates = insert_rows(batch)
+        progress["inserted"] += inserted
+        progress["duplicates"] += duplicates
+        batch.clear()
+        yield dict(progress, done=False)
+
+    for line_number, row in enumerate(rows, start=1):
+        if line_number > MAX_IMPORT_ROWS:
+            errors.append({"row": line_number, "error": f"Import limité à {MAX_IMPORT_ROWS} livres"})
+            break
+        progress["processed"] += 1
+        if isinstance(row, UnreadableRow):
+            reject(line_number, row.error)
+            continue
+        try:
+            batch.append((line_number, BookCreate.model_validate(row)))
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            reject(line_number, f"{field}: {first['msg']}")
+            continue
+        if len(batch) >= batch_size:
+            yield from flush()
+    if batch:
+        yield from flush()
+
+    yield dict(progress, done=True, errors=errors)
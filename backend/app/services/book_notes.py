@@ -0,0 +1,49 @@
+"""Lectures agrégées des notes de lecture, pour ne pas charger leur contenu dans les listes."""
+
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.book_note import BookNote
+
+NOTE_PREVIEW_LENGTH = 200
+
+
+class NotesSummary(NamedTuple):
+    count: int
+    latest_preview: str
+    latest_at: datetime | None
+
+
+def notes_summaries(db: Session, book_ids: Iterable[int]) -> dict[int, NotesSummary]:
+    """Nombre de notes et aperçu de la plus récente, pour chaque livre, en une seule requête.
+
+    Les livres sans note sont absents du dictionnaire.
+    """
+    ids = list(book_ids)
+    if not ids:
+        return {}
+    ranked = (
+        select(
+            BookNote.book_id,
+            func.substr(BookNote.content, 1, NOTE_PREVIEW_LENGTH).label("preview"),
+            BookNote.created_at,
+            func.count().over(partition_by=BookNote.book_id).label("notes_count"),
+            func.row_number()
+            .over(partition_by=BookNote.book_id, order_by=(BookNote.created_at.desc(), BookNote.id.desc()))
+            .label("position"),
+        )
+        .where(BookNote.book_id.in_(ids))
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked.c.book_id, ranked.c.notes_count, ranked.c.preview, ranked.c.created_at).where(
+            ranked.c.position == 1
+        )
+    )
+    return {
+        book_id: NotesSummary(count=count, latest_preview=preview, latest_at=created_at)
+        for book_id, count, preview, created_at in rows
+    }
@@ -0,0 +1,203 @@
+"""Maintenance incrémentale de `user_book_stats` et reconstruction complète.
+
+Chaque ajout, suppression, changement de statut ou de favori d'un livre applique un
+delta aux compteurs dans la même transaction : via l'écouteur `after_flush` pour les
+écritures ORM, via `apply_book_changes` pour les écritures Core en masse. La
+reconstruction (`rebuild_user_book_stats`) sert de filet de sécurité :
+
+    python -m app.services.book_stats
+"""
+
+import argparse
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import case, event, func, insert, inspect, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.book import Book
+from app.models.user import User
+from app.models.user_book_stats import UserBookStats
+
+logger = logging.getLogger(__name__)
+
+# Statuts comptés séparément (mêmes libellés que le frontend)
+STATUS_COLUMNS = {
+    "À lire": "to_read_count",
+    "En cours": "in_progress_count",
+    "Lu": "read_count",
+}
+COUNTER_COLUMNS = ["total_books", *STATUS_COLUMNS.values(), "favorite_count"]
+
+
+class BookState(NamedTuple):
+    status: str | None
+    is_favorite: bool
+    created_at: datetime | None = None
+
+
+class BookChange(NamedTuple):
+    """État d'un livre avant/après l'écriture (None : livre absent)."""
+
+    user_id: int
+    before: BookState | None
+    after: BookState | None
+
+
+def _counters(state: BookState) -> dict[str, int]:
+    counters = {"total_books": 1, "favorite_count": 1 if state.is_favorite else 0}
+    status_column = STATUS_COLUMNS.get(state.status)
+    if status_column:
+        counters[status_column] = 1
+    return counters
+
+
+def _apply_deltas(connection: Connection, user_id: int, deltas: dict[str, int], last_added: datetime | None) -> None:
+    table = UserBookStats.__table__
+    values = {
+        "user_id": user_id,
+        "last_book_added_at": last_added,
+        **{column: deltas.get(column, 0) for column in COUNTER_COLUMNS},
+    }
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "mysql"):
+        statement = (sqlite_insert if dialect == "sqlite" else mysql_insert)(table).values(values)
+        incoming = statement.excluded if dialect == "sqlite" else statement.inserted
+        set_ = {column: table.c[column] + incoming[column] for column in COUNTER_COLUMNS}
+        set_["last_book_added_at"] = case(
+            (table.c.last_book_added_at.is_(None), incoming.last_book_added_at),
+            (incoming.last_book_added_at > table.c.last_book_added_at, incoming.last_book_added_at),
+            else_=table.c.last_book_added_at,
+        )
+        if dialect == "sqlite":
+            statement = statement.on_conflict_do_update(index_elements=[table.c.user_id], set_=set_)
+        else:
+            statement = statement.on_duplicate_key_update(set_)
+        connection.execute(statement)
+        return
+    result = connection.execute(
+        update(table)
+        .where(table.c.user_id == user_id)
+        .values({column: table.c[column] + values[column] for column in COUNTER_COLUMNS})
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(values))
+    elif last_added is not None:
+        _refresh_last_added(connection, [user_id])
+
+
+def _refresh_last_added(connection: Connection, user_ids: Iterable[int]) -> None:
+    table = UserBookStats.__table__
+    latest = (
+        select(func.max(Book.created_at))
+        .where(Book.user_id == table.c.user_id)
+        .scalar_subquery()
+    )
+    connection.execute(update(table).where(table.c.user_id.in_(list(user_ids))).values(last_book_added_at=latest))
+
+
+def apply_book_changes(connection: Connection, changes: Iterable[BookChange]) -> None:
+    """Reporte une série de changements de livres sur les compteurs (un upsert par utilisateur)."""
+    deltas: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    last_added: dict[int, datetime | None] = {}
+    removed_users: set[int] = set()
+    for change in changes:
+        delta = deltas[change.user_id]
+        if change.before is not None:
+            for column, value in _counters(change.before).items():
+                delta[column] -= value
+        if change.after is not None:
+            for column, value in _counters(change.after).items():
+                delta[column] += value
+        if change.before is None and change.after is not None and change.after.created_at:
+            current = last_added.get(change.user_id)
+            last_added[change.user_id] = max(current, change.after.created_at) if current else change.after.created_at
+        if change.after is None:
+            removed_users.add(change.user_id)
+
+    for user_id, delta in deltas.items():
+        if any(delta.values()) or user_id in last_added:
+            _apply_deltas(connection, user_id, delta, last_added.get(user_id))
+    if removed_users:
+        # Le livre le plus récent a pu disparaître : relu via l'index (user_id, created_at)
+        _refresh_last_added(connection, removed_users)
+
+
+def _previous_value(book: Book, attribute: str):
+    # En after_flush, l'historique des attributs reflète encore l'état d'avant l'écriture
+    history = inspect(book).attrs[attribute].history
+    return history.deleted[0] if history.deleted else getattr(book, attribute)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_orm_book_writes(session: Session, flush_context) -> None:
+    changes: list[BookChange] = []
+    for obj in session.new:
+        if isinstance(obj, Book):
+            changes.append(BookChange(obj.user_id, None, BookState(obj.status, bool(obj.is_favorite), obj.created_at)))
+    for obj in session.deleted:
+        if isinstance(obj, Book):
+            before = BookState(_previous_value(obj, "status"), bool(_previous_value(obj, "is_favorite")))
+            changes.append(BookChange(obj.user_id, before, None))
+    for obj in session.dirty:
+        if not isinstance(obj, Book) or obj in session.deleted:
+            continue
+        before = BookState(_previous_value(obj, "status"), bool(_previous_value(obj, "is_favorite")))
+        after = BookState(obj.status, bool(obj.is_favorite))
+        if before != after:
+            changes.append(BookChange(obj.user_id, before, after))
+    if changes:
+        apply_book_changes(session.connection(), changes)
+
+
+def rebuild_user_book_stats(db: Session, user_ids: Iterable[int] | None = None) -> int:
+    """Recalcule les compteurs depuis `books` (tous les utilisateurs par défaut)."""
+    table = UserBookStats.__table__
+    status_sums = {
+        column: func.coalesce(func.sum(case((Book.status == status, 1), else_=0)), 0)
+        for status, column in STATUS_COLUMNS.items()
+    }
+    aggregate = (
+        select(
+            User.id.label("user_id"),
+            func.count(Book.id).label("total_books"),
+            *(expression.label(column) for column, expression in status_sums.items()),
+            func.coalesce(func.sum(case((Book.is_favorite.is_(True), 1), else_=0)), 0).label("favorite_count"),
+            func.max(Book.created_at).label("last_book_added_at"),
+        )
+        .select_from(User)
+        .outerjoin(Book, Book.user_id == User.id)
+        .group_by(User.id)
+    )
+    delete_statement = table.delete()
+    if user_ids is not None:
+        ids = list(user_ids)
+        aggregate = aggregate.where(User.id.in_(ids))
+        delete_statement = delete_statement.where(table.c.user_id.in_(ids))
+    db.execute(delete_statement)
+    result = db.execute(
+        insert(table).from_select(
+            ["user_id", *COUNTER_COLUMNS, "last_book_added_at"],
+            aggregate,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def main() -> None:
+    argparse.ArgumentParser(description="Reconstruction de user_book_stats").parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        rows = rebuild_user_book_stats(db)
+    logger.info("user_book_stats: %d user(s) rebuilt", rows)
+
+
+if __name__ == "__main__":
+    main()
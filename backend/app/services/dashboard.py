@@ -0,0 +1,136 @@
+"""Données agrégées du tableau de bord, et cache des recommandations (calcul lent)."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, noload, selectinload
+
+from app.models.book import Book
+from app.models.chapter import Chapter
+from app.models.manuscript import Manuscript
+from app.models.user_book_stats import UserBookStats
+from app.services.book_stats import STATUS_COLUMNS
+from app.services.google_books import UpstreamUnavailableError
+from app.services.recommendations import recommend_books
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+HIGHLIGHT_SIZE = 12
+RECENT_CHAPTERS = 6
+RECOMMENDATION_LIMIT = 12
+_RECOMMENDATION_TTL_SECONDS = 600
+# Au-delà, les utilisateurs les moins récemment servis sortent du cache
+_RECOMMENDATION_CACHE_SIZE = 1024
+
+# user_id -> (version de la bibliothèque, horodatage, recommandations), ordre LRU
+_RECOMMENDATIONS: OrderedDict[int, tuple[int, float, list[dict]]] = OrderedDict()
+# Calculs en cours uniquement : chaque tâche se retire à la fin
+_RECOMMENDATION_TASKS: dict[int, asyncio.Task] = {}
+
+
+async def run_with_session(bind: Engine, func: Callable[[Session], T]) -> T:
+    """Exécute `func` dans un thread avec sa propre session (une session n'est pas partageable entre threads)."""
+
+    def call() -> T:
+        with Session(bind=bind) as db:
+            return func(db)
+
+    return await run_in_threadpool(call)
+
+
+def load_highlights(db: Session, user_id: int) -> dict[str, list[Book]]:
+    """Derniers livres de chaque statut ; les totaux viennent des compteurs user_book_stats."""
+    highlights = {}
+    for status in STATUS_COLUMNS:
+        highlights[status] = (
+            db.query(Book)
+            .options(noload(Book.notes))
+            .filter(Book.user_id == user_id, Book.status == status)
+            .order_by(Book.created_at.desc(), Book.id.desc())
+            .limit(HIGHLIGHT_SIZE)
+            .all()
+        )
+    db.expunge_all()
+    return highlights
+
+
+def load_stats(db: Session, user_id: int) -> UserBookStats | None:
+    stats = db.get(UserBookStats, user_id)
+    if stats is not None:
+        db.expunge(stats)
+    return stats
+
+
+def load_recent_chapters(db: Session, user_id: int) -> list[Chapter]:
+    chapters = (
+        db.query(Chapter)
+        .join(Manuscript, Chapter.manuscript_id == Manuscript.id)
+        .options(selectinload(Chapter.manuscript))
+        .filter(Manuscript.user_id == user_id)
+        .order_by(Chapter.created_at.desc())
+        .limit(RECENT_CHAPTERS)
+        .all()
+    )
+    db.expunge_all()
+    return chapters
+
+
+def cached_recommendations(user_id: int, library_version: int) -> list[dict] | None:
+    cached = _RECOMMENDATIONS.get(user_id)
+    if cached is None:
+        return None
+    version, computed_at, items = cached
+    if time.monotonic() - computed_at > _RECOMMENDATION_TTL_SECONDS:
+        _RECOMMENDATIONS.pop(user_id, None)
+        return None
+    if version != library_version:
+        return None
+    _RECOMMENDATIONS.move_to_end(user_id)
+    return items
+
+
+def _store_recommendations(user_id: int, library_version: int, items: list[dict]) -> None:
+    _RECOMMENDATIONS[user_id] = (library_version, time.monotonic(), items)
+    _RECOMMENDATIONS.move_to_end(user_id)
+    while len(_RECOMMENDATIONS) > _RECOMMENDATION_CACHE_SIZE:
+        _RECOMMENDATIONS.popitem(last=False)
+
+
+def schedule_recommendations(bind: Engine, user_id: int, library_version: int) -> asyncio.Task:
+    """Lance le calcul des recommandations s'il n'est pas déjà en cours pour cet utilisateur."""
+    task = _RECOMMENDATION_TASKS.get(user_id)
+    if task is not None and not task.done():
+        return task
+
+    async def compute() -> list[dict]:
+        try:
+            items = await run_with_session(bind, lambda db: recommend_books(db, user_id, limit=RECOMMENDATION_LIMIT))
+        except UpstreamUnavailableError:
+            logger.warning("Recommendations unavailable for user %s", user_id)
+            return []
+        except Exception:
+            # Rien n'est mis en cache : le prochain appel relance le calcul
+            logger.exception("Recommendations failed for user %s", user_id)
+            return []
+        _store_recommendations(user_id, library_version, items)
+        return items
+
+    def forget(done: asyncio.Task) -> None:
+        if _RECOMMENDATION_TASKS.get(user_id) is done:
+            del _RECOMMENDATION_TASKS[user_id]
+
+    task = asyncio.create_task(compute())
+    _RECOMMENDATION_TASKS[user_id] = task
+    task.add_done_callback(forget)
+    return task
+
+
+async def refresh_recommendations(bind: Engine, user_id: int, library_version: int) -> list[dict]:
+    # shield : une requête annulée n'interrompt pas le calcul partagé
+    return await asyncio.shield(schedule_recommendations(bind, user_id, library_version))
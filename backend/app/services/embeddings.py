@@ -38,6 +38,22 @@ def embed_text(text: str) -> list[float]:
     return vector.astype(float).tolist()
 
 
+def embed_texts(texts: list[str], batch_size: int = 64) -> list[list[float]]:
+    """Encode plusieurs textes en un seul appel au modèle ; les textes vides donnent []."""
+    indexed = [(index, text) for index, text in enumerate(texts) if text and text.strip()]
+    vectors: list[list[float]] = [[] for _ in texts]
+    if not indexed:
+        return vectors
+    encoded = _get_model().encode(
+        [text for _, text in indexed],
+        batch_size=batch_size,
+        normalize_embeddings=True,
+    )
+    for (index, _), vector in zip(indexed, encoded):
+        vectors[index] = vector.astype(float).tolist()
+    return vectors
+
+
 def cosine_similarity(vec_a: Iterable[float], vec_b: Iterable[float]) -> float:
     a = np.asarray(list(vec_a), dtype=float)
     b = np.asarray(list(vec_b), dtype=float)
@@ -1,137 +1,634 @@
+import asyncio
+import base64
+import binascii
+import contextvars
+import json
 import logging
 import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
 
-import requests
+import httpx
+import orjson
 from dotenv import load_dotenv
 
+from app.services.rate_limit import INTERACTIVE, TokenBucketLimiter
+
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_BOOKS_API_KEY")
+GOOGLE_BOOKS_URL = os.getenv("GOOGLE_BOOKS_API_URL", "https://www.googleapis.com/books/v1/volumes")
+# Réponse partielle : seuls les champs réellement utilisés sont téléchargés
+GOOGLE_BOOKS_FIELDS = (
+    "totalItems,items(id,volumeInfo(title,authors,categories,description,"
+    "imageLinks(thumbnail,smallThumbnail),publishedDate,industryIdentifiers,language))"
+)
 logger = logging.getLogger(__name__)
 _CACHE_TTL_SECONDS = 300
-_CACHE: dict[tuple, dict] = {}
+# Au-delà du TTL, une page expirée reste servable tant que Google est indisponible
+_STALE_TTL_SECONDS = 6 * 60 * 60
+# Les pages vides sont mises en cache moins longtemps, et à part
+_NEGATIVE_CACHE_TTL_SECONDS = 30
+# Nombre d'entrées gardées par cache, les moins récemment utilisées sortent en premier
+_CACHE_SIZE = 2048
+_NEGATIVE_CACHE: OrderedDict[tuple, float] = OrderedDict()
+# Pages brutes Google Books, mises en cache individuellement (clé : requête + startIndex)
+_CACHE: OrderedDict[tuple, dict] = OrderedDict()
+# Par requête : offset filtré du premier élément d'une page brute -> startIndex de cette page
+_OFFSET_INDEX: OrderedDict[tuple, dict] = OrderedDict()
+_RAW_PAGE_SIZE = 40
+_REQUEST_TIMEOUT_SECONDS = 10
+# Budget total d'un appel `_fetch_page`, tentatives et attentes comprises
+_REQUEST_DEADLINE_SECONDS = 8
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY_SECONDS = 0.5
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_BREAKER_FAILURE_THRESHOLD = 3
+_BREAKER_RESET_SECONDS = 30
+# Quota sortant : tout appel HTTP vers Google consomme un jeton
+_RATE_LIMITER = TokenBucketLimiter(
+    rate=float(os.getenv("GOOGLE_BOOKS_RATE_PER_SECOND", "5")),
+    capacity=float(os.getenv("GOOGLE_BOOKS_RATE_BURST", "10")),
+    background_reserve=float(os.getenv("GOOGLE_BOOKS_BACKGROUND_RESERVE", "2")),
+    store_path=os.getenv("GOOGLE_BOOKS_RATE_LIMIT_DB") or None,
+    name="google_books",
+)
+# Priorité de la recherche en cours, lue par `_fetch_page` sans changer sa signature
+_PRIORITY: contextvars.ContextVar[str] = contextvars.ContextVar("google_books_priority", default=INTERACTIVE)
+# Un client HTTP asynchrone par boucle d'événements (connexions réutilisées entre requêtes)
+_CLIENTS: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+# Transport alternatif (doublure de Google pour les tests de charge), cf. google_books_replay
+_TRANSPORT_FACTORY = None
+# Fermetures planifiées sur la boucle courante (référence gardée jusqu'à leur fin)
+_CLOSING_TASKS: set[asyncio.Task] = set()
+if os.getenv("GOOGLE_BOOKS_TRANSPORT"):
+    from app.services.google_books_replay import transport_factory_from_env
+
+    _TRANSPORT_FACTORY = transport_factory_from_env()
+
+
+class UpstreamUnavailableError(Exception):
+    """Google Books n'a pas répondu (circuit ouvert, erreurs ou délai dépassé)."""
+
+
+class _CircuitBreaker:
+    """Disjoncteur closed/open/half-open partagé par tous les threads du processus."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open : une seule requête de test à la fois
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Aucune requête n'est partie (quota, annulation avant envoi) : la sonde est rendue sans verdict."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_BREAKERS: dict[str, _CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def _get_breaker(upstream: str) -> _CircuitBreaker:
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(upstream)
+        if breaker is None:
+            breaker = _CircuitBreaker(_BREAKER_FAILURE_THRESHOLD, _BREAKER_RESET_SECONDS)
+            _BREAKERS[upstream] = breaker
+        return breaker
+
+
+class _LeaderAborted(Exception):
+    """Le meneur d'un appel regroupé a été annulé : un suiveur doit reprendre l'appel."""
+
+
+class _SingleFlight:
+    """Regroupe les appels identiques concurrents : le premier exécute, les autres attendent.
+
+    Les résultats transitent par des `concurrent.futures.Future`, ce qui permet de partager
+    un appel entre threads (wrapper sync, une boucle par appel) et coroutines d'une même boucle.
+    Seules les erreurs ordinaires du meneur sont transmises aux suiveurs : s'il est annulé,
+    l'un d'eux devient le nouveau meneur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[tuple, Future] = {}
+        self.coalesced_count = 0
+
+    async def do(self, key: tuple, func):
+        while True:
+            with self._lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._in_flight[key] = future
+                else:
+                    self.coalesced_count += 1
+
+            if leader:
+                return await self._lead(key, future, func)
+            try:
+                # shield : l'annulation d'un suiveur n'annule pas le Future partagé
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderAborted:
+                continue
+
+    async def _lead(self, key: tuple, future: Future, func):
+        try:
+            result = await func()
+        except Exception as exc:
+            self._release(key, future)
+            future.set_exception(exc)
+            raise
+        except BaseException:
+            self._release(key, future)
+            future.set_exception(_LeaderAborted())
+            raise
+        self._release(key, future)
+        future.set_result(result)
+        return result
+
+    def _release(self, key: tuple, future: Future) -> None:
+        # Retirée avant de réveiller les suiveurs, pour qu'un nouvel appel ne reprenne pas ce Future
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+
+_SEARCH_FLIGHTS = _SingleFlight()
 
 
-def _format_book(item):
-    volume = item.get("volumeInfo", {})
+def get_coalescing_stats() -> dict:
+    return {"coalesced_calls": _SEARCH_FLIGHTS.coalesced_count}
+
+
+def get_rate_limit_stats() -> dict:
+    return _RATE_LIMITER.stats()
+
+
+@dataclass(slots=True, frozen=True)
+class Volume:
+    """Volume Google Books réduit aux champs exploités par l'application."""
+
+    id: str | None
+    title: str | None
+    authors: tuple[str, ...] = ()
+    categories: tuple[str, ...] = ()
+    description: str = ""
+    thumbnail: str | None = None
+    small_thumbnail: str | None = None
+    published_date: str | None = None
+    # Paires (type, identifiant), ex. ("ISBN_13", "978...")
+    industry_identifiers: tuple[tuple[str | None, str | None], ...] = ()
+    language: str | None = None
+
+    @classmethod
+    def from_item(cls, item: dict) -> "Volume":
+        volume = item.get("volumeInfo") or {}
+        image_links = volume.get("imageLinks") or {}
+        return cls(
+            id=item.get("id"),
+            title=volume.get("title"),
+            authors=tuple(volume.get("authors") or ()),
+            categories=tuple(volume.get("categories") or ()),
+            description=volume.get("description") or "",
+            thumbnail=image_links.get("thumbnail"),
+            small_thumbnail=image_links.get("smallThumbnail"),
+            published_date=volume.get("publishedDate"),
+            industry_identifiers=tuple(
+                (identifier.get("type"), identifier.get("identifier"))
+                for identifier in volume.get("industryIdentifiers") or ()
+            ),
+            language=volume.get("language"),
+        )
+
+
+def format_book(volume: Volume) -> dict:
+    """Représentation API d'un volume (structure `volumeInfo` de Google, attendue par le frontend)."""
+    image_links = {}
+    if volume.thumbnail:
+        image_links["thumbnail"] = volume.thumbnail
+    if volume.small_thumbnail:
+        image_links["smallThumbnail"] = volume.small_thumbnail
     return {
-        "id": item.get("id"),
+        "id": volume.id,
         "volumeInfo": {
-            "title": volume.get("title"),
-            "authors": volume.get("authors", []),
-            "categories": volume.get("categories", []),
-            "description": volume.get("description", ""),
-            "imageLinks": volume.get("imageLinks", {}),
-            "publishedDate": volume.get("publishedDate"),
-            "industryIdentifiers": volume.get("industryIdentifiers", []),
-            "language": volume.get("language"),
+            "title": volume.title,
+            "authors": list(volume.authors),
+            "categories": list(volume.categories),
+            "description": volume.description,
+            "imageLinks": image_links,
+            "publishedDate": volume.published_date,
+            "industryIdentifiers": [
+                {"type": id_type, "identifier": identifier}
+                for id_type, identifier in volume.industry_identifiers
+            ],
+            "language": volume.language,
         },
     }
 
 
-def _matches_language(item: dict, expected_language: str | None) -> bool:
+def _matches_language(volume: Volume, expected_language: str | None) -> bool:
     if not expected_language:
         return True
-    volume = item.get("volumeInfo", {}) or {}
-    return (volume.get("language") or "").lower() == expected_language.lower()
+    return (volume.language or "").lower() == expected_language.lower()
+
+
+def _get_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        transport = _TRANSPORT_FACTORY() if _TRANSPORT_FACTORY else None
+        client = httpx.AsyncClient(timeout=_REQUEST_TIMEOUT_SECONDS, transport=transport)
+        _CLIENTS[loop] = client
+    return client
+
+
+def _close_client(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """Ferme un client sur sa propre boucle si possible, sinon sur une boucle de passage."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    try:
+        if loop.is_running() and loop is not running:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        elif running is not None:
+            task = running.create_task(client.aclose())
+            _CLOSING_TASKS.add(task)
+            task.add_done_callback(_CLOSING_TASKS.discard)
+        elif not loop.is_closed():
+            loop.run_until_complete(client.aclose())
+        else:
+            asyncio.run(client.aclose())
+    except Exception as exc:  # boucle disparue : les connexions seront libérées par le GC
+        logger.warning("Closing Google Books HTTP client failed: %s", exc)
+
+
+def set_transport_factory(factory) -> None:
+    """Remplace le transport HTTP des prochains clients (None : accès réseau normal).
 
+    Les clients existants sont fermés, sans quoi leurs connexions resteraient ouvertes.
+    """
+    global _TRANSPORT_FACTORY
+    _TRANSPORT_FACTORY = factory
+    while _CLIENTS:
+        loop, client = _CLIENTS.popitem()
+        if not client.is_closed:
+            _close_client(loop, client)
 
-def _fetch_page(query: str, start_index: int, max_results: int, extra_params: dict | None = None):
+
+async def aclose_client() -> None:
+    """Ferme le client HTTP associé à la boucle courante (arrêt de l'app, wrapper sync)."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _fetch_page(query: str, start_index: int, max_results: int, extra_params: dict | None = None):
     params = {
         "q": query,
         "startIndex": start_index,
         "maxResults": max_results,
+        "fields": GOOGLE_BOOKS_FIELDS,
     }
     if extra_params:
         params.update(extra_params)
     if GOOGLE_API_KEY:
         params["key"] = GOOGLE_API_KEY
 
-    url = "https://www.googleapis.com/books/v1/volumes"
+    priority = _PRIORITY.get()
+    deadline = time.monotonic() + _REQUEST_DEADLINE_SECONDS
+    # Circuit vérifié avant de prendre un jeton : un appel refusé d'office ne consomme pas de quota
+    breaker = _get_breaker(GOOGLE_BOOKS_URL)
+    if not breaker.allow_request():
+        raise UpstreamUnavailableError("Google Books temporairement indisponible (circuit ouvert)")
+
+    client = _get_client()
     last_error: Exception | None = None
-    for attempt in range(3):
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code in {429, 500, 502, 503, 504} and attempt < 2:
-                time.sleep(0.5 * (2 ** attempt))
-                continue
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as exc:
-            last_error = exc
-            if attempt < 2:
-                time.sleep(0.5 * (2 ** attempt))
-                continue
-            break
-    logger.warning("Google Books API request failed: %s", last_error)
-    return {"items": [], "totalItems": 0}
+    succeeded = False
+    sent = False
+    try:
+        for attempt in range(_MAX_ATTEMPTS):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not await _RATE_LIMITER.acquire(priority, timeout=remaining):
+                if not attempt:
+                    raise UpstreamUnavailableError("Quota Google Books saturé")
+                break
+            sent = True
+            try:
+                response = await client.get(
+                    GOOGLE_BOOKS_URL,
+                    params=params,
+                    timeout=min(_REQUEST_TIMEOUT_SECONDS, remaining),
+                )
+            except httpx.HTTPError as exc:
+                last_error = exc
+            else:
+                if response.status_code in _RETRY_STATUSES:
+                    last_error = httpx.HTTPStatusError(
+                        f"HTTP {response.status_code}",
+                        request=response.request,
+                        response=response,
+                    )
+                elif response.is_error:
+                    # 4xx : la requête elle-même est refusée, Google est joignable et un nouvel essai ne changerait rien
+                    breaker.record_success()
+                    succeeded = True
+                    logger.warning("Google Books API rejected request: HTTP %s", response.status_code)
+                    return {"items": [], "totalItems": 0}
+                else:
+                    breaker.record_success()
+                    succeeded = True
+                    return orjson.loads(response.content)
+
+            # Backoff exponentiel avec jitter complet, sans dépasser l'échéance
+            delay = random.uniform(0, _RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+            if attempt + 1 >= _MAX_ATTEMPTS or time.monotonic() + delay >= deadline:
+                break
+            await asyncio.sleep(delay)
+
+        logger.warning("Google Books API request failed: %s", last_error)
+        raise UpstreamUnavailableError("Google Books ne répond pas") from last_error
+    finally:
+        # Toute autre sortie (échec, annulation…) compte comme un échec et libère la sonde half-open
+        if not succeeded:
+            if sent:
+                breaker.record_failure()
+            else:
+                breaker.release_probe()
+
+
+class InvalidCursorError(ValueError):
+    """Curseur de pagination illisible ou falsifié."""
+
+
+def _encode_cursor(raw_start: int, skip: int, filtered_offset: int) -> str:
+    payload = json.dumps({"r": raw_start, "k": skip, "o": filtered_offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        position = (int(payload["r"]), int(payload["k"]), int(payload["o"]))
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as exc:
+        raise InvalidCursorError("Curseur de pagination invalide") from exc
+    if min(position) < 0 or position[0] % _RAW_PAGE_SIZE:
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return position
+
+
+def _remember(cache: OrderedDict, key: tuple, value) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+async def _fetch_raw_page(query: str, raw_start: int, extra_params: dict | None, extra_key: tuple) -> dict:
+    page_key = (query, raw_start, extra_key)
+    now = time.time()
+    cached = _CACHE.get(page_key)
+    if cached and now - cached["ts"] >= _STALE_TTL_SECONDS:
+        # Plus servable, même en secours
+        del _CACHE[page_key]
+        cached = None
+    if cached and (now - cached["ts"] < _CACHE_TTL_SECONDS):
+        _CACHE.move_to_end(page_key)
+        return cached["data"]
+    negative_ts = _NEGATIVE_CACHE.get(page_key)
+    if negative_ts and (now - negative_ts < _NEGATIVE_CACHE_TTL_SECONDS):
+        return {"items": [], "totalItems": 0}
+    if negative_ts:
+        del _NEGATIVE_CACHE[page_key]
+
+    async def _load():
+        if extra_params:
+            payload = await _fetch_page(query, raw_start, _RAW_PAGE_SIZE, extra_params=extra_params)
+        else:
+            payload = await _fetch_page(query, raw_start, _RAW_PAGE_SIZE)
+        # Les pages mises en cache ne gardent que des `Volume` compacts, pas le JSON imbriqué
+        data = {
+            "items": [Volume.from_item(item) for item in payload.get("items") or ()],
+            "totalItems": payload.get("totalItems", 0),
+        }
+        if data["items"]:
+            _remember(_CACHE, page_key, {"ts": time.time(), "data": data})
+            _NEGATIVE_CACHE.pop(page_key, None)
+        else:
+            _remember(_NEGATIVE_CACHE, page_key, time.time())
+        return data
+
+    try:
+        return await _SEARCH_FLIGHTS.do(page_key, _load)
+    except UpstreamUnavailableError:
+        # Stale-while-revalidate : on sert la page expirée plutôt que rien
+        if cached and (now - cached["ts"] < _STALE_TTL_SECONDS):
+            logger.info("Serving stale Google Books page for %r", query)
+            return cached["data"]
+        raise
+
+
+def _offsets_for(query_key: tuple) -> dict[int, int]:
+    entry = _OFFSET_INDEX.get(query_key)
+    if not entry or time.time() - entry["ts"] >= _CACHE_TTL_SECONDS:
+        entry = {"ts": time.time(), "offsets": {0: 0}}
+    _remember(_OFFSET_INDEX, query_key, entry)
+    return entry["offsets"]
 
 
 # Exemple correct de structure pour Google Books
-def search_books(
+async def search_books_async(
     query: str,
     start_index: int = 0,
     max_results: int = 10,
     extra_params: dict | None = None,
+    cursor: str | None = None,
+    priority: str = INTERACTIVE,
 ):
-    safe_start = max(0, start_index)
-    safe_max = max(1, min(max_results, 100))
-    cache_key = (
-        query,
-        safe_start,
-        safe_max,
-        tuple(sorted((extra_params or {}).items())),
-    )
-    cached = _CACHE.get(cache_key)
-    if cached and (time.time() - cached["ts"] < _CACHE_TTL_SECONDS):
-        return cached["data"]
+    """Retourne une page de résultats filtrés (langue) et un curseur de continuation.
 
+    Les pages brutes sont mises en cache une à une et la correspondance offset filtré ->
+    startIndex Google est mémorisée par requête : une page profonde repart du point de
+    reprise connu le plus proche au lieu de tout recollecter depuis 0.
+
+    `priority` (`interactive` ou `background`) règle l'accès au quota sortant.
+    """
+    result = await search_volumes_async(query, start_index, max_results, extra_params, cursor, priority)
+    result["items"] = [format_book(volume) for volume in result["items"]]
+    return result
+
+
+async def search_volumes_async(
+    query: str,
+    start_index: int = 0,
+    max_results: int = 10,
+    extra_params: dict | None = None,
+    cursor: str | None = None,
+    priority: str = INTERACTIVE,
+):
+    """Comme `search_books_async`, mais `items` contient des `Volume` plutôt que des dicts API."""
+    priority_token = _PRIORITY.set(priority)
+    try:
+        return await _search_books(query, start_index, max_results, extra_params, cursor)
+    finally:
+        _PRIORITY.reset(priority_token)
+
+
+async def _search_books(
+    query: str,
+    start_index: int,
+    max_results: int,
+    extra_params: dict | None,
+    cursor: str | None,
+):
+    safe_max = max(1, min(max_results, 100))
+    extra_key = tuple(sorted((extra_params or {}).items()))
     expected_language = (extra_params or {}).get("langRestrict")
-    target_count = safe_start + safe_max + 1
-    collected_items: list[dict] = []
-    raw_start = 0
-    total_items = None
-
-    # Boucle de surcollecte : appels successifs à Google Books + double filtrage par langue
-    while len(collected_items) < target_count:
-        batch_size = min(40, target_count - len(collected_items))
-        if extra_params:
-            data = _fetch_page(
-                query,
-                raw_start,
-                batch_size,
-                extra_params=extra_params,
-            )
-        else:
-            data = _fetch_page(query, raw_start, batch_size)
+    offsets = _offsets_for((query, extra_key))
+
+    if cursor:
+        raw_start, skip, page_offset = _decode_cursor(cursor)
+    else:
+        safe_start = max(0, start_index)
+        page_offset = max(offset for offset in offsets if offset <= safe_start)
+        raw_start = offsets[page_offset]
+        skip = safe_start - page_offset
+    safe_start = page_offset + skip
 
-        if total_items is None:
-            total_items = data.get("totalItems", 0)
+    page_items: list[Volume] = []
+    next_position: tuple[int, int, int] | None = None
 
+    # Boucle de surcollecte : pages brutes successives + double filtrage par langue
+    while next_position is None:
+        try:
+            data = await _fetch_raw_page(query, raw_start, extra_params, extra_key)
+        except UpstreamUnavailableError:
+            if not page_items:
+                raise
+            # Résultat partiel : le curseur permet de reprendre là où Google a lâché
+            next_position = (raw_start, skip, page_offset)
+            break
+        total_items = data.get("totalItems", 0)
         raw_items = data.get("items", [])
         if not raw_items:
             break
 
         if expected_language:
             raw_items = [item for item in raw_items if _matches_language(item, expected_language)]
+        offsets.setdefault(page_offset, raw_start)
 
-        collected_items.extend(raw_items)
-        raw_start += batch_size
+        for position in range(skip, len(raw_items)):
+            if len(page_items) == safe_max:
+                next_position = (raw_start, position, page_offset)
+                break
+            page_items.append(raw_items[position])
 
-        if total_items is not None and raw_start >= total_items:
-            break
+        page_offset += len(raw_items)
+        raw_start += _RAW_PAGE_SIZE
+        skip = max(0, skip - len(raw_items))
 
-    page_items = collected_items[safe_start:safe_start + safe_max]
-    books = [_format_book(item) for item in page_items]
-    has_more = len(collected_items) > safe_start + safe_max
+        if raw_start >= total_items:
+            break
 
-    result = {
-        "items": books,
-        "total_items": len(books),
+    return {
+        "items": page_items,
+        "total_items": len(page_items),
         "start_index": safe_start,
         "max_results": safe_max,
-        "has_more": has_more,
+        "has_more": next_position is not None,
+        "next_cursor": _encode_cursor(*next_position) if next_position else None,
     }
-    _CACHE[cache_key] = {"ts": time.time(), "data": result}
-    return result
+
+
+def search_books(
+    query: str,
+    start_index: int = 0,
+    max_results: int = 10,
+    extra_params: dict | None = None,
+    cursor: str | None = None,
+    priority: str = INTERACTIVE,
+):
+    """Wrapper synchrone de `search_books_async` pour les appelants hors boucle (ex. recommend_books).
+
+    Exécute la recherche dans une boucle dédiée : à ne pas appeler depuis une coroutine.
+    """
+
+    async def _run():
+        try:
+            return await search_books_async(query, start_index, max_results, extra_params, cursor, priority)
+        finally:
+            await aclose_client()
+
+    return asyncio.run(_run())
+
+
+def search_volumes(
+    query: str,
+    start_index: int = 0,
+    max_results: int = 10,
+    extra_params: dict | None = None,
+    cursor: str | None = None,
+    priority: str = INTERACTIVE,
+):
+    """Wrapper synchrone de `search_volumes_async` (mêmes précautions que `search_books`)."""
+
+    async def _run():
+        try:
+            return await search_volumes_async(query, start_index, max_results, extra_params, cursor, priority)
+        finally:
+            await aclose_client()
+
+    return asyncio.run(_run())
@@ -0,0 +1,190 @@
+"""Doublure locale de l'API Google Books pour les tests de charge.
+
+Rejoue des réponses enregistrées (ou synthétiques à défaut) avec latence, taux d'erreur
+et taux de 429 configurables. Utilisable de deux façons :
+
+- transport httpx branché sur `services.google_books` (`GOOGLE_BOOKS_TRANSPORT=replay`) ;
+- serveur ASGI autonome : `uvicorn app.services.google_books_replay:standin_app --port 8100`
+  puis `GOOGLE_BOOKS_API_URL=http://127.0.0.1:8100/books/v1/volumes`.
+
+`GOOGLE_BOOKS_TRANSPORT=record` enregistre les réponses réelles dans `GOOGLE_BOOKS_REPLAY_DIR`.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Paramètres qui identifient une réponse (la clé d'API et `fields` n'en font pas partie)
+_KEY_PARAMS = ("q", "startIndex", "maxResults", "langRestrict", "printType", "orderBy")
+_SYNTHETIC_TOTAL_ITEMS = 200
+
+
+def _key_params(params) -> dict:
+    # Les paramètres d'URL arrivent en chaînes : on normalise pour que 0 et "0" donnent la même clé
+    return {name: None if params.get(name) is None else str(params.get(name)) for name in _KEY_PARAMS}
+
+
+def recording_key(params) -> str:
+    canonical = json.dumps(_key_params(params), sort_keys=True)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """Réponses enregistrées, une par fichier JSON `<clé>.json` dans `directory`."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = Path(directory) if directory else None
+        self._responses: dict[str, dict] = {}
+        if self.directory and self.directory.is_dir():
+            for path in self.directory.glob("*.json"):
+                self._responses[path.stem] = json.loads(path.read_text(encoding="utf-8"))["response"]
+
+    def save(self, params, response: dict) -> None:
+        key = recording_key(params)
+        self._responses[key] = response
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            payload = {"params": _key_params(params), "response": response}
+            (self.directory / f"{key}.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    def lookup(self, params) -> dict:
+        recorded = self._responses.get(recording_key(params))
+        if recorded is not None:
+            return recorded
+        return _synthetic_page(params)
+
+
+def _synthetic_page(params) -> dict:
+    """Page déterministe pour les requêtes jamais enregistrées."""
+    query = params.get("q") or ""
+    start = int(params.get("startIndex") or 0)
+    size = int(params.get("maxResults") or 10)
+    seed = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+    items = []
+    for index in range(start, min(start + size, _SYNTHETIC_TOTAL_ITEMS)):
+        items.append(
+            {
+                "id": f"{seed}-{index}",
+                "volumeInfo": {
+                    "title": f"{query} — volume {index}",
+                    "authors": [f"Auteur {seed[:4]}-{index % 7}"],
+                    "categories": ["Fiction"],
+                    "description": f"Description synthétique {index} pour « {query} ».",
+                    "imageLinks": {"thumbnail": f"https://example.invalid/{seed}/{index}.jpg"},
+                    "publishedDate": str(1950 + index % 70),
+                    "industryIdentifiers": [{"type": "ISBN_13", "identifier": f"978{index:010d}"}],
+                    # Un volume sur cinq n'est pas en français, pour exercer le filtrage par langue
+                    "language": "en" if index % 5 == 4 else "fr",
+                },
+            }
+        )
+    return {"totalItems": _SYNTHETIC_TOTAL_ITEMS, "items": items}
+
+
+class FaultProfile:
+    """Latence et pannes injectées, tirées indépendamment à chaque requête."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_env(cls) -> "FaultProfile":
+        return cls(
+            latency_ms=float(os.getenv("GOOGLE_BOOKS_REPLAY_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("GOOGLE_BOOKS_REPLAY_JITTER_MS", "0")),
+            error_rate=float(os.getenv("GOOGLE_BOOKS_REPLAY_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("GOOGLE_BOOKS_REPLAY_429_RATE", "0")),
+        )
+
+    async def apply(self) -> int | None:
+        """Attend la latence simulée ; renvoie un code d'erreur HTTP à répondre, ou None."""
+        delay_ms = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 503
+        return None
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, store: ReplayStore, faults: FaultProfile | None = None):
+        self.store = store
+        self.faults = faults or FaultProfile()
+        self.request_count = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.request_count += 1
+        status_code = await self.faults.apply()
+        if status_code:
+            return httpx.Response(status_code, json={"error": {"code": status_code}}, request=request)
+        return httpx.Response(200, json=self.store.lookup(request.url.params), request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Relaie vers Google et enregistre chaque réponse 200 dans le `ReplayStore`."""
+
+    def __init__(self, store: ReplayStore):
+        self.store = store
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        if response.status_code == 200:
+            body = await response.aread()
+            self.store.save(request.url.params, json.loads(body))
+            return httpx.Response(200, content=body, headers=response.headers, request=request)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def transport_factory_from_env():
+    """Fabrique de transport selon `GOOGLE_BOOKS_TRANSPORT` (`replay`, `record`), ou None."""
+    mode = os.getenv("GOOGLE_BOOKS_TRANSPORT", "").lower()
+    if mode not in {"replay", "record"}:
+        return None
+    store = ReplayStore(os.getenv("GOOGLE_BOOKS_REPLAY_DIR"))
+    if mode == "record":
+        return lambda: RecordingTransport(store)
+    transport = ReplayTransport(store, FaultProfile.from_env())
+    return lambda: transport
+
+
+def create_standin_app(store: ReplayStore | None = None, faults: FaultProfile | None = None) -> Starlette:
+    store = store or ReplayStore(os.getenv("GOOGLE_BOOKS_REPLAY_DIR"))
+    faults = faults or FaultProfile.from_env()
+
+    async def volumes(request: Request):
+        status_code = await faults.apply()
+        if status_code:
+            return JSONResponse({"error": {"code": status_code}}, status_code=status_code)
+        return JSONResponse(store.lookup(request.query_params))
+
+    return Starlette(routes=[Route("/books/v1/volumes", volumes)])
+
+
+standin_app = create_standin_app()
@@ -0,0 +1,74 @@
+"""Recherche plein texte dans la bibliothèque d'un utilisateur (titre, auteur, genre, résumé)."""
+
+import re
+
+from sqlalchemy import Float, Integer, or_, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.orm import Query, Session
+
+from app.models.book import Book
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+# InnoDB n'indexe ni les mots plus courts que innodb_ft_min_token_size (3 par défaut),
+# ni ceux de sa liste de mots vides par défaut (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD)
+MYSQL_FT_MIN_TOKEN_SIZE = 3
+_INNODB_STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of on or "
+    "that the this to was what when where who will with und www".split()
+)
+
+
+def search_terms(search: str) -> list[str]:
+    return _TERM_RE.findall(search.lower())
+
+
+def mysql_boolean_query(terms: list[str]) -> str | None:
+    """Expression MATCH … AGAINST en mode booléen : chaque terme indexable devient obligatoire.
+
+    Les termes qu'InnoDB n'indexe pas sont retirés : exigés avec `+`, ils excluraient
+    toutes les lignes (« le petit prince », « de la terre »). None si aucun terme ne reste.
+    """
+    indexed = [term for term in terms if len(term) >= MYSQL_FT_MIN_TOKEN_SIZE and term not in _INNODB_STOPWORDS]
+    if not indexed:
+        return None
+    return " ".join(f"+{term}*" for term in indexed)
+
+
+def apply_library_search(db: Session, query: Query, search: str) -> Query:
+    """Filtre `query` sur les livres correspondant à `search`, triés par pertinence.
+
+    Chaque terme est cherché en préfixe (« tolk » trouve « Tolkien ») et tous doivent
+    être présents. Les dialectes sans index plein texte, et les recherches MySQL faites
+    uniquement de mots non indexés, retombent sur ILIKE.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query.filter(Book.id.is_(None))
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        hits = (
+            text(
+                "SELECT rowid AS book_id, bm25(books_fts) AS rank "
+                "FROM books_fts WHERE books_fts MATCH :match"
+            )
+            .bindparams(match=" ".join(f'"{term}"*' for term in terms))
+            .columns(book_id=Integer, rank=Float)
+            .subquery("books_fts_hits")
+        )
+        return query.join(hits, hits.c.book_id == Book.id).order_by(hits.c.rank, Book.id.desc())
+    against = mysql_boolean_query(terms) if dialect == "mysql" else None
+    if against:
+        relevance = mysql_match(
+            Book.title,
+            Book.author,
+            Book.genre,
+            Book.description,
+            against=against,
+        ).in_boolean_mode()
+        return query.filter(relevance > 0).order_by(relevance.desc(), Book.id.desc())
+
+    term = f"%{search.strip()}%"
+    return query.filter(or_(Book.title.ilike(term), Book.author.ilike(term))).order_by(
+        Book.created_at.desc(), Book.id.desc()
+    )
@@ -0,0 +1,94 @@
+"""Compteur de version de la bibliothèque d'un utilisateur et ETag des lectures associées.
+
+Toute écriture ORM sur un livre, une note, un manuscrit ou un chapitre incrémente
+`users.library_version` dans la même transaction (écouteur `after_flush`). Les écritures
+Core en masse (`insert(Book)`…) contournent l'ORM et doivent appeler `bump_library_version`.
+"""
+
+import hashlib
+from typing import Iterable
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.book_note import BookNote
+from app.models.chapter import Chapter
+from app.models.manuscript import Manuscript
+from app.models.user import User
+
+
+_INVISIBLE_ATTRIBUTES = {"embedding"}
+
+
+def _bump_statement(user_ids: Iterable[int]):
+    ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if not ids:
+        return None
+    users = User.__table__
+    return update(users).where(users.c.id.in_(ids)).values(library_version=users.c.library_version + 1)
+
+
+def bump_library_version(db: Session, user_ids: Iterable[int]) -> None:
+    statement = _bump_statement(user_ids)
+    if statement is not None:
+        db.connection().execute(statement)
+
+
+def _visibly_modified(obj) -> bool:
+    """Modification visible des lectures : un embedding recalculé seul ne change aucune réponse."""
+    state = inspect(obj)
+    return any(
+        attr.history.has_changes()
+        for attr in state.attrs
+        if attr.key not in _INVISIBLE_ATTRIBUTES and attr.key in state.mapper.column_attrs
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_library_writes(session: Session, flush_context) -> None:
+    user_ids: set[int] = set()
+    book_ids: set[int] = set()
+    manuscript_ids: set[int] = set()
+    changed = [*session.new, *session.deleted, *(obj for obj in session.dirty if _visibly_modified(obj))]
+    for obj in changed:
+        if isinstance(obj, (Book, Manuscript)):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, BookNote):
+            book_ids.add(obj.book_id)
+        elif isinstance(obj, Chapter):
+            manuscript_ids.add(obj.manuscript_id)
+    if not (user_ids or book_ids or manuscript_ids):
+        return
+
+    connection = session.connection()
+    if book_ids:
+        user_ids.update(connection.scalars(select(Book.user_id).where(Book.id.in_(book_ids))))
+    if manuscript_ids:
+        user_ids.update(connection.scalars(select(Manuscript.user_id).where(Manuscript.id.in_(manuscript_ids))))
+    statement = _bump_statement(user_ids)
+    if statement is not None:
+        connection.execute(statement)
+
+
+def library_etag(request: Request, user: User) -> str:
+    """ETag faible : version de la bibliothèque + ressource demandée (chemin et paramètres)."""
+    target = f"{request.url.path}?{request.url.query}"
+    resource = hashlib.blake2s(target.encode("utf-8"), digest_size=6).hexdigest()
+    return f'W/"lib-{user.id}-{user.library_version or 0}-{resource}"'
+
+
+def check_not_modified(request: Request, response: Response, user: User) -> Response | None:
+    """Pose l'ETag sur la réponse ; renvoie une 304 si le client a déjà cette version.
+
+    À appeler avant toute requête coûteuse : seule la ligne `users` déjà chargée par
+    l'authentification est lue.
+    """
+    etag = library_etag(request, user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
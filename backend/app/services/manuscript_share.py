@@ -2,6 +2,7 @@
 
 import base64
 import unicodedata
+from typing import Callable
 
 from bs4 import BeautifulSoup
 from fpdf import FPDF
@@ -160,7 +161,8 @@ def share_manuscript_via_email(
     recipients: list[str],
     subject: str,
     message: str | None,
-    author_name: str
+    author_name: str,
+    on_progress: Callable[[str, int], None] | None = None,
 ) -> None:
     """Partage un manuscrit par email avec PDF en pièce jointe.
     
@@ -171,11 +173,14 @@ def share_manuscript_via_email(
         subject: Sujet de l'email
         message: Message d'introduction optionnel
         author_name: Nom de l'auteur
+        on_progress: Appelé avec l'étape en cours et un pourcentage d'avancement
         
     Raises:
         EmailError: Si l'envoi échoue
     """
+    report = on_progress or (lambda step, progress: None)
     intro = message.strip() if message else None
+    report("rendering", 10)
     html_content = render_share_html(manuscript, chapters, intro, author_name)
     pdf_bytes = render_share_pdf(manuscript, chapters, intro, author_name)
     
@@ -185,6 +190,7 @@ def share_manuscript_via_email(
         "Base64Content": base64.b64encode(pdf_bytes).decode("ascii"),
     }
 
+    report("sending", 60)
     send_email(
         recipients=recipients,
         subject=subject,
@@ -0,0 +1,52 @@
+"""Statistiques des manuscrits sans relire le contenu des chapitres.
+
+Chaque chapitre stocke son nombre de mots (`chapters.word_count`), recalculé dès que son
+contenu est assigné. La liste des manuscrits agrège ensuite nombre de chapitres, nombre de
+mots et date de dernière modification en une seule requête, sans charger `content`.
+"""
+
+import html
+import re
+from typing import Any
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models.chapter import Chapter
+from app.models.manuscript import Manuscript
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def count_words(content: str | None) -> int:
+    """Nombre de mots d'un contenu HTML (éditeur riche) : balises et entités ignorées."""
+    if not content:
+        return 0
+    return len(html.unescape(_TAG_RE.sub(" ", content)).split())
+
+
+@event.listens_for(Chapter.content, "set", propagate=True)
+def _update_word_count(target: Chapter, value, oldvalue, initiator) -> None:
+    target.word_count = count_words(value)
+
+
+def manuscript_overviews(db: Session, user_id: int) -> list[dict[str, Any]]:
+    """Manuscrits de l'utilisateur (plus récents d'abord) avec les statistiques de leurs chapitres."""
+    statement = (
+        select(
+            Manuscript.id,
+            Manuscript.title,
+            Manuscript.description,
+            Manuscript.user_id,
+            Manuscript.created_at,
+            Manuscript.updated_at,
+            func.count(Chapter.id).label("chapter_count"),
+            func.coalesce(func.sum(Chapter.word_count), 0).label("word_count"),
+            func.max(Chapter.updated_at).label("last_chapter_updated_at"),
+        )
+        .outerjoin(Chapter, Chapter.manuscript_id == Manuscript.id)
+        .where(Manuscript.user_id == user_id)
+        .group_by(Manuscript.id)
+        .order_by(Manuscript.created_at.desc(), Manuscript.id.desc())
+    )
+    return [dict(row) for row in db.execute(statement).mappings()]
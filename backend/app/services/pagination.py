@@ -0,0 +1,40 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+class InvalidCursorError(ValueError):
+    """Curseur de pagination illisible ou falsifié."""
+
+
+def encode_keyset_cursor(created_at: datetime, row_id: int) -> str:
+    """Curseur opaque sur la clé de tri (created_at, id) de la dernière ligne servie."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as exc:
+        raise InvalidCursorError("Curseur de pagination invalide") from exc
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Curseur opaque pour les listes triées par pertinence, où aucune clé stable n'existe."""
+    payload = json.dumps({"o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["o"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as exc:
+        raise InvalidCursorError("Curseur de pagination invalide") from exc
+    if offset < 0:
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return offset
@@ -0,0 +1,170 @@
+"""Limiteur de débit sortant (token bucket) partagé par les threads et boucles du processus.
+
+Optionnellement, l'état du seau est stocké dans un fichier SQLite local afin que plusieurs
+workers uvicorn se partagent le même quota.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+_POLL_INTERVAL_SECONDS = 0.05
+
+
+class _MemoryBucketStore:
+    # Opération en mémoire : appelée directement depuis la boucle d'événements
+    blocking = False
+
+    def __init__(self, capacity: float):
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def take(self, rate: float, capacity: float, minimum: float) -> float:
+        """Retire un jeton si au moins `minimum` sont disponibles ; renvoie l'attente estimée sinon."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(capacity, self._tokens + (now - self._updated_at) * rate)
+            self._updated_at = now
+            if self._tokens >= minimum:
+                self._tokens -= 1
+                return 0.0
+            return (minimum - self._tokens) / rate
+
+
+class _SqliteBucketStore:
+    """Seau partagé entre processus : une ligne, mise à jour sous verrou d'écriture SQLite."""
+
+    # Connexion et verrou SQLite (jusqu'à 5 s) : exécuté hors de la boucle d'événements
+    blocking = True
+
+    def __init__(self, path: str, capacity: float, name: str):
+        self._path = path
+        self._name = name
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (name, capacity, time.time()),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=5, isolation_level=None)
+
+    def take(self, rate: float, capacity: float, minimum: float) -> float:
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            tokens, updated_at = connection.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self._name,),
+            ).fetchone()
+            now = time.time()
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= minimum:
+                tokens -= 1
+            else:
+                wait = (minimum - tokens) / rate
+            connection.execute(
+                "UPDATE token_buckets SET tokens = ?, updated_at = ? WHERE name = ?",
+                (tokens, now, self._name),
+            )
+            connection.execute("COMMIT")
+            return wait
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+
+class TokenBucketLimiter:
+    """Token bucket à deux priorités.
+
+    Les requêtes `interactive` passent en premier : tant qu'une requête interactive attend
+    dans ce processus, les requêtes `background` patientent, et elles laissent toujours
+    `background_reserve` jetons disponibles pour le trafic interactif des autres workers.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        background_reserve: float = 0.0,
+        store_path: str | None = None,
+        name: str = "default",
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.background_reserve = background_reserve
+        self._lock = threading.Lock()
+        self._interactive_waiting = 0
+        if store_path:
+            self._store = _SqliteBucketStore(store_path, capacity, name)
+        else:
+            self._store = _MemoryBucketStore(capacity)
+        self._stats = {
+            priority: {"acquired": 0, "timeouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for priority in (INTERACTIVE, BACKGROUND)
+        }
+
+    async def acquire(self, priority: str = INTERACTIVE, timeout: float | None = None) -> bool:
+        """Attend un jeton ; renvoie False si `timeout` expire avant."""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        interactive = priority != BACKGROUND
+        priority = INTERACTIVE if interactive else BACKGROUND
+        if interactive:
+            with self._lock:
+                self._interactive_waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    may_take = interactive or not self._interactive_waiting
+                if may_take:
+                    minimum = 1.0 if interactive else 1.0 + self.background_reserve
+                    if self._store.blocking:
+                        wait = await asyncio.to_thread(self._store.take, self.rate, self.capacity, minimum)
+                    else:
+                        wait = self._store.take(self.rate, self.capacity, minimum)
+                else:
+                    wait = _POLL_INTERVAL_SECONDS
+                if wait <= 0:
+                    self._record(priority, time.monotonic() - started)
+                    return True
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    with self._lock:
+                        self._stats[priority]["timeouts"] += 1
+                    return False
+                # Le trafic de fond se réveille souvent pour céder la place aux requêtes interactives
+                await asyncio.sleep(wait if interactive else min(wait, _POLL_INTERVAL_SECONDS))
+        finally:
+            if interactive:
+                with self._lock:
+                    self._interactive_waiting -= 1
+
+    def _record(self, priority: str, waited: float) -> None:
+        with self._lock:
+            stats = self._stats[priority]
+            stats["acquired"] += 1
+            stats["total_wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                priority: {
+                    **values,
+                    "avg_wait_seconds": (
+                        values["total_wait_seconds"] / values["acquired"] if values["acquired"] else 0.0
+                    ),
+                }
+                for priority, values in self._stats.items()
+            }
@@ -4,7 +4,7 @@ from collections import Counter
 import re
 import random
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, undefer
 
 from app.models.book import Book
 from app.services.embeddings import (
@@ -13,7 +13,9 @@ from app.services.embeddings import (
     cosine_similarity,
     embed_text,
 )
-from app.services.google_books import search_books
+from app.services.google_books import UpstreamUnavailableError, Volume, search_volumes
+from app.services.rate_limit import BACKGROUND
+from app.services.volume_catalog import upsert_volumes
 
 _STATUS_READ = "Lu"
 _CANDIDATE_FETCH_SIZE = 100
@@ -90,31 +92,27 @@ def _normalize_title(title: str) -> str:
     return value.strip()
 
 
-def _pick_isbn(identifiers: list[dict] | None) -> str | None:
+def _pick_isbn(identifiers: tuple[tuple[str | None, str | None], ...]) -> str | None:
     if not identifiers:
         return None
     for isbn_type in ("ISBN_13", "ISBN_10"):
-        for item in identifiers:
-            if item.get("type") == isbn_type:
-                return item.get("identifier")
-    return identifiers[0].get("identifier")
+        for id_type, identifier in identifiers:
+            if id_type == isbn_type:
+                return identifier
+    return identifiers[0][1]
 
 
-def _format_candidate(item: dict) -> dict:
-    volume = item.get("volumeInfo", {}) or {}
-    authors = volume.get("authors") or []
-    categories = volume.get("categories") or []
-    image_links = volume.get("imageLinks") or {}
+def _format_candidate(volume: Volume) -> dict:
     return {
-        "external_id": item.get("id"),
-        "title": volume.get("title") or "Titre inconnu",
-        "author": ", ".join(authors) if authors else "Auteur inconnu",
-        "description": volume.get("description") or "",
-        "publication_date": volume.get("publishedDate"),
-        "isbn": _pick_isbn(volume.get("industryIdentifiers")),
-        "cover_image": image_links.get("thumbnail") or image_links.get("smallThumbnail"),
-        "genre": categories[0] if categories else None,
-        "language": volume.get("language"),
+        "external_id": volume.id,
+        "title": volume.title or "Titre inconnu",
+        "author": ", ".join(volume.authors) if volume.authors else "Auteur inconnu",
+        "description": volume.description or "",
+        "publication_date": volume.published_date,
+        "isbn": _pick_isbn(volume.industry_identifiers),
+        "cover_image": volume.thumbnail or volume.small_thumbnail,
+        "genre": volume.categories[0] if volume.categories else None,
+        "language": volume.language,
     }
 
 
@@ -198,27 +196,31 @@ def _ensure_embedding(book: Book) -> tuple[list[float], bool]:
     return embedding, bool(embedding)
 
 
-def _candidate_identity(item: dict) -> tuple[str, str]:
-    volume = item.get("volumeInfo", {}) or {}
-    title = (volume.get("title") or "").strip().lower()
-    authors = ", ".join(volume.get("authors") or []).strip().lower()
-    external_id = (item.get("id") or "").strip().lower()
+def _candidate_identity(volume: Volume) -> tuple[str, str]:
+    title = (volume.title or "").strip().lower()
+    authors = ", ".join(volume.authors).strip().lower()
+    external_id = (volume.id or "").strip().lower()
     return external_id or title, authors
 
 # backend/app/services/recommendations.py
-def _collect_candidates(queries: list[str], limit: int) -> list[dict]:
-    candidates: list[dict] = []
+def _collect_candidates(queries: list[str], limit: int) -> list[Volume]:
+    candidates: list[Volume] = []
     seen_candidates: set[tuple[str, str]] = set()
     page_starts = range(0, max(limit * 8, _CANDIDATE_FETCH_SIZE), _QUERY_PAGE_SIZE)
 
     for q in queries[:_MAX_RECOMMENDATION_QUERIES]:
         for start_index in page_starts:
-            results = search_books(
-                q,
-                start_index=start_index,
-                max_results=_QUERY_PAGE_SIZE,
-                extra_params={"printType": "books", "orderBy": "relevance", "langRestrict": "fr"},
-            )
+            try:
+                results = search_volumes(
+                    q,
+                    start_index=start_index,
+                    max_results=_QUERY_PAGE_SIZE,
+                    extra_params={"printType": "books", "orderBy": "relevance", "langRestrict": "fr"},
+                    priority=BACKGROUND,
+                )
+            except UpstreamUnavailableError:
+                # Google indisponible : on recommande à partir des candidats déjà collectés
+                return candidates
             items = results.get("items", [])
             if not items:
                 break
@@ -235,6 +237,7 @@ def recommend_books(db: Session, user_id: int, limit: int = 10) -> list[dict]:
     # On privilégie les livres favoris
     favorite_books = (
         db.query(Book)
+        .options(undefer(Book.embedding))
         .filter(Book.user_id == user_id, Book.is_favorite.is_(True))
         .all()
     )
@@ -243,6 +246,7 @@ def recommend_books(db: Session, user_id: int, limit: int = 10) -> list[dict]:
     if not seed_books:
         seed_books = (
             db.query(Book)
+            .options(undefer(Book.embedding))
             .filter(Book.user_id == user_id, Book.status == _STATUS_READ)
             .all()
         )
@@ -284,7 +288,15 @@ def recommend_books(db: Session, user_id: int, limit: int = 10) -> list[dict]:
         if fallback_query and fallback_query not in queries:
             candidates = _collect_candidates([fallback_query], limit)
 
-    user_books = db.query(Book).filter(Book.user_id == user_id).all()
+    # Chaque volume reçu de Google alimente le catalogue local
+    upsert_volumes(db, candidates)
+
+    user_books = (
+        db.query(Book)
+        .options(load_only(Book.external_id, Book.title, Book.author))
+        .filter(Book.user_id == user_id)
+        .all()
+    )
     existing_ids = {book.external_id for book in user_books if book.external_id}
     existing_pairs = {
         ((book.title or "").strip().lower(), (book.author or "").strip().lower())
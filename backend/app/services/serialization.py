@@ -0,0 +1,35 @@
+"""Sérialisation directe des grosses listes (livres, manuscrits) en JSON.
+
+Par défaut FastAPI valide l'objet renvoyé contre `response_model`, le repasse en dict
+puis l'encode avec `json.dumps`. Ici un `TypeAdapter` compilé une fois lit les objets ORM
+(`from_attributes`) et produit directement les octets JSON côté pydantic-core.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas import Book, BookPage, Manuscript, ManuscriptOverview
+
+BOOK_LIST_ADAPTER = TypeAdapter(list[Book])
+BOOK_PAGE_ADAPTER = TypeAdapter(BookPage)
+MANUSCRIPT_LIST_ADAPTER = TypeAdapter(list[Manuscript])
+MANUSCRIPT_OVERVIEW_LIST_ADAPTER = TypeAdapter(list[ManuscriptOverview])
+
+
+class RawJSONResponse(Response):
+    """Réponse dont le corps est déjà encodé en JSON (aucun passage par `json.dumps`)."""
+
+    media_type = "application/json"
+
+
+def json_response(adapter: TypeAdapter, payload: Any, response: Response | None = None) -> RawJSONResponse:
+    """Valide `payload` (objets ORM acceptés) et l'encode en une passe.
+
+    `response` est la sous-réponse injectée par FastAPI : ses en-têtes (ETag…) sont
+    recopiés, FastAPI ne les fusionnant pas quand la route renvoie elle-même une Response.
+    """
+    body = adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+    headers = dict(response.headers) if response is not None else None
+    return RawJSONResponse(content=body, headers=headers)
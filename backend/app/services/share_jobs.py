@@ -0,0 +1,270 @@
+"""File d'attente persistante des partages de manuscrits (table `share_jobs`).
+
+La route de partage enregistre un travail et répond immédiatement ; un processus worker
+séparé génère le PDF et l'envoie par email, avec nouvelles tentatives espacées en cas
+d'échec. L'avancement (étape, pourcentage, dernière erreur) est lisible via l'API.
+
+    python -m app.services.share_jobs            # worker permanent
+    python -m app.services.share_jobs --once     # vide la file puis s'arrête (cron)
+"""
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.chapter import Chapter
+from app.models.manuscript import Manuscript
+from app.models.share_job import ShareJob
+from app.services.manuscript_share import share_manuscript_via_email
+
+logger = logging.getLogger(__name__)
+MAX_ATTEMPTS = 3
+RETRY_DELAY = timedelta(seconds=30)
+# Un travail "running" sans nouvelles depuis ce délai est considéré abandonné (worker tué)
+LOCK_TIMEOUT = timedelta(minutes=10)
+# Pendant l'exécution, le verrou est prolongé bien avant d'atteindre LOCK_TIMEOUT
+HEARTBEAT_INTERVAL = LOCK_TIMEOUT / 4
+POLL_INTERVAL_SECONDS = 2.0
+_ERROR_MAX_LENGTH = 2000
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ShareJobError(Exception):
+    """Échec définitif d'un partage : inutile de réessayer."""
+
+
+class ShareJobLost(Exception):
+    """Le travail a été repris par un autre worker : celui-ci doit abandonner sans rien écrire."""
+
+
+def _owned(job_id: int, worker_id: str):
+    return update(ShareJob).where(
+        ShareJob.id == job_id,
+        ShareJob.status == "running",
+        ShareJob.locked_by == worker_id,
+    )
+
+
+class _Heartbeat:
+    """Prolonge `locked_at` depuis un thread à part, pendant le rendu et l'envoi (étapes longues)."""
+
+    def __init__(self, bind, job_id: int, worker_id: str, interval: timedelta = HEARTBEAT_INTERVAL):
+        self._bind = bind
+        self._statement = _owned(job_id, worker_id)
+        self._interval = interval.total_seconds()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"share-job-{job_id}-heartbeat", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                with Session(bind=self._bind) as db:
+                    db.execute(self._statement.values(locked_at=utcnow()))
+                    db.commit()
+            except Exception as exc:  # le prochain battement réessaiera
+                logger.warning("Share job heartbeat failed: %s", exc)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def enqueue_share_job(
+    db: Session,
+    *,
+    user_id: int,
+    manuscript_id: int,
+    recipients: list[str],
+    chapter_ids: list[int] | None,
+    subject: str,
+    message: str | None,
+    author_name: str,
+) -> ShareJob:
+    job = ShareJob(
+        user_id=user_id,
+        manuscript_id=manuscript_id,
+        payload={
+            "recipients": recipients,
+            "chapter_ids": chapter_ids,
+            "subject": subject,
+            "message": message,
+            "author_name": author_name,
+        },
+        max_attempts=MAX_ATTEMPTS,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next_job(db: Session, worker_id: str, now: datetime | None = None) -> ShareJob | None:
+    """Réserve le prochain travail exécutable (UPDATE conditionnel : un seul worker gagne)."""
+    now = now or utcnow()
+    claimable = or_(
+        and_(ShareJob.status == "queued", ShareJob.run_after <= now),
+        and_(ShareJob.status == "running", ShareJob.locked_at < now - LOCK_TIMEOUT),
+    )
+    while True:
+        job_id = db.scalar(
+            select(ShareJob.id)
+            .where(claimable)
+            .order_by(ShareJob.run_after, ShareJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if job_id is None:
+            db.commit()
+            return None
+        claimed = db.execute(
+            update(ShareJob)
+            .where(ShareJob.id == job_id, claimable)
+            .values(
+                status="running",
+                step="starting",
+                progress=0,
+                attempts=ShareJob.attempts + 1,
+                locked_at=now,
+                locked_by=worker_id,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(ShareJob, job_id)
+
+
+def _record_failure(db: Session, job: ShareJob, error: str, *, retry: bool, now: datetime) -> None:
+    job.last_error = error[:_ERROR_MAX_LENGTH]
+    job.locked_at = None
+    job.locked_by = None
+    if retry and job.attempts < job.max_attempts:
+        job.status = "queued"
+        job.step = "queued"
+        job.progress = 0
+        job.run_after = now + RETRY_DELAY * 2 ** (job.attempts - 1)
+    else:
+        job.status = "failed"
+        job.step = "failed"
+        job.finished_at = now
+    db.commit()
+
+
+def run_share_job(db: Session, job: ShareJob) -> None:
+    """Exécute un travail réservé : chapitres relus à ce moment-là, avancement enregistré à chaque étape.
+
+    Chaque étape vérifie que le travail appartient toujours à ce worker (sinon `ShareJobLost`),
+    en particulier juste avant l'envoi, pour ne jamais envoyer deux fois le même partage.
+    """
+    job_id, worker_id, payload = job.id, job.locked_by, job.payload
+    manuscript = db.get(Manuscript, job.manuscript_id)
+    query = select(Chapter).where(Chapter.manuscript_id == job.manuscript_id)
+    if payload.get("chapter_ids"):
+        query = query.where(Chapter.id.in_(payload["chapter_ids"]))
+    chapters = list(db.scalars(query.order_by(Chapter.order_index.asc(), Chapter.id.asc())))
+    if manuscript is None or not chapters:
+        raise ShareJobError("Aucun chapitre à partager")
+    if payload.get("chapter_ids") and len(chapters) != len(set(payload["chapter_ids"])):
+        raise ShareJobError("Chapitre introuvable dans ce manuscrit")
+    # Détachés de la session : les commits d'avancement ne les expirent pas (pas de rechargement par chapitre)
+    db.expunge(manuscript)
+    for chapter in chapters:
+        db.expunge(chapter)
+
+    def report(step: str, progress: int) -> None:
+        updated = db.execute(_owned(job_id, worker_id).values(step=step, progress=progress, locked_at=utcnow()))
+        db.commit()
+        if not updated.rowcount:
+            raise ShareJobLost(f"Share job {job_id} was taken over by another worker")
+
+    with _Heartbeat(db.get_bind(), job_id, worker_id):
+        share_manuscript_via_email(
+            manuscript=manuscript,
+            chapters=chapters,
+            recipients=payload["recipients"],
+            subject=payload["subject"],
+            message=payload.get("message"),
+            author_name=payload["author_name"],
+            on_progress=report,
+        )
+    db.execute(
+        _owned(job_id, worker_id).values(
+            status="succeeded",
+            step="done",
+            progress=100,
+            last_error=None,
+            locked_at=None,
+            locked_by=None,
+            finished_at=utcnow(),
+        )
+    )
+    db.commit()
+
+
+def process_next_job(db: Session, worker_id: str, now: datetime | None = None) -> ShareJob | None:
+    """Réserve et exécute un travail ; renvoie None si la file est vide."""
+    job = claim_next_job(db, worker_id, now)
+    if job is None:
+        return None
+    if job.attempts > job.max_attempts:
+        # Repris après un worker disparu alors que les tentatives étaient épuisées
+        _record_failure(db, job, job.last_error or "Délai d'exécution dépassé", retry=False, now=now or utcnow())
+        return job
+    try:
+        run_share_job(db, job)
+    except ShareJobLost as exc:
+        db.rollback()
+        logger.warning("%s", exc)
+    except Exception as exc:
+        db.rollback()
+        if job.status != "running" or job.locked_by != worker_id:
+            logger.warning("Share job %s failed after being taken over: %s", job.id, exc)
+        elif isinstance(exc, ShareJobError):
+            _record_failure(db, job, str(exc), retry=False, now=now or utcnow())
+        else:
+            logger.warning("Share job %s failed (attempt %s): %s", job.id, job.attempts, exc)
+            _record_failure(db, job, str(exc) or exc.__class__.__name__, retry=True, now=now or utcnow())
+    return job
+
+
+def run_worker(worker_id: str | None = None, *, once: bool = False, poll_interval: float = POLL_INTERVAL_SECONDS) -> int:
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    while True:
+        with SessionLocal() as db:
+            job = process_next_job(db, worker_id)
+        if job is not None:
+            processed += 1
+            continue
+        if once:
+            return processed
+        time.sleep(poll_interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker des partages de manuscrits")
+    parser.add_argument("--once", action="store_true", help="vide la file puis s'arrête")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    processed = run_worker(once=args.once, poll_interval=args.poll_interval)
+    logger.info("share_jobs: %d job(s) processed", processed)
+
+
+if __name__ == "__main__":
+    main()
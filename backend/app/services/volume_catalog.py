@@ -0,0 +1,195 @@
+"""Catalogue local des volumes Google Books déjà rencontrés (recherche plein texte)."""
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.book import Book
+from app.models.volume import CatalogVolume
+from app.services.google_books import InvalidCursorError, Volume
+from app.services.library_search import mysql_boolean_query
+
+# Au-delà, une entrée est considérée périmée et la recherche repasse par Google
+CATALOG_FRESHNESS = timedelta(days=7)
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+# Préfixe des curseurs de pages servies par le catalogue (absent de l'alphabet base64 des curseurs Google)
+_CURSOR_PREFIX = "catalog."
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _join_authors(authors: Iterable[str]) -> str:
+    return ", ".join(author for author in authors if author)
+
+
+def to_volume(row: CatalogVolume) -> Volume:
+    return Volume(
+        id=row.external_id,
+        title=row.title,
+        authors=tuple(author.strip() for author in (row.authors or "").split(",") if author.strip()),
+        categories=tuple(row.categories or ()),
+        description=row.description or "",
+        thumbnail=row.thumbnail,
+        small_thumbnail=row.small_thumbnail,
+        published_date=row.published_date,
+        industry_identifiers=tuple(tuple(pair) for pair in row.industry_identifiers or ()),
+        language=row.language,
+    )
+
+
+def _apply(row: CatalogVolume, volume: Volume) -> None:
+    row.title = volume.title
+    row.authors = _join_authors(volume.authors)
+    row.categories = list(volume.categories)
+    row.description = volume.description
+    row.thumbnail = volume.thumbnail
+    row.small_thumbnail = volume.small_thumbnail
+    row.published_date = volume.published_date
+    row.industry_identifiers = [list(pair) for pair in volume.industry_identifiers]
+    row.language = volume.language
+    row.fetched_at = utcnow()
+
+
+def upsert_volumes(db: Session, volumes: Iterable[Volume]) -> None:
+    """Insère ou rafraîchit les volumes reçus de Google (une requête de lecture, un commit).
+
+    Le catalogue est un miroir : un échec d'écriture est journalisé sans interrompre l'appelant.
+    """
+    by_id = {volume.id: volume for volume in volumes if volume.id}
+    if not by_id:
+        return
+    existing = {
+        row.external_id: row
+        for row in db.query(CatalogVolume).filter(CatalogVolume.external_id.in_(by_id.keys()))
+    }
+    for external_id, volume in by_id.items():
+        row = existing.get(external_id)
+        if row is None:
+            row = CatalogVolume(external_id=external_id)
+            db.add(row)
+        _apply(row, volume)
+    try:
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.warning("Volume catalog update failed: %s", exc)
+
+
+def record_book(db: Session, book: Book) -> None:
+    """Ajoute au catalogue un livre enregistré par un utilisateur, sans écraser les données Google."""
+    if not book.external_id:
+        return
+    exists = db.query(CatalogVolume.id).filter(CatalogVolume.external_id == book.external_id).first()
+    if exists:
+        return
+    db.add(
+        CatalogVolume(
+            external_id=book.external_id,
+            title=book.title,
+            authors=book.author,
+            categories=[book.genre] if book.genre else [],
+            description=book.description or "",
+            thumbnail=book.cover_image,
+            published_date=book.publication_date.isoformat() if book.publication_date else None,
+            industry_identifiers=[["ISBN", book.isbn]] if book.isbn else [],
+            # Les livres portant un identifiant Google viennent de la recherche, restreinte au français
+            language="fr",
+        )
+    )
+    try:
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.warning("Volume catalog update failed: %s", exc)
+
+
+def _search_terms(query: str) -> list[str] | None:
+    # Les opérateurs Google (inauthor:, subject:…) ne sont pas reproduits localement
+    if ":" in query:
+        return None
+    terms = _TERM_RE.findall(query.lower())
+    return terms or None
+
+
+def encode_catalog_cursor(offset: int) -> str:
+    return f"{_CURSOR_PREFIX}{offset}"
+
+
+def decode_catalog_cursor(cursor: str) -> int | None:
+    """Offset d'un curseur de catalogue, None pour un curseur Google."""
+    if not cursor.startswith(_CURSOR_PREFIX):
+        return None
+    try:
+        offset = int(cursor[len(_CURSOR_PREFIX):])
+    except ValueError as exc:
+        raise InvalidCursorError("Curseur de pagination invalide") from exc
+    if offset < 0:
+        raise InvalidCursorError("Curseur de pagination invalide")
+    return offset
+
+
+def search_catalog(
+    db: Session,
+    query: str,
+    language: str | None,
+    offset: int,
+    limit: int,
+    allow_stale: bool = False,
+) -> list[Volume] | None:
+    """Recherche plein texte locale triée par pertinence.
+
+    Renvoie None quand la requête ne peut pas être servie localement (syntaxe Google,
+    ou résultats périmés), auquel cas l'appelant doit interroger Google. `allow_stale`
+    sert les pages suivantes d'une recherche déjà commencée dans le catalogue.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return None
+
+    params: dict = {"limit": limit, "offset": offset}
+    language_clause = ""
+    if language:
+        language_clause = "AND v.language = :language"
+        params["language"] = language
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        params["match"] = " ".join(f'"{term}"*' for term in terms)
+        statement = f"""
+            SELECT v.id FROM volumes_fts
+            JOIN volumes v ON v.id = volumes_fts.rowid
+            WHERE volumes_fts MATCH :match {language_clause}
+            ORDER BY bm25(volumes_fts)
+            LIMIT :limit OFFSET :offset
+        """
+    elif dialect == "mysql":
+        # Uniquement des mots qu'InnoDB n'indexe pas : Google saura mieux y répondre
+        params["match"] = mysql_boolean_query(terms)
+        if params["match"] is None:
+            return None
+        statement = f"""
+            SELECT v.id FROM volumes v
+            WHERE MATCH(v.title, v.authors, v.description) AGAINST (:match IN BOOLEAN MODE)
+            {language_clause}
+            ORDER BY MATCH(v.title, v.authors, v.description) AGAINST (:match IN BOOLEAN MODE) DESC
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        return None
+
+    ids = [row[0] for row in db.execute(text(statement), params)]
+    if not ids:
+        return []
+    rows = {row.id: row for row in db.query(CatalogVolume).filter(CatalogVolume.id.in_(ids))}
+    stale_before = utcnow() - CATALOG_FRESHNESS
+    if not allow_stale and any(rows[row_id].fetched_at < stale_before for row_id in ids if row_id in rows):
+        return None
+    return [to_volume(rows[row_id]) for row_id in ids if row_id in rows]
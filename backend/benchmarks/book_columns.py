@@ -0,0 +1,116 @@
+"""Volume de données lu par les listes de livres, avec et sans la colonne `embedding`.
+
+Rejoue la requête de `/books/mine` sur une bibliothèque synthétique (vecteurs MiniLM de
+384 dimensions) et compare les octets reçus de la base : compteur `Bytes_received` de la
+session sur MySQL, taille des valeurs retournées ailleurs (SQLite en mémoire par défaut).
+
+    cd backend
+    python -m benchmarks.book_columns --books 500
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.book_columns --use-database-url
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker, undefer  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models.book import Book  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+import app.models.api_log  # noqa: E402,F401
+import app.models.api_log_rollup  # noqa: E402,F401
+import app.models.book_note  # noqa: E402,F401
+import app.models.chapter  # noqa: E402,F401
+import app.models.manuscript  # noqa: E402,F401
+import app.models.volume  # noqa: E402,F401
+
+
+def _seed(db: Session, books: int, seed: int) -> int:
+    rng = random.Random(seed)
+    user = User(username="bench-columns", email="bench-columns@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    for index in range(books):
+        db.add(
+            Book(
+                title=f"Livre {index}",
+                author=rng.choice(["Victor Hugo", "Albert Camus", "Simone de Beauvoir"]),
+                description="Résumé. " * rng.randint(20, 80),
+                status="Lu",
+                embedding=[rng.gauss(0, 0.05) for _ in range(384)],
+                user_id=user.id,
+            )
+        )
+    db.commit()
+    return user.id
+
+
+def _bytes_received(db: Session) -> int | None:
+    if db.get_bind().dialect.name != "mysql":
+        return None
+    return int(db.execute(text("SHOW SESSION STATUS LIKE 'Bytes_received'")).one()[1])
+
+
+def _measure(db: Session, user_id: int, with_embedding: bool) -> tuple[int, float]:
+    query = db.query(Book).filter(Book.user_id == user_id)
+    if with_embedding:
+        query = query.options(undefer(Book.embedding))
+    statement = query.order_by(Book.created_at.desc(), Book.id.desc()).statement
+
+    before = _bytes_received(db)
+    started = time.perf_counter()
+    # Exécution Core : lignes brutes, telles que reçues du pilote
+    rows = db.connection().execute(statement).all()
+    elapsed = time.perf_counter() - started
+    after = _bytes_received(db)
+    if before is not None:
+        return after - before, elapsed
+    payload = sum(len(str(value).encode("utf-8")) for row in rows for value in row if value is not None)
+    return payload, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--use-database-url",
+        action="store_true",
+        help="utilise DATABASE_URL au lieu d'une base SQLite en mémoire (crée puis supprime les tables)",
+    )
+    args = parser.parse_args()
+
+    if args.use_database_url:
+        engine = create_engine(os.environ["DATABASE_URL"])
+    else:
+        engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        with SessionLocal() as db:
+            user_id = _seed(db, args.books, args.seed)
+            full_bytes, full_time = _measure(db, user_id, with_embedding=True)
+            deferred_bytes, deferred_time = _measure(db, user_id, with_embedding=False)
+    finally:
+        if args.use_database_url:
+            Base.metadata.drop_all(bind=engine)
+
+    print(f"books          {args.books}")
+    print(f"with embedding {full_bytes / 1024:.1f} KiB  {full_time * 1000:.1f} ms")
+    print(f"deferred       {deferred_bytes / 1024:.1f} KiB  {deferred_time * 1000:.1f} ms")
+    print(f"saved          {(1 - deferred_bytes / full_bytes) * 100:.0f} %")
+
+
+if __name__ == "__main__":
+    main()
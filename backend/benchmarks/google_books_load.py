@@ -0,0 +1,235 @@
+"""Banc de charge des appels sortants Google Books, sans toucher à la vraie API.
+
+Les requêtes passent par la doublure `app.services.google_books_replay` (réponses
+enregistrées ou synthétiques, latence / erreurs / 429 injectés). Mesure le débit et la
+latence de queue (p50/p95/p99) de `search_books` et `recommend_books` sous concurrence.
+
+    cd backend
+    python -m benchmarks.google_books_load --concurrency 16 --requests 400 --latency-ms 80
+    python -m benchmarks.google_books_load --error-rate 0.05 --rate-429 0.02 --skip-recommend
+
+`recommend_books` encode les candidats avec MiniLM : le modèle doit être disponible localement.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models.book import Book  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import google_books  # noqa: E402
+from app.services.google_books_replay import FaultProfile, ReplayStore, ReplayTransport  # noqa: E402
+from app.services.rate_limit import TokenBucketLimiter  # noqa: E402
+
+import app.models.api_log  # noqa: E402,F401
+import app.models.book_note  # noqa: E402,F401
+import app.models.chapter  # noqa: E402,F401
+import app.models.manuscript  # noqa: E402,F401
+import app.models.volume  # noqa: E402,F401
+
+QUERIES = [
+    "victor hugo",
+    "les misérables",
+    "polar nordique",
+    "science-fiction",
+    "fantasy jeunesse",
+    "albert camus",
+    "roman historique",
+    "bande dessinée",
+    "simone de beauvoir",
+    "développement personnel",
+]
+SEARCH_PARAMS = {"printType": "books", "orderBy": "relevance", "langRestrict": "fr"}
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(name: str, latencies: list[float], errors: int, elapsed: float, upstream_calls: int) -> None:
+    count = len(latencies) + errors
+    print(f"\n== {name}")
+    print(f"requests       {count} ({errors} errors)")
+    print(f"throughput     {count / elapsed:.1f} req/s")
+    print(f"upstream calls {upstream_calls}")
+    if latencies:
+        print(
+            "latency ms     "
+            f"mean {statistics.mean(latencies) * 1000:.1f}  "
+            f"p50 {_percentile(latencies, 50) * 1000:.1f}  "
+            f"p95 {_percentile(latencies, 95) * 1000:.1f}  "
+            f"p99 {_percentile(latencies, 99) * 1000:.1f}  "
+            f"max {max(latencies) * 1000:.1f}"
+        )
+
+
+def _reset_client_state(transport: ReplayTransport, rate: float) -> None:
+    google_books._CACHE.clear()
+    google_books._NEGATIVE_CACHE.clear()
+    google_books._OFFSET_INDEX.clear()
+    google_books._BREAKERS.clear()
+    google_books._RATE_LIMITER = TokenBucketLimiter(rate=rate, capacity=max(1.0, rate * 2))
+    transport.request_count = 0
+
+
+def _timed(func, *args, **kwargs) -> tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        return time.perf_counter() - started, False
+    return time.perf_counter() - started, True
+
+
+def bench_search_threads(transport: ReplayTransport, args) -> None:
+    _reset_client_state(transport, args.rate)
+    rng = random.Random(args.seed)
+    calls = [
+        (rng.choice(QUERIES), rng.choice([0, 0, 0, 20, 40]))
+        for _ in range(args.requests)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(
+            executor.map(
+                lambda call: _timed(google_books.search_books, call[0], call[1], 20, SEARCH_PARAMS),
+                calls,
+            )
+        )
+    elapsed = time.perf_counter() - started
+    latencies = [latency for latency, ok in results if ok]
+    _report("search_books (threads, sync wrapper)", latencies, len(results) - len(latencies), elapsed, transport.request_count)
+
+
+def bench_search_async(transport: ReplayTransport, args) -> None:
+    _reset_client_state(transport, args.rate)
+    rng = random.Random(args.seed)
+    calls = [(rng.choice(QUERIES), rng.choice([0, 0, 0, 20, 40])) for _ in range(args.requests)]
+
+    async def run() -> tuple[list[float], int, float]:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: list[float] = []
+        errors = 0
+
+        async def one(query: str, start: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                began = time.perf_counter()
+                try:
+                    await google_books.search_books_async(query, start, 20, SEARCH_PARAMS)
+                except Exception:
+                    errors += 1
+                    return
+                latencies.append(time.perf_counter() - began)
+
+        began = time.perf_counter()
+        try:
+            await asyncio.gather(*(one(query, start) for query, start in calls))
+        finally:
+            await google_books.aclose_client()
+        return latencies, errors, time.perf_counter() - began
+
+    latencies, errors, elapsed = asyncio.run(run())
+    _report("search_books_async (event loop)", latencies, errors, elapsed, transport.request_count)
+
+
+def bench_recommendations(transport: ReplayTransport, args) -> None:
+    from app.services.recommendations import recommend_books
+
+    _reset_client_state(transport, args.rate)
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rng = random.Random(args.seed)
+
+    with SessionLocal() as db:
+        user_ids = []
+        for index in range(args.users):
+            user = User(username=f"bench{index}", email=f"bench{index}@example.com", hashed_password="x")
+            db.add(user)
+            db.flush()
+            user_ids.append(user.id)
+            for book_index in range(5):
+                vector = [rng.gauss(0, 1) for _ in range(384)]
+                norm = sum(value * value for value in vector) ** 0.5
+                db.add(
+                    Book(
+                        title=f"Livre {index}-{book_index}",
+                        author=rng.choice(["Victor Hugo", "Albert Camus", "Simone de Beauvoir"]),
+                        genre=rng.choice(["Fiction", "Roman", "Policier"]),
+                        status="Lu",
+                        is_favorite=book_index == 0,
+                        embedding=[value / norm for value in vector],
+                        user_id=user.id,
+                    )
+                )
+        db.commit()
+
+    def recommend(user_id: int) -> None:
+        with SessionLocal() as db:
+            recommend_books(db, user_id, limit=12)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(lambda user_id: _timed(recommend, user_id), user_ids))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for latency, ok in results if ok]
+    _report("recommend_books (threads)", latencies, len(results) - len(latencies), elapsed, transport.request_count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=8, help="utilisateurs simulés pour recommend_books")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate", type=float, default=1000.0, help="jetons/s du limiteur sortant")
+    parser.add_argument("--recordings", default=os.getenv("GOOGLE_BOOKS_REPLAY_DIR"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-recommend", action="store_true")
+    args = parser.parse_args()
+
+    transport = ReplayTransport(
+        ReplayStore(args.recordings),
+        FaultProfile(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_429,
+            seed=args.seed,
+        ),
+    )
+    google_books.set_transport_factory(lambda: transport)
+    google_books._RETRY_BASE_DELAY_SECONDS = 0.05
+
+    bench_search_threads(transport, args)
+    bench_search_async(transport, args)
+    if not args.skip_recommend:
+        bench_recommendations(transport, args)
+    print(f"\ncoalesced calls {google_books.get_coalescing_stats()['coalesced_calls']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Coût de sérialisation des listes de livres : chemin FastAPI par défaut vs TypeAdapter.
+
+« avant » reproduit ce que fait FastAPI pour une route à `response_model` : validation
+de chaque objet ORM vers le schéma, repassage en dict JSON puis `json.dumps`.
+« après » est `app.services.serialization.json_response` (validation + encodage dans
+pydantic-core). Les livres sont des objets ORM en mémoire, sans base de données.
+
+    cd backend
+    python -m benchmarks.serialization --books 100 --notes 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+from app.models.book import Book  # noqa: E402
+from app.models.book_note import BookNote  # noqa: E402
+from app.schemas import Book as BookSchema  # noqa: E402
+from app.services.serialization import BOOK_LIST_ADAPTER, json_response  # noqa: E402
+
+import app.models.api_log  # noqa: E402,F401
+import app.models.chapter  # noqa: E402,F401
+import app.models.manuscript  # noqa: E402,F401
+import app.models.user  # noqa: E402,F401
+
+
+def _library(books: int, notes: int) -> list[Book]:
+    start = datetime(2026, 1, 1)
+    library = []
+    for index in range(books):
+        book = Book(
+            id=index + 1,
+            title=f"Livre {index}",
+            author="Victor Hugo",
+            description="Résumé du livre. " * 25,
+            status="Lu",
+            genre="Roman",
+            isbn="9782070360024",
+            cover_image="https://books.google.com/books/content?id=abc&printsec=frontcover",
+            external_id=f"vol-{index}",
+            is_favorite=index % 5 == 0,
+            user_id=1,
+            created_at=start + timedelta(hours=index),
+        )
+        book.notes = [
+            BookNote(id=index * notes + note, book_id=index + 1, content="Note de lecture. " * 12, created_at=start)
+            for note in range(notes)
+        ]
+        library.append(book)
+    return library
+
+
+def _default_path(books: list[Book]) -> bytes:
+    content = [BookSchema.model_validate(book).model_dump(mode="json") for book in books]
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _adapter_path(books: list[Book]) -> bytes:
+    return json_response(BOOK_LIST_ADAPTER, books).body
+
+
+def _time(func, books: list[Book], rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(books)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=100)
+    parser.add_argument("--notes", type=int, default=3, help="notes par livre")
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    books = _library(args.books, args.notes)
+    assert json.loads(_default_path(books)) == json.loads(_adapter_path(books))
+    for func in (_default_path, _adapter_path):
+        func(books)
+
+    per_hundred = 100 / args.books
+    print(f"books {args.books}, notes/book {args.notes}, rounds {args.rounds}")
+    for name, func in (("default (validate + dict + json.dumps)", _default_path), ("TypeAdapter.dump_json", _adapter_path)):
+        samples = _time(func, books, args.rounds)
+        print(
+            f"{name:40s} median {statistics.median(samples) * 1000 * per_hundred:.2f} ms / 100 books  "
+            f"p95 {sorted(samples)[int(len(samples) * 0.95)] * 1000 * per_hundred:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
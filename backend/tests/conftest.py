@@ -1,4 +1,7 @@
 import os
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
@@ -13,7 +16,10 @@ os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
 
 from app import database
 from app.database import Base
+from app.core.security import hash_password
 from app.main import app as fastapi_app
+from app.models.user import User
+from app.services.api_logs import api_log_sink
 import importlib
 
 importlib.import_module("app.models.book")  # noqa: F401
@@ -22,6 +28,10 @@ importlib.import_module("app.models.chapter")  # noqa: F401
 importlib.import_module("app.models.manuscript")  # noqa: F401
 importlib.import_module("app.models.user")  # noqa: F401
 importlib.import_module("app.models.api_log")  # noqa: F401
+importlib.import_module("app.models.api_log_rollup")  # noqa: F401
+importlib.import_module("app.models.user_book_stats")  # noqa: F401
+importlib.import_module("app.models.share_job")  # noqa: F401
+importlib.import_module("app.models.volume")  # noqa: F401
 
 engine = create_engine(
     "sqlite+pysqlite:///:memory:",
@@ -29,6 +39,7 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+api_log_sink.session_factory = TestingSessionLocal
 
 
 def override_get_db():
@@ -61,3 +72,45 @@ def client():
     with TestClient(fastapi_app) as client:
         yield client
     fastapi_app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def login(client, db_session):
+    """Crée un utilisateur, le connecte et renvoie `(user, headers)` avec l'en-tête CSRF.
+
+    Le dernier utilisateur connecté porte les cookies du client de test.
+    """
+
+    def log_in(email: str = "lecteur@example.com") -> tuple[User, dict[str, str]]:
+        user = User(username=email.split("@")[0], email=email, hashed_password=hash_password("secret123"))
+        db_session.add(user)
+        db_session.commit()
+        response = client.post("/auth/login", json={"email": email, "password": "secret123"})
+        return user, {"X-CSRF-Token": response.cookies["csrf_token"]}
+
+    return log_in
+
+
+@pytest.fixture()
+def run_cli(tmp_path):
+    """Lance `python -m <module>` dans un processus neuf, sur une base SQLite fichier aux tables créées.
+
+    Un processus neuf ne charge que les modèles importés par le module lui-même (contrairement
+    aux tests, qui ont déjà tout chargé via `app.main`).
+    """
+    database_url = f"sqlite+pysqlite:///{tmp_path / 'cli.sqlite3'}"
+    file_engine = create_engine(database_url)
+    Base.metadata.create_all(bind=file_engine)
+    file_engine.dispose()
+
+    def run(module: str, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "-m", module, *args],
+            cwd=Path(__file__).resolve().parents[1],
+            env={**os.environ, "DATABASE_URL": database_url},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+    return run
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from app.core.security import get_current_admin
+from app.main import app
+from app.models.api_log import ApiLog
+from app.models.api_log_rollup import ApiLogHourly, ApiLogHourlyQuery
+from app.services.api_log_maintenance import purge_api_logs, rollup_api_logs, utcnow
+
+
+def _log(db_session, created_at, query="dune", status_code=200, user_id=None):
+    db_session.add(
+        ApiLog(
+            created_at=created_at,
+            endpoint="/google/search",
+            query=query,
+            status_code=status_code,
+            user_id=user_id,
+        )
+    )
+
+
+def test_rollup_is_incremental_and_recomputes_the_open_hour(db_session):
+    now = datetime(2026, 10, 19, 12, 30)
+    _log(db_session, datetime(2026, 10, 19, 11, 5), user_id=1)
+    _log(db_session, datetime(2026, 10, 19, 11, 40), query="camus", status_code=503, user_id=2)
+    _log(db_session, datetime(2026, 10, 19, 12, 10))
+    db_session.commit()
+
+    assert rollup_api_logs(db_session, now=now) == 2
+    eleven = db_session.get(ApiLogHourly, (datetime(2026, 10, 19, 11), "/google/search"))
+    assert (eleven.requests, eleven.errors, eleven.distinct_users) == (2, 1, 2)
+
+    _log(db_session, datetime(2026, 10, 19, 12, 20))
+    db_session.commit()
+
+    assert rollup_api_logs(db_session, now=now) == 1
+    noon = db_session.get(ApiLogHourly, (datetime(2026, 10, 19, 12), "/google/search"))
+    assert noon.requests == 2
+    assert db_session.get(ApiLogHourlyQuery, (datetime(2026, 10, 19, 12), "/google/search", "dune")).requests == 2
+
+
+def test_purge_deletes_old_rows_in_batches_but_keeps_unrolled_ones(db_session):
+    now = datetime(2026, 10, 19, 12, 0)
+    for days in (200, 150, 120):
+        _log(db_session, now - timedelta(days=days))
+    _log(db_session, now - timedelta(days=1))
+    db_session.commit()
+
+    assert purge_api_logs(db_session, retention_days=90, batch_size=2, now=now) == 0
+
+    rollup_api_logs(db_session, now=now)
+    assert purge_api_logs(db_session, retention_days=90, batch_size=2, now=now) == 3
+    assert db_session.query(ApiLog).count() == 1
+
+
+def test_usage_endpoint_reads_rollups(client, db_session):
+    hour = utcnow().replace(minute=0, second=0, microsecond=0)
+    db_session.add(ApiLogHourly(bucket_start=hour, endpoint="/google/search", requests=4, errors=1, distinct_users=2))
+    db_session.add(ApiLogHourlyQuery(bucket_start=hour, endpoint="/google/search", query="dune", requests=3))
+    db_session.commit()
+
+    app.dependency_overrides[get_current_admin] = lambda: None
+    try:
+        response = client.get("/google/usage?hours=2")
+    finally:
+        app.dependency_overrides.pop(get_current_admin)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["hourly"][0]["requests"] == 4
+    assert body["top_queries"] == [{"query": "dune", "requests": 3}]
+
+
+def test_maintenance_cli_runs_in_a_fresh_process(run_cli):
+    result = run_cli("app.services.api_log_maintenance", "--retention-days", "90")
+
+    assert result.returncode == 0, result.stderr
+    assert "api_logs:" in result.stderr
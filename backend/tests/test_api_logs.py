@@ -0,0 +1,47 @@
+import asyncio
+
+from app.models.api_log import ApiLog
+from app.services.api_logs import ApiLogSink, api_log_sink
+
+# conftest branche le sink global sur la base de test
+TestingSessionLocal = api_log_sink.session_factory
+
+
+def test_sink_writes_entries_in_batches(db_session):
+    sink = ApiLogSink(session_factory=TestingSessionLocal, batch_size=2)
+    for index in range(5):
+        sink.enqueue(endpoint="/google/search", status_code=200, query=f"q{index}")
+
+    assert db_session.query(ApiLog).count() == 0
+    assert sink.flush_sync() == 5
+    assert db_session.query(ApiLog).count() == 5
+    assert sink.stats() == {"buffered": 0, "written": 5, "dropped": 0, "failed_batches": 0}
+
+
+def test_sink_bounds_memory_and_counts_drops():
+    sink = ApiLogSink(session_factory=TestingSessionLocal, max_buffer=2)
+
+    results = [sink.enqueue(endpoint="/x", status_code=200) for _ in range(3)]
+
+    assert results == [True, True, False]
+    assert sink.stats()["dropped"] == 1
+
+
+def test_background_task_flushes_on_batch_size_and_on_stop(db_session):
+    sink = ApiLogSink(session_factory=TestingSessionLocal, batch_size=3, flush_interval=60)
+
+    async def scenario():
+        await sink.start()
+        for _ in range(3):
+            sink.enqueue(endpoint="/x", status_code=200)
+        for _ in range(50):
+            if sink.stats()["written"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        written_by_task = sink.stats()["written"]
+        sink.enqueue(endpoint="/x", status_code=500, error_message="boom")
+        await sink.stop()
+        return written_by_task
+
+    assert asyncio.run(scenario()) == 3
+    assert db_session.query(ApiLog).count() == 4
@@ -0,0 +1,62 @@
+from app.models.book import Book
+from app.models.book_note import BookNote
+from app.services import book_batch
+
+
+def _books(db_session, user, count):
+    books = [Book(title=f"Livre {index}", author="Auteur", status="À lire", user_id=user.id) for index in range(count)]
+    db_session.add_all(books)
+    db_session.commit()
+    return [book.id for book in books]
+
+
+def test_batch_updates_deletes_and_reembeds_in_one_pass(client, login, db_session, monkeypatch):
+    calls = []
+    monkeypatch.setattr(book_batch, "embed_texts", lambda texts: calls.append(len(texts)) or [[0.5] for _ in texts])
+    user, headers = login("jules@example.com")
+    ids = _books(db_session, user, 5)
+    db_session.add(BookNote(book_id=ids[4], content="À supprimer avec le livre"))
+    db_session.commit()
+
+    response = client.post(
+        "/books/batch",
+        headers=headers,
+        json={
+            "updates": [
+                {"id": ids[0], "status": "Lu"},
+                {"id": ids[1], "status": "Lu"},
+                {"id": ids[2], "genre": "Polar", "is_favorite": True},
+                {"id": ids[3], "genre": "Polar"},
+            ],
+            "delete_ids": [ids[4]],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"updated": 4, "deleted": 1, "reembedded": 2}
+    assert calls == [2]
+    db_session.expire_all()
+    books = {book.id: book for book in db_session.query(Book).filter(Book.user_id == user.id)}
+    assert set(books) == set(ids[:4])
+    assert books[ids[0]].status == books[ids[1]].status == "Lu"
+    assert books[ids[2]].is_favorite is True
+    assert books[ids[3]].embedding == [0.5]
+    assert db_session.query(BookNote).count() == 0
+
+
+def test_batch_is_all_or_nothing_when_a_book_is_not_owned(client, login, db_session):
+    stranger, _ = login("autre@example.com")
+    foreign_id = _books(db_session, stranger, 1)[0]
+    user, headers = login("jules@example.com")
+    own_id = _books(db_session, user, 1)[0]
+
+    response = client.post(
+        "/books/batch",
+        headers=headers,
+        json={"updates": [{"id": own_id, "status": "Lu"}], "delete_ids": [foreign_id]},
+    )
+
+    assert response.status_code == 404
+    db_session.expire_all()
+    assert db_session.get(Book, own_id).status == "À lire"
+    assert db_session.get(Book, foreign_id) is not None
@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+
+from app.models.book import Book
+from app.models.book_note import BookNote
+from app.services import book_export
+
+
+def _login_with_library(login, db_session, books=5):
+    user, headers = login("noe@example.com")
+    for index in range(books):
+        db_session.add(
+            Book(title=f"Livre {index}", author="Auteur", status="Lu", user_id=user.id, embedding=[0.1] * 384)
+        )
+    db_session.flush()
+    first = db_session.query(Book).filter(Book.title == "Livre 0").one()
+    db_session.add_all([BookNote(book_id=first.id, content="Première"), BookNote(book_id=first.id, content="Seconde")])
+    db_session.commit()
+    return headers
+
+
+def test_ndjson_export_streams_every_book_in_batches(client, login, db_session, monkeypatch):
+    monkeypatch.setattr(book_export, "EXPORT_BATCH_SIZE", 2)
+    headers = _login_with_library(login, db_session)
+
+    response = client.get("/books/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    books = [json.loads(line) for line in response.text.splitlines()]
+    assert [book["title"] for book in books] == [f"Livre {index}" for index in range(5)]
+    assert "embedding" not in books[0]
+    assert len(books[0]["notes"]) == 2
+
+
+def test_csv_export_counts_notes(client, login, db_session):
+    headers = _login_with_library(login, db_session, books=3)
+
+    response = client.get("/books/export?format=csv", headers=headers)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text.lstrip("\ufeff"))))
+    assert [row["title"] for row in rows] == ["Livre 0", "Livre 1", "Livre 2"]
+    assert rows[0]["notes_count"] == "2"
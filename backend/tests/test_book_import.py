@@ -0,0 +1,101 @@
+import json
+
+from app.models.book import Book
+from app.services import book_import
+
+
+def _fake_embeddings(monkeypatch):
+    calls = []
+
+    def embed_texts(texts):
+        calls.append(len(texts))
+        return [[0.1, 0.2] for _ in texts]
+
+    monkeypatch.setattr(book_import, "embed_texts", embed_texts)
+    return calls
+
+
+def test_csv_import_batches_rows_and_skips_duplicates(client, login, db_session, monkeypatch):
+    calls = _fake_embeddings(monkeypatch)
+    monkeypatch.setattr(book_import, "IMPORT_BATCH_SIZE", 2)
+    user, headers = login("lea@example.com")
+    db_session.add(Book(title="Dune", author="Frank Herbert", status="Lu", external_id="g-dune", user_id=user.id))
+    db_session.commit()
+
+    csv_body = "\n".join(
+        [
+            "Titre,Auteur,external_id,Exclusive Shelf",
+            "Dune,Frank Herbert,g-dune,read",
+            "Fondation,Isaac Asimov,g-fondation,to-read",
+            "Fondation,Isaac Asimov,g-fondation,to-read",
+            ",Sans titre,,read",
+            "Hypérion,Dan Simmons,,currently-reading",
+        ]
+    )
+    response = client.post(
+        "/books/import",
+        content=csv_body.encode("utf-8"),
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    summary = lines[-1]
+    assert summary["done"] is True
+    assert (summary["processed"], summary["inserted"], summary["duplicates"], summary["rejected"]) == (5, 2, 2, 1)
+    assert summary["errors"][0]["row"] == 4
+    assert calls == [1, 1]
+
+    titles = {book.title: book for book in db_session.query(Book).filter(Book.user_id == user.id)}
+    assert set(titles) == {"Dune", "Fondation", "Hypérion"}
+    assert titles["Fondation"].status == "À lire"
+    assert titles["Hypérion"].status == "En cours"
+    assert titles["Hypérion"].embedding == [0.1, 0.2]
+
+
+def test_import_rejects_unreadable_payload(client, login, db_session, monkeypatch):
+    _fake_embeddings(monkeypatch)
+    _, headers = login("lea@example.com")
+
+    response = client.post(
+        "/books/import",
+        content=b"{not json",
+        headers={**headers, "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_malformed_csv_row_and_persistent_conflict_are_reported_per_row(client, login, db_session, monkeypatch):
+    _fake_embeddings(monkeypatch)
+    user, headers = login("lea@example.com")
+    insert_batch = book_import._insert_batch
+
+    def conflicting_insert(db, user_id, batch, seen):
+        if any(book.title == "Conflit" for book in batch):
+            raise book_import.IntegrityError("INSERT", {}, Exception("contrainte"))
+        return insert_batch(db, user_id, batch, seen)
+
+    monkeypatch.setattr(book_import, "_insert_batch", conflicting_insert)
+    csv_body = "\n".join(
+        [
+            "title,author",
+            "Dune,Frank Herbert",
+            '"' + "x" * 200_000 + '",Trop long',
+            "Conflit,Anonyme",
+            "Fondation,Isaac Asimov",
+        ]
+    )
+    response = client.post(
+        "/books/import",
+        content=csv_body.encode("utf-8"),
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    summary = json.loads(response.text.splitlines()[-1])
+    assert (summary["processed"], summary["inserted"], summary["rejected"]) == (4, 2, 2)
+    assert [error["row"] for error in summary["errors"]] == [2, 3]
+    assert summary["errors"][0]["error"].startswith("CSV invalide")
+    titles = {book.title for book in db_session.query(Book).filter(Book.user_id == user.id)}
+    assert titles == {"Dune", "Fondation"}
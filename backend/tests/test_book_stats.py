@@ -0,0 +1,71 @@
+from app.models.book import Book
+from app.models.user import User
+from app.models.user_book_stats import UserBookStats
+from app.services import book_batch
+from app.services.book_stats import rebuild_user_book_stats
+
+
+def _snapshot(db_session, user_id):
+    db_session.expire_all()
+    stats = db_session.get(UserBookStats, user_id)
+    return (stats.total_books, stats.to_read_count, stats.in_progress_count, stats.read_count, stats.favorite_count)
+
+
+def test_counters_follow_orm_and_set_based_writes(client, login, db_session, monkeypatch):
+    monkeypatch.setattr(book_batch, "embed_texts", lambda texts: [[] for _ in texts])
+    user, headers = login("ines@example.com")
+    books = [
+        Book(title="Dune", author="Frank Herbert", status="À lire", user_id=user.id),
+        Book(title="Fondation", author="Isaac Asimov", status="Lu", is_favorite=True, user_id=user.id),
+        Book(title="Hypérion", author="Dan Simmons", status="En cours", user_id=user.id),
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+    assert _snapshot(db_session, user.id) == (3, 1, 1, 1, 1)
+
+    books[0].status = "Lu"
+    books[0].is_favorite = True
+    db_session.commit()
+    assert _snapshot(db_session, user.id) == (3, 0, 1, 2, 2)
+
+    db_session.delete(books[1])
+    db_session.commit()
+    assert _snapshot(db_session, user.id) == (2, 0, 1, 1, 1)
+
+    response = client.post(
+        "/books/batch",
+        headers=headers,
+        json={"updates": [{"id": books[2].id, "status": "Lu"}], "delete_ids": [books[0].id]},
+    )
+    assert response.status_code == 200
+    assert _snapshot(db_session, user.id) == (1, 0, 0, 1, 0)
+
+    stats = client.get("/users/me/book-stats", headers=headers).json()
+    assert stats["total_books"] == 1
+    assert stats["username"] == "ines"
+
+
+def test_rebuild_matches_incremental_counters(db_session):
+    user = User(username="ines", email="ines@example.com", hashed_password="x")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add_all(
+        [
+            Book(title=f"Livre {index}", author="Auteur", status=status, is_favorite=index == 0, user_id=user.id)
+            for index, status in enumerate(["À lire", "Lu", "Lu", "Abandonné"])
+        ]
+    )
+    db_session.commit()
+    incremental = _snapshot(db_session, user.id)
+
+    db_session.query(UserBookStats).delete()
+    db_session.commit()
+    assert rebuild_user_book_stats(db_session) == 1
+    assert _snapshot(db_session, user.id) == incremental == (4, 1, 0, 2, 1)
+
+
+def test_rebuild_cli_runs_in_a_fresh_process(run_cli):
+    result = run_cli("app.services.book_stats")
+
+    assert result.returncode == 0, result.stderr
+    assert "user_book_stats:" in result.stderr
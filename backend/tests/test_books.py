@@ -96,3 +96,210 @@ def test_create_book_accepts_datetime_publication_date(client, db_session):
 
     assert response.status_code == 200
     assert response.json()["publication_date"] == "1984-07-01"
+
+
+def test_my_books_keyset_pagination(client, db_session):
+    from datetime import datetime
+
+    from app.models.book import Book
+
+    headers = _auth_headers_for_user(client, db_session)
+    user = db_session.query(User).filter(User.email == "sophie@example.com").one()
+    same_instant = datetime(2026, 1, 1, 12, 0)
+    for index in range(5):
+        db_session.add(
+            Book(title=f"Livre {index}", author="Auteur", status="to_read", user_id=user.id, created_at=same_instant)
+        )
+    db_session.commit()
+
+    first = client.get("/books/mine?page_size=2&with_total=false", headers=headers).json()
+    assert first["total_items"] is None
+    assert first["has_more"] is True
+
+    seen = [item["id"] for item in first["items"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        data = client.get(f"/books/mine?page_size=2&cursor={cursor}", headers=headers).json()
+        assert data["total_items"] == 5
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 5
+    assert client.get("/books/mine?cursor=pas-un-curseur", headers=headers).status_code == 400
+
+
+def test_my_books_search_uses_prefix_full_text(client, db_session):
+    from app.models.book import Book
+
+    headers = _auth_headers_for_user(client, db_session)
+    user = db_session.query(User).filter(User.email == "sophie@example.com").one()
+    db_session.add_all(
+        [
+            Book(title="Le Hobbit", author="J.R.R. Tolkien", status="read", user_id=user.id),
+            Book(title="Dune", author="Frank Herbert", genre="Science-fiction", status="to_read", user_id=user.id),
+            Book(title="Fondation", author="Isaac Asimov", genre="Science-fiction", status="to_read", user_id=user.id),
+        ]
+    )
+    db_session.commit()
+
+    data = client.get("/books/mine?search=tolk", headers=headers).json()
+    assert [item["title"] for item in data["items"]] == ["Le Hobbit"]
+
+    dune = db_session.query(Book).filter(Book.title == "Dune").one()
+    dune.genre = "Space opera"
+    db_session.commit()
+
+    first = client.get("/books/mine?search=science&page_size=1", headers=headers).json()
+    assert first["total_items"] == 1
+    assert [item["title"] for item in first["items"]] == ["Fondation"]
+    assert first["next_cursor"] is None
+
+
+def test_list_endpoints_do_not_load_embeddings(client, db_session):
+    from sqlalchemy import event
+
+    from app.models.book import Book
+
+    headers = _auth_headers_for_user(client, db_session)
+    user = db_session.query(User).filter(User.email == "sophie@example.com").one()
+    db_session.add(Book(title="Dune", author="Frank Herbert", status="read", user_id=user.id, embedding=[0.1] * 384))
+    db_session.commit()
+
+    engine = db_session.get_bind()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert client.get("/books/mine", headers=headers).status_code == 200
+        assert client.get("/books/", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    book_selects = [statement for statement in statements if "FROM books" in statement]
+    assert book_selects
+    assert not any("books.embedding" in statement for statement in book_selects)
+
+
+def test_notes_summary_mode_and_paginated_notes(client, db_session):
+    from datetime import datetime, timedelta
+
+    from app.models.book import Book
+    from app.models.book_note import BookNote
+
+    headers = _auth_headers_for_user(client, db_session)
+    user = db_session.query(User).filter(User.email == "sophie@example.com").one()
+    annotated = Book(title="Dune", author="Frank Herbert", status="read", user_id=user.id)
+    bare = Book(title="Fondation", author="Isaac Asimov", status="read", user_id=user.id)
+    db_session.add_all([annotated, bare])
+    db_session.flush()
+    start = datetime(2026, 1, 1)
+    for index in range(5):
+        db_session.add(
+            BookNote(book_id=annotated.id, content=f"Note {index} " + "x" * 500, created_at=start + timedelta(days=index))
+        )
+    db_session.commit()
+
+    data = client.get("/books/mine?notes=summary", headers=headers).json()
+    by_title = {item["title"]: item for item in data["items"]}
+    assert by_title["Dune"]["notes"] == []
+    assert by_title["Dune"]["notes_count"] == 5
+    assert by_title["Dune"]["latest_note_preview"].startswith("Note 4 ")
+    assert len(by_title["Dune"]["latest_note_preview"]) == 200
+    assert by_title["Fondation"]["notes_count"] == 0
+
+    first = client.get(f"/books/{annotated.id}/notes?limit=3", headers=headers).json()
+    assert [note["content"][:6] for note in first["items"]] == ["Note 4", "Note 3", "Note 2"]
+    second = client.get(f"/books/{annotated.id}/notes?limit=3&cursor={first['next_cursor']}", headers=headers).json()
+    assert [note["content"][:6] for note in second["items"]] == ["Note 1", "Note 0"]
+    assert second["has_more"] is False
+    assert client.get(f"/books/{annotated.id + 100}/notes", headers=headers).status_code == 404
+
+
+def test_library_reads_answer_304_until_the_library_changes(client, db_session):
+    from app.models.book import Book
+    from app.models.book_note import BookNote
+
+    headers = _auth_headers_for_user(client, db_session)
+    user = db_session.query(User).filter(User.email == "sophie@example.com").one()
+    book = Book(title="Dune", author="Frank Herbert", status="read", user_id=user.id)
+    db_session.add(book)
+    db_session.commit()
+
+    first = client.get("/books/mine", headers=headers)
+    etag = first.headers["etag"]
+    assert client.get("/books/mine", headers={**headers, "If-None-Match": etag}).status_code == 304
+    assert client.get("/books/mine?page_size=5", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+    db_session.add(BookNote(book_id=book.id, content="Relire le prologue"))
+    db_session.commit()
+
+    refreshed = client.get("/books/mine", headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+def test_create_list_and_delete_book_notes(client, db_session):
+    from app.models.book import Book
+
+    headers = _auth_headers_for_user(client, db_session)
+    user = db_session.query(User).filter(User.email == "sophie@example.com").one()
+    book = Book(title="Dune", author="Frank Herbert", status="read", user_id=user.id)
+    db_session.add(book)
+    db_session.commit()
+
+    created = client.post(f"/books/{book.id}/notes", headers=headers, json={"content": "Relire la fin"})
+    assert created.status_code == 201
+    note_id = created.json()["id"]
+    # Sans pagination demandée, la liste brute des anciens clients
+    notes = client.get(f"/books/{book.id}/notes", headers=headers).json()
+    assert [note["id"] for note in notes] == [note_id]
+    page = client.get(f"/books/{book.id}/notes?limit=20", headers=headers).json()
+    assert [note["id"] for note in page["items"]] == [note_id]
+    assert page["has_more"] is False
+
+    assert client.delete(f"/books/{book.id}/notes/{note_id}", headers=headers).status_code == 204
+    assert client.get(f"/books/{book.id}/notes", headers=headers).json() == []
+    assert client.delete(f"/books/{book.id}/notes/{note_id}", headers=headers).status_code == 404
+
+
+def test_recommendations_route(client, db_session, monkeypatch):
+    from app.routes import book as book_routes
+
+    headers = _auth_headers_for_user(client, db_session)
+    monkeypatch.setattr(
+        book_routes,
+        "recommend_books",
+        lambda db, user_id, limit=10: [{"title": "Hyperion", "authors": ["Dan Simmons"]}],
+    )
+    recommendations = client.get("/books/recommendations?limit=5", headers=headers)
+    assert recommendations.status_code == 200
+    assert recommendations.json()[0]["title"] == "Hyperion"
+
+
+def test_mysql_search_skips_terms_innodb_does_not_index(db_session):
+    from types import SimpleNamespace
+
+    from sqlalchemy.dialects import mysql
+
+    from app.models.book import Book
+    from app.services.library_search import apply_library_search
+
+    mysql_db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+
+    def compiled(search):
+        query = apply_library_search(mysql_db, db_session.query(Book), search)
+        return query.statement.compile(dialect=mysql.dialect())
+
+    statement = compiled("Le Petit Prince")
+    assert "AGAINST" in str(statement)
+    assert "+petit* +prince*" in statement.params.values()
+
+    assert "+terre*" in compiled("De la Terre").params.values()
+
+    stopwords_only = compiled("de la")
+    assert "AGAINST" not in str(stopwords_only)
+    assert "%de la%" in stopwords_only.params.values()
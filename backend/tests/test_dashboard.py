@@ -0,0 +1,87 @@
+import asyncio
+from collections import OrderedDict
+
+from app.models.book import Book
+from app.services import dashboard
+
+
+def test_dashboard_combines_sections_and_caches_recommendations(client, login, db_session, monkeypatch):
+    calls = []
+
+    def fake_recommend(db, user_id, limit=10):
+        calls.append(user_id)
+        return [{"title": "Suggestion", "authors": ["Auteur"]}]
+
+    monkeypatch.setattr(dashboard, "recommend_books", fake_recommend)
+    monkeypatch.setattr(dashboard, "_RECOMMENDATIONS", OrderedDict())
+    monkeypatch.setattr(dashboard, "_RECOMMENDATION_TASKS", {})
+    user, headers = login("mia@example.com")
+    db_session.add_all(
+        [
+            Book(title="Dune", author="Frank Herbert", status="Lu", user_id=user.id),
+            Book(title="Fondation", author="Isaac Asimov", status="À lire", user_id=user.id),
+        ]
+    )
+    db_session.commit()
+
+    data = client.get("/dashboard?recommendations=inline", headers=headers).json()
+
+    assert data["user"]["username"] == "mia"
+    assert data["stats"]["total_books"] == 2
+    assert [book["title"] for book in data["highlights"]["Lu"]["items"]] == ["Dune"]
+    assert data["highlights"]["À lire"]["total"] == 1
+    assert data["recent_chapters"] == []
+    assert data["recommendations"] == {"status": "ready", "items": [{"title": "Suggestion", "authors": ["Auteur"]}]}
+
+    again = client.get("/dashboard", headers=headers).json()
+    assert again["recommendations"]["status"] == "ready"
+    assert calls == [user.id]
+
+
+def test_recommendation_computation_is_shared_between_callers(monkeypatch):
+    calls = []
+
+    def fake_recommend(db, user_id, limit=10):
+        calls.append(user_id)
+        return []
+
+    monkeypatch.setattr(dashboard, "recommend_books", fake_recommend)
+    monkeypatch.setattr(dashboard, "_RECOMMENDATIONS", OrderedDict())
+    monkeypatch.setattr(dashboard, "_RECOMMENDATION_TASKS", {})
+    monkeypatch.setattr(dashboard, "run_with_session", lambda bind, func: asyncio.sleep(0.01, result=func(None)))
+
+    async def scenario():
+        await asyncio.gather(*(dashboard.refresh_recommendations(None, 7, 1) for _ in range(5)))
+
+    asyncio.run(scenario())
+    assert calls == [7]
+    assert dashboard.cached_recommendations(7, 1) == []
+    assert dashboard.cached_recommendations(7, 2) is None
+
+
+def test_recommendation_failures_are_not_cached_and_cache_is_bounded(monkeypatch):
+    outcomes = [RuntimeError("modèle indisponible"), ["Dune"]]
+
+    def flaky_recommend(db, user_id, limit=10):
+        outcome = outcomes.pop(0) if user_id == 1 else []
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(dashboard, "recommend_books", flaky_recommend)
+    monkeypatch.setattr(dashboard, "_RECOMMENDATIONS", OrderedDict())
+    monkeypatch.setattr(dashboard, "_RECOMMENDATION_TASKS", {})
+    monkeypatch.setattr(dashboard, "_RECOMMENDATION_CACHE_SIZE", 2)
+    monkeypatch.setattr(dashboard, "run_with_session", lambda bind, func: asyncio.sleep(0, result=func(None)))
+
+    async def scenario():
+        assert await dashboard.refresh_recommendations(None, 1, 1) == []
+        assert dashboard.cached_recommendations(1, 1) is None
+        assert dashboard._RECOMMENDATION_TASKS == {}
+        assert await dashboard.refresh_recommendations(None, 1, 1) == ["Dune"]
+        for user_id in (2, 3):
+            await dashboard.refresh_recommendations(None, user_id, 1)
+
+    asyncio.run(scenario())
+    assert list(dashboard._RECOMMENDATIONS) == [2, 3]
+    assert dashboard._RECOMMENDATION_TASKS == {}
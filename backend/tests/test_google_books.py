@@ -1,8 +1,20 @@
-from app.services import google_books
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from app.models.api_log import ApiLog
+from app.services import google_books, google_books_replay
+from app.services.api_logs import api_log_sink
+from app.services.rate_limit import TokenBucketLimiter
 
 
 def test_search_books_filters_non_french_items(monkeypatch):
-    def fake_fetch_page(query, start_index, max_results, extra_params=None):
+    async def fake_fetch_page(query, start_index, max_results, extra_params=None):
         return {
             "items": [
                 {
@@ -41,3 +53,366 @@ def test_search_books_filters_non_french_items(monkeypatch):
     assert len(results["items"]) == 1
     assert results["items"][0]["id"] == "fr-book"
     assert results["items"][0]["volumeInfo"]["language"] == "fr"
+
+
+def test_google_search_route_is_async_and_logs_call(client, db_session, monkeypatch):
+    async def fake_fetch_page(query, start_index, max_results, extra_params=None):
+        return {
+            "items": [{"id": "vol-1", "volumeInfo": {"title": "Vol 1", "language": "fr"}}],
+            "totalItems": 1,
+        }
+
+    monkeypatch.setattr(google_books, "_fetch_page", fake_fetch_page)
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+
+    response = client.get("/google/search", params={"q": "async"})
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == "vol-1"
+
+    api_log_sink.flush_sync()
+    logs = db_session.query(ApiLog).all()
+    assert len(logs) == 1
+    assert logs[0].query == "async"
+    assert logs[0].status_code == 200
+
+
+def test_search_books_coalesces_concurrent_identical_calls(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    async def slow_fetch_page(query, start_index, max_results, extra_params=None):
+        calls.append(query)
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return {"items": [{"id": "vol-1", "volumeInfo": {"title": "Vol 1"}}], "totalItems": 1}
+
+    monkeypatch.setattr(google_books, "_fetch_page", slow_fetch_page)
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_SEARCH_FLIGHTS", google_books._SingleFlight())
+
+    async def run_async_callers():
+        return await asyncio.gather(
+            google_books.search_books_async("populaire"),
+            google_books.search_books_async("populaire"),
+        )
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sync_futures = [executor.submit(google_books.search_books, "populaire") for _ in range(2)]
+        async_future = executor.submit(asyncio.run, run_async_callers())
+        while google_books.get_coalescing_stats()["coalesced_calls"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in sync_futures] + list(async_future.result())
+
+    assert calls == ["populaire"]
+    assert all(result["items"][0]["id"] == "vol-1" for result in results)
+    assert google_books.get_coalescing_stats()["coalesced_calls"] == 3
+
+
+def test_search_books_propagates_leader_error_to_waiters(monkeypatch):
+    async def failing_fetch_page(query, start_index, max_results, extra_params=None):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(google_books, "_fetch_page", failing_fetch_page)
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_SEARCH_FLIGHTS", google_books._SingleFlight())
+
+    async def run_callers():
+        return await asyncio.gather(
+            google_books.search_books_async("panne"),
+            google_books.search_books_async("panne"),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(run_callers())
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert google_books.get_coalescing_stats()["coalesced_calls"] == 1
+
+
+def _numbered_pages(calls):
+    async def fake_fetch_page(query, start_index, max_results, extra_params=None):
+        calls.append(start_index)
+        items = [
+            {
+                "id": f"vol-{index}",
+                "volumeInfo": {"title": f"Vol {index}", "language": "fr" if index % 2 == 0 else "en"},
+            }
+            for index in range(start_index, min(start_index + max_results, 400))
+        ]
+        return {"items": items, "totalItems": 400}
+
+    return fake_fetch_page
+
+
+def test_search_books_deep_page_reuses_cached_raw_pages(monkeypatch):
+    calls = []
+    monkeypatch.setattr(google_books, "_fetch_page", _numbered_pages(calls))
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_OFFSET_INDEX", OrderedDict())
+    extra_params = {"langRestrict": "fr"}
+
+    first = google_books.search_books("saga", 0, 20, extra_params)
+    assert [item["id"] for item in first["items"]][:2] == ["vol-0", "vol-2"]
+    assert first["has_more"] is True
+    assert calls == [0, 40]
+
+    calls.clear()
+    second = google_books.search_books("saga", cursor=first["next_cursor"], max_results=20, extra_params=extra_params)
+    assert second["start_index"] == 20
+    assert second["items"][0]["id"] == "vol-40"
+    assert calls == [80]
+
+    calls.clear()
+    by_index = google_books.search_books("saga", 40, 20, extra_params)
+    assert by_index["items"][0]["id"] == "vol-80"
+    assert calls == [120]
+
+
+def test_google_search_rejects_invalid_cursor(client):
+    response = client.get("/google/search", params={"q": "saga", "cursor": "pas-un-curseur"})
+
+    assert response.status_code == 400
+
+
+def _use_transport(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(google_books, "_get_client", lambda: client)
+    monkeypatch.setattr(google_books, "_RETRY_BASE_DELAY_SECONDS", 0)
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_NEGATIVE_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_OFFSET_INDEX", OrderedDict())
+    monkeypatch.setattr(google_books, "_BREAKERS", {})
+
+
+def test_circuit_breaker_opens_and_fails_fast(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(503)
+
+    _use_transport(monkeypatch, handler)
+
+    for _ in range(google_books._BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(google_books.UpstreamUnavailableError):
+            asyncio.run(google_books.search_books_async("panne"))
+    assert len(calls) == google_books._BREAKER_FAILURE_THRESHOLD * google_books._MAX_ATTEMPTS
+
+    calls.clear()
+    with pytest.raises(google_books.UpstreamUnavailableError):
+        asyncio.run(google_books.search_books_async("autre requete"))
+    assert calls == []
+    assert google_books._get_breaker(google_books.GOOGLE_BOOKS_URL).state == "open"
+
+
+def test_expired_page_is_served_while_upstream_is_down(monkeypatch):
+    upstream_up = True
+
+    def handler(request):
+        if not upstream_up:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"items": [{"id": "vol-1", "volumeInfo": {"title": "Vol"}}], "totalItems": 1})
+
+    _use_transport(monkeypatch, handler)
+    assert asyncio.run(google_books.search_books_async("stale"))["items"][0]["id"] == "vol-1"
+
+    for entry in google_books._CACHE.values():
+        entry["ts"] -= google_books._CACHE_TTL_SECONDS + 1
+    upstream_up = False
+
+    result = asyncio.run(google_books.search_books_async("stale"))
+
+    assert result["items"][0]["id"] == "vol-1"
+
+
+def test_empty_results_use_separate_negative_cache(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(200, json={"totalItems": 0})
+
+    _use_transport(monkeypatch, handler)
+
+    asyncio.run(google_books.search_books_async("introuvable"))
+    asyncio.run(google_books.search_books_async("introuvable"))
+
+    assert len(calls) == 1
+    assert not google_books._CACHE
+    assert len(google_books._NEGATIVE_CACHE) == 1
+
+
+def test_search_caches_are_bounded_and_drop_expired_entries(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json={"totalItems": 0})
+
+    _use_transport(monkeypatch, handler)
+    monkeypatch.setattr(google_books, "_CACHE_SIZE", 2)
+
+    for query in ("un", "deux", "trois"):
+        asyncio.run(google_books.search_books_async(query))
+
+    assert [key[0] for key in google_books._NEGATIVE_CACHE] == ["deux", "trois"]
+    assert [key[0] for key in google_books._OFFSET_INDEX] == ["deux", "trois"]
+
+    # Une entrée négative expirée est retirée à la lecture, puis remplacée par la nouvelle réponse
+    key = next(iter(google_books._NEGATIVE_CACHE))
+    google_books._NEGATIVE_CACHE[key] -= google_books._NEGATIVE_CACHE_TTL_SECONDS + 1
+    asyncio.run(google_books.search_books_async("deux"))
+    assert calls[-1] == "deux"
+    assert [key[0] for key in google_books._NEGATIVE_CACHE] == ["trois", "deux"]
+
+
+def test_fetch_requests_partial_response_and_caches_compact_volumes(monkeypatch):
+    requested_fields = []
+
+    def handler(request):
+        requested_fields.append(request.url.params.get("fields"))
+        return httpx.Response(
+            200,
+            json={
+                "totalItems": 1,
+                "items": [
+                    {
+                        "id": "vol-1",
+                        "volumeInfo": {
+                            "title": "Vol 1",
+                            "authors": ["Autrice"],
+                            "imageLinks": {"thumbnail": "http://img/1"},
+                            "industryIdentifiers": [{"type": "ISBN_13", "identifier": "9780000000001"}],
+                            "language": "fr",
+                        },
+                    }
+                ],
+            },
+        )
+
+    _use_transport(monkeypatch, handler)
+
+    result = asyncio.run(google_books.search_books_async("partiel"))
+
+    assert requested_fields == [google_books.GOOGLE_BOOKS_FIELDS]
+    assert result["items"][0]["volumeInfo"]["imageLinks"] == {"thumbnail": "http://img/1"}
+    assert result["items"][0]["volumeInfo"]["industryIdentifiers"][0]["identifier"] == "9780000000001"
+    cached_volume = next(iter(google_books._CACHE.values()))["data"]["items"][0]
+    assert isinstance(cached_volume, google_books.Volume)
+    assert not hasattr(cached_volume, "__dict__")
+
+
+def test_replay_transport_serves_recordings_and_injects_429(monkeypatch, tmp_path):
+    store = google_books_replay.ReplayStore(str(tmp_path))
+    store.save(
+        {"q": "enregistré", "startIndex": 0, "maxResults": 40},
+        {"totalItems": 1, "items": [{"id": "rec-1", "volumeInfo": {"title": "Enregistré", "language": "fr"}}]},
+    )
+    replay = google_books_replay.ReplayTransport(google_books_replay.ReplayStore(str(tmp_path)))
+    _use_transport(monkeypatch, lambda request: httpx.Response(500))
+    monkeypatch.setattr(google_books, "_get_client", lambda: httpx.AsyncClient(transport=replay))
+
+    assert asyncio.run(google_books.search_books_async("enregistré"))["items"][0]["id"] == "rec-1"
+    assert len(asyncio.run(google_books.search_books_async("jamais vu", max_results=5))["items"]) == 5
+
+    replay.faults = google_books_replay.FaultProfile(rate_limit_rate=1.0)
+    with pytest.raises(google_books.UpstreamUnavailableError):
+        asyncio.run(google_books.search_books_async("toujours 429"))
+
+
+def test_cancelled_leader_hands_the_call_over_to_a_waiter(monkeypatch):
+    calls = []
+
+    async def slow_fetch_page(query, start_index, max_results, extra_params=None):
+        calls.append(query)
+        await asyncio.sleep(0.05)
+        return {"items": [{"id": "vol-1", "volumeInfo": {"title": "Vol 1"}}], "totalItems": 1}
+
+    monkeypatch.setattr(google_books, "_fetch_page", slow_fetch_page)
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_SEARCH_FLIGHTS", google_books._SingleFlight())
+
+    async def run_callers():
+        leader = asyncio.create_task(google_books.search_books_async("annule"))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(google_books.search_books_async("annule")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    leader_result, *waiter_results = asyncio.run(run_callers())
+
+    assert isinstance(leader_result, asyncio.CancelledError)
+    assert all(result["items"][0]["id"] == "vol-1" for result in waiter_results)
+    assert calls == ["annule", "annule"]
+
+
+def test_cancelled_half_open_probe_releases_the_breaker(monkeypatch):
+    async def slow_handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={"items": [], "totalItems": 0})
+
+    _use_transport(monkeypatch, slow_handler)
+    monkeypatch.setattr(google_books, "_RATE_LIMITER", TokenBucketLimiter(rate=10, capacity=10))
+    breaker = google_books._get_breaker(google_books.GOOGLE_BOOKS_URL)
+    breaker._state = breaker.OPEN
+    breaker._opened_at = time.monotonic() - breaker.reset_timeout
+
+    async def cancelled_probe():
+        await asyncio.wait_for(google_books._fetch_page("sonde", 0, 10), timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(cancelled_probe())
+
+    assert breaker.state == "open"
+    breaker._opened_at = time.monotonic() - breaker.reset_timeout
+    assert breaker.allow_request() is True
+
+
+def test_open_circuit_fails_fast_without_taking_a_token(monkeypatch):
+    class CountingLimiter:
+        calls = 0
+
+        async def acquire(self, priority, timeout=None):
+            self.calls += 1
+            return True
+
+    limiter = CountingLimiter()
+    _use_transport(monkeypatch, lambda request: httpx.Response(200, json={"items": [], "totalItems": 0}))
+    monkeypatch.setattr(google_books, "_RATE_LIMITER", limiter)
+    breaker = google_books._get_breaker(google_books.GOOGLE_BOOKS_URL)
+    breaker._state = breaker.OPEN
+    breaker._opened_at = time.monotonic()
+
+    with pytest.raises(google_books.UpstreamUnavailableError):
+        asyncio.run(google_books._fetch_page("panne", 0, 10))
+    assert limiter.calls == 0
+
+
+def test_replacing_the_transport_closes_existing_clients(monkeypatch):
+    monkeypatch.setattr(google_books, "_CLIENTS", {})
+    monkeypatch.setattr(google_books, "_TRANSPORT_FACTORY", lambda: httpx.MockTransport(lambda request: None))
+
+    async def open_client():
+        return google_books._get_client()
+
+    # Hors boucle : client d'une boucle encore ouverte, et d'une boucle fermée par asyncio.run
+    open_loop = asyncio.new_event_loop()
+    on_open_loop = open_loop.run_until_complete(open_client())
+    on_closed_loop = asyncio.run(open_client())
+    google_books.set_transport_factory(None)
+    open_loop.close()
+    assert on_open_loop.is_closed and on_closed_loop.is_closed
+
+    # Depuis la boucle du client : la fermeture est planifiée sur cette boucle
+    async def replace_from_the_client_loop():
+        client = google_books._get_client()
+        google_books.set_transport_factory(None)
+        await asyncio.sleep(0)
+        return client
+
+    assert asyncio.run(replace_from_the_client_loop()).is_closed
+    assert google_books._CLIENTS == {}
@@ -81,3 +81,61 @@ def test_user_cannot_access_another_users_chapter(client, db_session):
         json={"title": "Intrusion"},
     )
     assert intruder_update.status_code == 404
+
+
+def test_manuscript_summary_listing_omits_chapter_content(client, db_session):
+    headers = _auth_headers_for_user(client, db_session)
+    manuscript_id = client.post("/manuscripts/", headers=headers, json={"title": "Roman"}).json()["id"]
+    client.post("/manuscripts/", headers=headers, json={"title": "Brouillon"})
+    first = client.post(
+        f"/manuscripts/{manuscript_id}/chapters",
+        headers=headers,
+        json={"title": "Chapitre 1", "content": "<p>Il était&nbsp;une fois</p><p>la fin</p>"},
+    ).json()
+    client.post(
+        f"/manuscripts/{manuscript_id}/chapters",
+        headers=headers,
+        json={"title": "Chapitre 2", "content": "<p>Suite</p>"},
+    )
+    assert first["word_count"] == 6
+
+    client.patch(f"/manuscripts/chapters/{first['id']}", headers=headers, json={"content": "<p>Deux mots</p>"})
+
+    response = client.get("/manuscripts/?view=summary", headers=headers)
+    assert response.status_code == 200
+    summaries = {item["title"]: item for item in response.json()}
+    assert "chapters" not in summaries["Roman"]
+    assert summaries["Roman"]["chapter_count"] == 2
+    assert summaries["Roman"]["word_count"] == 3
+    assert summaries["Roman"]["last_chapter_updated_at"] is not None
+    assert summaries["Brouillon"]["chapter_count"] == 0
+    assert summaries["Brouillon"]["word_count"] == 0
+    assert summaries["Brouillon"]["last_chapter_updated_at"] is None
+
+
+def test_fetch_single_chapter_and_chapter_metadata(client, db_session):
+    headers = _auth_headers_for_user(client, db_session)
+    manuscript_id = client.post("/manuscripts/", headers=headers, json={"title": "Roman"}).json()["id"]
+    chapter_ids = [
+        client.post(
+            f"/manuscripts/{manuscript_id}/chapters",
+            headers=headers,
+            json={"title": f"Chapitre {index}", "content": f"<p>Texte du chapitre {index}</p>"},
+        ).json()["id"]
+        for index in (1, 2)
+    ]
+
+    chapter = client.get(f"/manuscripts/chapters/{chapter_ids[1]}", headers=headers)
+    assert chapter.status_code == 200
+    assert chapter.json()["content"] == "<p>Texte du chapitre 2</p>"
+    assert chapter.json()["manuscript"] == {"id": manuscript_id, "title": "Roman"}
+
+    metadata = client.get(f"/manuscripts/{manuscript_id}/chapters?view=summary", headers=headers).json()
+    assert [item["id"] for item in metadata] == chapter_ids
+    assert [item["order_index"] for item in metadata] == [1, 2]
+    assert metadata[0]["word_count"] == 4
+    assert all("content" not in item for item in metadata)
+
+    other_headers = _auth_headers_for_user(client, db_session, email="other@example.com", username="other")
+    assert client.get(f"/manuscripts/chapters/{chapter_ids[0]}", headers=other_headers).status_code == 404
+    assert client.get(f"/manuscripts/{manuscript_id}/chapters?view=summary", headers=other_headers).status_code == 404
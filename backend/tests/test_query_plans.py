@@ -0,0 +1,75 @@
+"""Plans d'exécution des requêtes chaudes : aucune ne doit parcourir une table entière."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.dialects import sqlite
+
+from app.models.api_log import ApiLog
+from app.models.book import Book
+from app.models.book_note import BookNote
+from app.models.chapter import Chapter
+from app.models.manuscript import Manuscript
+from app.models.share_job import ShareJob
+from app.models.user import User
+
+HOT_QUERIES = {
+    "books_mine": select(Book.id)
+    .where(Book.user_id == 1)
+    .order_by(Book.created_at.desc(), Book.id.desc())
+    .limit(21),
+    "books_mine_keyset": select(Book.id)
+    .where(Book.user_id == 1, Book.created_at < datetime(2026, 1, 1))
+    .order_by(Book.created_at.desc(), Book.id.desc())
+    .limit(21),
+    "books_by_status": select(Book.id)
+    .where(Book.user_id == 1, Book.status == "Lu")
+    .order_by(Book.created_at.desc(), Book.id.desc()),
+    "books_favorites": select(Book.id).where(Book.user_id == 1, Book.is_favorite.is_(True)),
+    "books_by_external_id": select(Book.id).where(Book.user_id == 1, Book.external_id.in_(["a", "b"])),
+    "book_notes_page": select(BookNote.id)
+    .where(BookNote.book_id == 1)
+    .order_by(BookNote.created_at.desc(), BookNote.id.desc())
+    .limit(21),
+    "manuscripts_list": select(Manuscript.id).where(Manuscript.user_id == 1).order_by(Manuscript.created_at.desc()),
+    "chapters_in_order": select(Chapter.id).where(Chapter.manuscript_id == 1).order_by(Chapter.order_index),
+    "manuscripts_overview": select(Manuscript.id, func.count(Chapter.id), func.sum(Chapter.word_count))
+    .outerjoin(Chapter, Chapter.manuscript_id == Manuscript.id)
+    .where(Manuscript.user_id == 1)
+    .group_by(Manuscript.id)
+    .order_by(Manuscript.created_at.desc()),
+    "chapter_by_id": select(Chapter.id, Manuscript.title)
+    .join(Manuscript, Chapter.manuscript_id == Manuscript.id)
+    .where(Chapter.id == 1, Manuscript.user_id == 1),
+    "chapters_metadata": select(Chapter.id, Chapter.title, Chapter.word_count)
+    .where(Chapter.manuscript_id == 1)
+    .order_by(Chapter.order_index, Chapter.id),
+    "recent_chapters": select(Chapter.id)
+    .join(Manuscript, Chapter.manuscript_id == Manuscript.id)
+    .where(Manuscript.user_id == 1)
+    .order_by(Chapter.created_at.desc())
+    .limit(6),
+    "share_jobs_claim": select(ShareJob.id)
+    .where(
+        or_(
+            and_(ShareJob.status == "queued", ShareJob.run_after <= datetime(2026, 1, 1)),
+            and_(ShareJob.status == "running", ShareJob.locked_at < datetime(2026, 1, 1)),
+        )
+    )
+    .order_by(ShareJob.run_after, ShareJob.id)
+    .limit(1),
+    "login_by_email": select(User.id).where(User.email == "a@example.com"),
+    "refresh_token_lookup": select(User.id).where(User.refresh_token_hash == "hash"),
+    "api_logs_by_user": select(ApiLog.id).where(ApiLog.user_id == 1, ApiLog.created_at >= datetime(2026, 1, 1)),
+    "api_logs_retention": select(ApiLog.id).where(ApiLog.created_at < datetime(2026, 1, 1)).limit(1000),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(name, db_session):
+    compiled = HOT_QUERIES[name].compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    plan = [row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+    full_scans = [step for step in plan if step.startswith("SCAN") and "VIRTUAL TABLE" not in step]
+    assert not full_scans, f"{name}: {plan}"
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+
+from app.services.rate_limit import BACKGROUND, INTERACTIVE, TokenBucketLimiter
+
+
+def test_limiter_spaces_requests_once_burst_is_spent():
+    limiter = TokenBucketLimiter(rate=20, capacity=2)
+
+    async def acquire_many():
+        started = time.monotonic()
+        for _ in range(4):
+            assert await limiter.acquire(INTERACTIVE)
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(acquire_many())
+
+    assert elapsed >= 0.08
+    stats = limiter.stats()[INTERACTIVE]
+    assert stats["acquired"] == 4
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_interactive_requests_are_served_before_background():
+    limiter = TokenBucketLimiter(rate=20, capacity=1)
+    order = []
+
+    async def take(priority, delay):
+        await asyncio.sleep(delay)
+        await limiter.acquire(priority)
+        order.append(priority)
+
+    async def scenario():
+        await limiter.acquire(INTERACTIVE)
+        await asyncio.gather(take(BACKGROUND, 0), take(INTERACTIVE, 0.01))
+
+    asyncio.run(scenario())
+
+    assert order == [INTERACTIVE, BACKGROUND]
+
+
+def test_limiter_times_out_and_counts_it():
+    limiter = TokenBucketLimiter(rate=1, capacity=1)
+
+    async def scenario():
+        await limiter.acquire(INTERACTIVE)
+        return await limiter.acquire(INTERACTIVE, timeout=0.1)
+
+    assert asyncio.run(scenario()) is False
+    assert limiter.stats()[INTERACTIVE]["timeouts"] == 1
+
+
+def test_shared_store_is_seen_by_every_limiter(tmp_path):
+    store_path = str(tmp_path / "bucket.sqlite3")
+    first = TokenBucketLimiter(rate=0.1, capacity=2, store_path=store_path, name="shared")
+    second = TokenBucketLimiter(rate=0.1, capacity=2, store_path=store_path, name="shared")
+
+    async def scenario():
+        assert await first.acquire(INTERACTIVE, timeout=0)
+        assert await second.acquire(INTERACTIVE, timeout=0)
+        return await first.acquire(INTERACTIVE, timeout=0)
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_shared_store_is_queried_off_the_event_loop(tmp_path):
+    limiter = TokenBucketLimiter(rate=10, capacity=2, store_path=str(tmp_path / "bucket.sqlite3"))
+    threads = []
+    take = limiter._store.take
+
+    def tracking_take(*args):
+        threads.append(threading.get_ident())
+        return take(*args)
+
+    limiter._store.take = tracking_take
+
+    async def scenario():
+        assert await limiter.acquire(INTERACTIVE)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert threads and loop_thread not in threads
@@ -0,0 +1,138 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, update
+
+from app.models.share_job import ShareJob
+from app.services import manuscript_share, share_jobs
+from app.services.email import EmailError
+
+
+def _enqueue(client, headers):
+    manuscript_id = client.post("/manuscripts/", headers=headers, json={"title": "Roman"}).json()["id"]
+    client.post(
+        f"/manuscripts/{manuscript_id}/chapters",
+        headers=headers,
+        json={"title": "Chapitre 1", "content": "<p>Il etait une fois</p>"},
+    )
+    response = client.post(
+        f"/manuscripts/{manuscript_id}/share",
+        headers=headers,
+        json={"recipients": ["ami@example.com"], "message": "Bonne lecture"},
+    )
+    assert response.status_code == 202
+    return response.json()
+
+
+def test_share_is_queued_then_sent_by_the_worker(client, login, db_session, monkeypatch):
+    sent = []
+    monkeypatch.setattr(manuscript_share, "send_email", lambda **kwargs: sent.append(kwargs))
+    _, headers = login("writer@example.com")
+
+    job = _enqueue(client, headers)
+    assert job["status"] == "queued"
+    assert sent == []
+
+    assert share_jobs.process_next_job(db_session, "test-worker").id == job["id"]
+    assert share_jobs.process_next_job(db_session, "test-worker") is None
+
+    status = client.get(f"/manuscripts/share-jobs/{job['id']}", headers=headers).json()
+    assert status["status"] == "succeeded"
+    assert status["progress"] == 100
+    assert status["attempts"] == 1
+    assert sent[0]["recipients"] == ["ami@example.com"]
+    assert sent[0]["subject"] == "Roman – partage de manuscrit"
+    assert sent[0]["attachments"][0]["ContentType"] == "application/pdf"
+
+
+def test_failed_share_is_retried_with_backoff_then_marked_failed(client, login, db_session, monkeypatch):
+    def failing_send(**kwargs):
+        raise EmailError("Mailjet indisponible")
+
+    monkeypatch.setattr(manuscript_share, "send_email", failing_send)
+    _, headers = login("writer@example.com")
+    job_id = _enqueue(client, headers)["id"]
+    now = share_jobs.utcnow()
+
+    share_jobs.process_next_job(db_session, "test-worker", now=now)
+    job = db_session.get(ShareJob, job_id)
+    assert (job.status, job.attempts, job.last_error) == ("queued", 1, "Mailjet indisponible")
+    assert job.run_after == now + share_jobs.RETRY_DELAY
+    # Pas encore exécutable : le délai de nouvelle tentative n'est pas écoulé
+    assert share_jobs.process_next_job(db_session, "test-worker", now=now) is None
+
+    later = now + timedelta(hours=1)
+    share_jobs.process_next_job(db_session, "test-worker", now=later)
+    share_jobs.process_next_job(db_session, "test-worker", now=later + timedelta(hours=1))
+    db_session.refresh(job)
+    assert (job.status, job.attempts) == ("failed", share_jobs.MAX_ATTEMPTS)
+    assert job.finished_at is not None
+
+
+def test_share_job_status_is_private(client, login, db_session, monkeypatch):
+    _, headers = login("writer@example.com")
+    job_id = _enqueue(client, headers)["id"]
+    _, other_headers = login("other@example.com")
+
+    assert client.get(f"/manuscripts/share-jobs/{job_id}", headers=other_headers).status_code == 404
+
+
+def test_worker_does_not_send_a_job_taken_over_by_another_worker(client, login, db_session, monkeypatch):
+    sent = []
+    render_pdf = manuscript_share.render_share_pdf
+
+    def render_then_lose_lease(*args, **kwargs):
+        db_session.execute(update(ShareJob).values(locked_by="other-worker"))
+        db_session.commit()
+        return render_pdf(*args, **kwargs)
+
+    monkeypatch.setattr(manuscript_share, "send_email", lambda **kwargs: sent.append(kwargs))
+    monkeypatch.setattr(manuscript_share, "render_share_pdf", render_then_lose_lease)
+    _, headers = login("writer@example.com")
+    job_id = _enqueue(client, headers)["id"]
+
+    share_jobs.process_next_job(db_session, "test-worker")
+
+    job = db_session.get(ShareJob, job_id)
+    assert sent == []
+    assert (job.status, job.locked_by, job.attempts) == ("running", "other-worker", 1)
+
+
+def test_worker_reads_chapters_once_and_heartbeat_extends_the_lock(client, login, db_session, monkeypatch):
+    monkeypatch.setattr(manuscript_share, "send_email", lambda **kwargs: None)
+    _, headers = login("writer@example.com")
+    manuscript_id = _enqueue(client, headers)["manuscript_id"]
+    for index in (2, 3):
+        client.post(
+            f"/manuscripts/{manuscript_id}/chapters",
+            headers=headers,
+            json={"title": f"Chapitre {index}", "content": "<p>Suite</p>"},
+        )
+    chapter_reads = []
+
+    def count_chapter_reads(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM chapters" in statement:
+            chapter_reads.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_chapter_reads)
+    try:
+        job = share_jobs.process_next_job(db_session, "test-worker")
+    finally:
+        event.remove(engine, "before_cursor_execute", count_chapter_reads)
+    assert job.status == "succeeded"
+    assert len(chapter_reads) == 1
+
+    job.status, job.locked_by, job.locked_at = "running", "test-worker", datetime(2026, 1, 1)
+    db_session.commit()
+    with share_jobs._Heartbeat(engine, job.id, "test-worker", interval=timedelta(milliseconds=10)):
+        time.sleep(0.1)
+    db_session.refresh(job)
+    assert job.locked_at > datetime(2026, 1, 1)
+
+
+def test_worker_cli_drains_the_queue_in_a_fresh_process(run_cli):
+    result = run_cli("app.services.share_jobs", "--once")
+
+    assert result.returncode == 0, result.stderr
+    assert "share_jobs: 0 job(s) processed" in result.stderr
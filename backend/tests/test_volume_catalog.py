@@ -0,0 +1,126 @@
+from collections import OrderedDict
+
+from app.models.volume import CatalogVolume
+from app.services import google_books
+from app.services.volume_catalog import search_catalog
+
+
+def _fake_pages(calls):
+    async def fake_fetch_page(query, start_index, max_results, extra_params=None):
+        calls.append((query, start_index))
+        if start_index:
+            return {"items": [], "totalItems": 3}
+        return {
+            "items": [
+                {
+                    "id": f"misérables-{index}",
+                    "volumeInfo": {
+                        "title": f"Les Misérables tome {index}",
+                        "authors": ["Victor Hugo"],
+                        "description": "Jean Valjean",
+                        "language": "fr",
+                    },
+                }
+                for index in range(3)
+            ],
+            "totalItems": 3,
+        }
+
+    return fake_fetch_page
+
+
+def test_google_search_is_answered_from_local_catalog(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(google_books, "_fetch_page", _fake_pages(calls))
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_OFFSET_INDEX", OrderedDict())
+
+    first = client.get("/google/search", params={"q": "misérables", "max_results": 3})
+    assert first.status_code == 200
+    assert first.json()["source"] == "google"
+
+    calls.clear()
+    second = client.get("/google/search", params={"q": "miser", "max_results": 2})
+
+    assert second.status_code == 200
+    data = second.json()
+    assert data["source"] == "catalog"
+    assert len(data["items"]) == 2
+    assert data["items"][0]["volumeInfo"]["authors"] == ["Victor Hugo"]
+    assert calls == []
+
+
+def test_search_catalog_defers_to_google_for_operators_and_stale_rows(db_session):
+    db_session.add(
+        CatalogVolume(
+            external_id="vol-1",
+            title="Notre-Dame de Paris",
+            authors="Victor Hugo",
+            description="Quasimodo",
+            language="fr",
+        )
+    )
+    db_session.commit()
+
+    assert [volume.id for volume in search_catalog(db_session, "quasimodo", "fr", 0, 5)] == ["vol-1"]
+    assert search_catalog(db_session, "inauthor:hugo", "fr", 0, 5) is None
+
+    row = db_session.query(CatalogVolume).one()
+    row.fetched_at = row.fetched_at.replace(year=2000)
+    db_session.commit()
+
+    assert search_catalog(db_session, "quasimodo", "fr", 0, 5) is None
+
+
+def test_catalog_search_pages_through_the_catalog_then_hands_off_to_google(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(google_books, "_fetch_page", _fake_pages(calls))
+    monkeypatch.setattr(google_books, "_CACHE", OrderedDict())
+    monkeypatch.setattr(google_books, "_OFFSET_INDEX", OrderedDict())
+    client.get("/google/search", params={"q": "misérables", "max_results": 3})
+    calls.clear()
+
+    first = client.get("/google/search", params={"q": "miser", "max_results": 2}).json()
+    assert first["source"] == "catalog"
+    assert first["has_more"] is True
+
+    second = client.get("/google/search", params={"q": "miser", "max_results": 2, "cursor": first["next_cursor"]}).json()
+    assert second["source"] == "catalog"
+    assert second["has_more"] is True
+    seen = [item["id"] for item in first["items"] + second["items"]]
+    assert sorted(seen) == [f"misérables-{index}" for index in range(3)]
+
+    # Même requête par offset : la source reste celle de la première page
+    by_offset = client.get("/google/search", params={"q": "miser", "max_results": 2, "start_index": 2}).json()
+    assert by_offset["source"] == "catalog"
+    assert [item["id"] for item in by_offset["items"]] == [item["id"] for item in second["items"]]
+    assert calls == []
+
+    # Catalogue épuisé : la page suivante part chez Google au même rang
+    third = client.get("/google/search", params={"q": "miser", "max_results": 2, "cursor": second["next_cursor"]}).json()
+    assert third["source"] == "google"
+    assert third["start_index"] == 3
+    past_catalog = client.get("/google/search", params={"q": "miser", "max_results": 2, "start_index": 20}).json()
+    assert past_catalog["source"] == "google"
+    assert past_catalog["start_index"] == 20
+    assert calls and all(query == "miser" for query, _ in calls)
+
+
+def test_search_catalog_mysql_query_skips_terms_innodb_does_not_index():
+    from types import SimpleNamespace
+
+    executed = []
+
+    class MySQLSession:
+        def get_bind(self):
+            return SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+
+        def execute(self, statement, params):
+            executed.append(params["match"])
+            return []
+
+    assert search_catalog(MySQLSession(), "Le Petit Prince", None, 0, 20) == []
+    assert executed == ["+petit* +prince*"]
+    # Que des mots vides : rien à chercher localement, la recherche part chez Google
+    assert search_catalog(MySQLSession(), "de la", None, 0, 20) is None
+    assert executed == ["+petit* +prince*"]
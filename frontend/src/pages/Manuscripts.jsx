@@ -495,7 +495,7 @@ export default function Manuscripts() {
         throw new Error(errorData.detail || "Impossible d'envoyer le manuscrit");
       }
 
-      toast.success("Manuscrit envoyé avec succès !");
+      toast.success("Partage programmé : le manuscrit va être envoyé.");
       setIsShareModalOpen(false);
     } catch (error) {
       toast.error(error.message || "Erreur lors de l'envoi du manuscrit");